@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark for Sign Language Detection
+Runs the per-frame pipeline headless on synthetic frames, a video file or an
+image folder and reports per-stage latency percentiles and overall FPS
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+import config
+from recognition_engine import RecognitionEngine
+from display_stage import DisplayStage
+from dataset_cache import DatasetCache
+from runtime_config import ConfigError, load_cli_config, load_runtime_config
+from thread_settings import apply_thread_settings
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# Stages in pipeline order, for printing
+STAGE_ORDER = ['color_convert', 'hand_detection', 'landmark_drawing', 'cache_lookup', 'crop_resize',
+               'inference', 'smoothing', 'display_convert', 'frame_total']
+
+
+def create_recognizer(model_path=None, use_cadence=False, roi_tracking=True, detection_scale=1.0,
+                      prediction_cache=True):
+    """
+    Create and load a RecognitionEngine with timing enabled
+
+    Args:
+        model_path: Path to the model (.h5, .keras or .tflite)
+        use_cadence: If False, the classifier runs on every frame with a hand
+        roi_tracking: Run hand detection around the last hand instead of the full frame
+        detection_scale: Scale of the frame used for full-frame hand detection
+        prediction_cache: Reuse the probabilities of near-identical crops (config.py settings)
+    """
+    recognizer = RecognitionEngine(model_path=model_path)
+    recognizer.timings.enabled = True
+    recognizer.roi_tracker.enabled = roi_tracking
+    recognizer.roi_tracker.detection_scale = detection_scale
+    if not prediction_cache:
+        recognizer.prediction_cache = None
+    if not use_cadence:
+        recognizer.scheduler.min_interval = recognizer.scheduler.interval = 1
+        recognizer.scheduler.adaptive = False
+    return recognizer.load()
+
+
+def synthetic_frames(count, width, height, seed=42):
+    """Yield `count` random frames (from a small pre-generated pool)"""
+    rng = np.random.default_rng(seed)
+    pool = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(8)]
+    for i in range(count):
+        yield pool[i % len(pool)]
+
+
+def video_frames(path, limit=None):
+    """Yield frames from a video file"""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Could not open video: {path}")
+    count = 0
+    try:
+        while limit is None or count < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            count += 1
+            yield frame
+    finally:
+        cap.release()
+
+
+def image_frames(directory, limit=None):
+    """Yield images found (recursively) in a directory"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith(IMAGE_EXTENSIONS))
+    if limit is not None:
+        paths = paths[:limit]
+    for path in paths:
+        image = cv2.imread(path)
+        if image is not None:
+            yield image
+
+
+def cache_frames(cache_dir, limit=None):
+    """Yield images from a dataset cache (memory-mapped, no decoding)"""
+    for i, image in enumerate(DatasetCache(cache_dir).images()):
+        if limit is not None and i >= limit:
+            return
+        yield image
+
+
+def center_crop(frame, fraction=0.5):
+    """Central crop used to exercise the classifier when no hand is detected"""
+    h, w = frame.shape[:2]
+    ch, cw = int(h * fraction), int(w * fraction)
+    y, x = (h - ch) // 2, (w - cw) // 2
+    return frame[y:y + ch, x:x + cw]
+
+
+def run_benchmark(recognizer, frames, warmup=10, force_classify=True):
+    """
+    Drive the app's per-frame path (RecognitionEngine.update, then display conversion) over `frames`
+
+    update() runs detection, classification and the temporal decoder, and
+    feeds frame times to the adaptive scheduler exactly as in the app.
+
+    Args:
+        recognizer: Loaded RecognitionEngine
+        frames: Iterable of BGR frames
+        warmup: Number of initial frames excluded from the statistics
+        force_classify: Classify a centre crop when no hand is detected, so the
+            inference stage is measured on synthetic input
+
+    Returns:
+        Dictionary with frame count, wall time, FPS and per-stage statistics
+    """
+    timings = recognizer.timings
+    display = DisplayStage()
+    num_frames = 0
+    hands_found = 0
+    start = None
+
+    for i, frame in enumerate(frames):
+        if i == warmup:
+            timings.reset()
+            start = time.perf_counter()
+
+        frame_start = time.perf_counter()
+        frame = cv2.flip(frame, 1)
+        event, processed_frame = recognizer.update(frame)
+        prediction = event.letter
+        if prediction is None and force_classify and recognizer.inference_engine is not None:
+            recognizer.classify_hand(center_crop(frame))
+        with timings.measure('display_convert'):
+            display.convert(processed_frame)
+        timings.add('frame_total', (time.perf_counter() - frame_start) * 1000.0)
+
+        if i >= warmup:
+            num_frames += 1
+            hands_found += prediction is not None
+
+    if start is None or num_frames == 0:
+        raise ValueError(f"Not enough frames: need more than {warmup} (warmup)")
+
+    wall_time = time.perf_counter() - start
+    return {
+        'frames': num_frames,
+        'frames_with_prediction': hands_found,
+        'wall_time_s': wall_time,
+        'fps': num_frames / wall_time,
+        'stages': timings.summary(),
+        'roi_tracking': recognizer.roi_tracker.stats(),
+        'prediction_cache': recognizer.prediction_cache.stats() if recognizer.prediction_cache else None
+    }
+
+
+def open_source(args):
+    """(name, frames) for the frame source selected on the command line"""
+    if args.video:
+        return f"video:{args.video}", video_frames(args.video, args.limit)
+    if args.images:
+        return f"images:{args.images}", image_frames(args.images, args.limit)
+    if args.cache:
+        return f"cache:{args.cache}", cache_frames(args.cache, args.limit)
+    count = args.synthetic or 300
+    return f"synthetic:{count}x{args.width}x{args.height}", synthetic_frames(count, args.width, args.height)
+
+
+def _thread_trial(settings, arg_values):
+    """Run in a fresh process: size the thread pools, then benchmark the pipeline"""
+    apply_thread_settings(**settings)
+    args = argparse.Namespace(**arg_values)
+    load_runtime_config(args.model)
+    recognizer = create_recognizer(model_path=args.model, use_cadence=args.cadence,
+                                   roi_tracking=not args.no_roi, detection_scale=args.detection_scale,
+                                   prediction_cache=not args.no_prediction_cache)
+    results = run_benchmark(recognizer, open_source(args)[1], warmup=args.warmup,
+                            force_classify=not args.no_force_classify)
+    stages = results['stages']
+    return {
+        'fps': results['fps'],
+        'frame_p95_ms': stages['frame_total']['p95_ms'],
+        'inference_p95_ms': stages['inference']['p95_ms'] if 'inference' in stages else None
+    }
+
+
+def tune_threads(args):
+    """
+    Benchmark thread pool sizes, each in a fresh process (TensorFlow fixes its pools at startup)
+
+    TensorFlow intra-op x inter-op sizes are tried first with OpenCV at its default,
+    then OpenCV sizes with the best TensorFlow pair.
+
+    Returns:
+        Dictionary with every trial and the best settings (highest FPS)
+    """
+    cpu_count = os.cpu_count() or 1
+    intra_options = sorted({1, 2, 4, max(1, cpu_count // 2), cpu_count} & set(range(1, cpu_count + 1)))
+    inter_options = sorted({1, 2} & set(range(1, cpu_count + 1)))
+    arg_values = vars(args)
+    ctx = mp.get_context('spawn')
+
+    trials = []
+
+    def run(settings):
+        with ctx.Pool(1) as pool:
+            result = pool.apply(_thread_trial, (settings, arg_values))
+        result.update(settings)
+        trials.append(result)
+        print(f"  intra {str(settings['intra_op']):>4s}  inter {str(settings['inter_op']):>4s}  "
+              f"opencv {str(settings['opencv']):>7s}: {result['fps']:6.1f} FPS, "
+              f"frame p95 {result['frame_p95_ms']:.1f} ms")
+        return result
+
+    for intra_op in intra_options:
+        for inter_op in inter_options:
+            run({'intra_op': intra_op, 'inter_op': inter_op, 'opencv': None})
+    best = max(trials, key=lambda t: t['fps'])
+    for opencv in sorted({1, max(1, cpu_count // 2)}):
+        run({'intra_op': best['intra_op'], 'inter_op': best['inter_op'], 'opencv': opencv})
+
+    best = max(trials, key=lambda t: t['fps'])
+    return {'cpu_count': cpu_count, 'trials': trials,
+            'best': {k: best[k] for k in ('intra_op', 'inter_op', 'opencv', 'fps', 'frame_p95_ms')}}
+
+
+def print_thread_tuning(tuning):
+    """Print the best thread settings as config.py lines"""
+    best = tuning['best']
+    print("\n" + "="*72)
+    print(f"BEST THREAD SETTINGS ({tuning['cpu_count']} cores, {len(tuning['trials'])} trials)")
+    print("="*72)
+    print(f"{best['fps']:.1f} FPS, frame p95 {best['frame_p95_ms']:.1f} ms with (config.py):")
+    print(f"TF_INTRA_OP_THREADS = {best['intra_op']}")
+    print(f"TF_INTER_OP_THREADS = {best['inter_op']}")
+    print(f"OPENCV_THREADS = {best['opencv']}")
+    print("="*72 + "\n")
+
+
+def git_commit():
+    """Current git commit hash, if available"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results):
+    """Print a per-stage latency table"""
+    print("\n" + "="*72)
+    print("PIPELINE BENCHMARK")
+    print("="*72)
+    print(f"{'Stage':20s} {'Count':>7s} {'Mean':>9s} {'p50':>9s} {'p95':>9s} {'p99':>9s}  (ms)")
+    stages = results['stages']
+    names = [s for s in STAGE_ORDER if s in stages] + [s for s in stages if s not in STAGE_ORDER]
+    for name in names:
+        s = stages[name]
+        print(f"{name:20s} {s['count']:7d} {s['mean_ms']:9.2f} {s['p50_ms']:9.2f} "
+              f"{s['p95_ms']:9.2f} {s['p99_ms']:9.2f}")
+    print("-"*72)
+    print(f"Frames: {results['frames']} ({results['frames_with_prediction']} with a hand prediction)")
+    roi = results['roi_tracking']
+    print(f"Hand detection: {roi['roi_detections']} on the ROI, "
+          f"{roi['full_frame_detections']} on the full frame")
+    cache = results.get('prediction_cache')
+    if cache:
+        print(f"Prediction cache: {cache['hit_rate']*100:.1f}% hits "
+              f"({cache['hits']}/{cache['hits'] + cache['misses']} lookups)")
+    print(f"Overall FPS: {results['fps']:.1f}")
+    print("="*72 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-frame detection pipeline")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--synthetic', type=int, metavar='N', help="Use N random frames (default: 300)")
+    source.add_argument('--video', help="Read frames from a video file")
+    source.add_argument('--images', help="Read frames from a directory of images")
+    source.add_argument('--cache', help="Read frames from a dataset cache (see dataset_cache.py)")
+    parser.add_argument('--model', help="Model path (.h5, .keras or .tflite, default: MODEL_PATH)")
+    parser.add_argument('--width', type=int, help="Synthetic frame width (default: CAMERA_WIDTH)")
+    parser.add_argument('--height', type=int, help="Synthetic frame height (default: CAMERA_HEIGHT)")
+    parser.add_argument('--limit', type=int, default=None, help="Maximum frames read from video/images/cache")
+    parser.add_argument('--warmup', type=int, default=10, help="Frames excluded from the statistics")
+    parser.add_argument('--cadence', action='store_true', help="Use the configured classifier cadence")
+    parser.add_argument('--no-roi', action='store_true', help="Run hand detection on the full frame only")
+    parser.add_argument('--detection-scale', type=float,
+                        help="Scale of the frame used for full-frame hand detection (default: DETECTION_SCALE)")
+    parser.add_argument('--no-prediction-cache', action='store_true',
+                        help="Classify every crop even if a near-identical one was seen recently")
+    parser.add_argument('--no-force-classify', action='store_true',
+                        help="Do not classify a centre crop on frames without a hand")
+    parser.add_argument('--tune-threads', action='store_true',
+                        help="Try TensorFlow/OpenCV thread pool sizes and report the fastest")
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON results file")
+    args = parser.parse_args()
+
+    # config.py, the model's metadata and SIGN_* overrides (explicit options still win)
+    if load_cli_config(args, {'width': 'CAMERA_WIDTH', 'height': 'CAMERA_HEIGHT',
+                              'detection_scale': 'DETECTION_SCALE'}) is None:
+        return 1
+
+    source_name, frames = open_source(args)
+
+    tuning = None
+    if args.tune_threads:
+        print(f"\nTuning thread pools on {source_name} (one process per setting)...")
+        tuning = tune_threads(args)
+        print_thread_tuning(tuning)
+        best = tuning['best']
+        apply_thread_settings(best['intra_op'], best['inter_op'], best['opencv'])
+    else:
+        apply_thread_settings()
+
+    print(f"\nLoading models ({args.model})...")
+    try:
+        recognizer = create_recognizer(model_path=args.model, use_cadence=args.cadence,
+                                       roi_tracking=not args.no_roi, detection_scale=args.detection_scale,
+                                       prediction_cache=not args.no_prediction_cache)
+    except ConfigError as e:
+        print(f"❌ {e}")
+        return 1
+    if not recognizer.has_classifier:
+        print("⚠️  No classifier loaded - only hand detection and display stages are measured")
+
+    print(f"Running benchmark on {source_name}...")
+    results = run_benchmark(recognizer, frames, warmup=args.warmup,
+                            force_classify=not args.no_force_classify)
+    print_results(results)
+
+    results.update({
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'source': source_name,
+        'model_path': args.model,
+        'classifier_mode': config.CLASSIFIER_MODE,
+        'cadence': args.cadence,
+        'detection_scale': args.detection_scale,
+        'threads': {
+            'tf_intra_op': os.environ.get('TF_NUM_INTRAOP_THREADS'),
+            'tf_inter_op': os.environ.get('TF_NUM_INTEROP_THREADS'),
+            'opencv': cv2.getNumThreads()
+        },
+        'thread_tuning': tuning,
+        'host': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count()
+        }
+    })
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Build Landmark Dataset
+Extracts MediaPipe hand landmarks from the training image folders and writes the
+index used by the landmark classifier mode (CLASSIFIER_MODE = 'landmark')
+"""
+
+import argparse
+import os
+import random
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from dataset import IMAGE_EXTENSIONS, LABEL_ALIASES
+from landmark_classifier import LandmarkClassifier, normalize_landmarks
+
+
+def list_class_folders(directory):
+    """Class folders in alphabetical order, like image_dataset_from_directory"""
+    return sorted(entry.name for entry in os.scandir(directory) if entry.is_dir())
+
+
+def extract_landmarks(directory, max_per_class=300, seed=42):
+    """
+    Run MediaPipe on every sampled image and collect normalized landmark vectors
+
+    Args:
+        directory: Root folder with one sub-folder per class
+        max_per_class: Maximum number of images sampled per class (0 = all)
+        seed: Random seed for sampling
+
+    Returns:
+        (features, labels, class_names)
+    """
+    import mediapipe as mp
+
+    rng = random.Random(seed)
+    folders = list_class_folders(directory)
+    features, labels, class_names = [], [], []
+
+    with mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=1,
+                                  min_detection_confidence=0.5) as hands:
+        for folder in folders:
+            files = sorted(f for f in os.listdir(os.path.join(directory, folder))
+                           if f.lower().endswith(IMAGE_EXTENSIONS))
+            rng.shuffle(files)
+            if max_per_class:
+                files = files[:max_per_class]
+
+            vectors = []
+            for filename in files:
+                image = cv2.imread(os.path.join(directory, folder, filename))
+                if image is None:
+                    continue
+                results = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                if results.multi_hand_landmarks:
+                    vectors.append(normalize_landmarks(results.multi_hand_landmarks[0],
+                                                       image.shape[1] / image.shape[0]))
+
+            label = LABEL_ALIASES.get(folder, folder)
+            if not vectors:
+                print(f"  ✗ {label:10s} - no hands detected, skipped")
+                continue
+
+            class_idx = len(class_names)
+            class_names.append(label)
+            features.extend(vectors)
+            labels.extend([class_idx] * len(vectors))
+            print(f"  ✓ {label:10s} - {len(vectors)}/{len(files)} images with landmarks")
+
+    return np.array(features, dtype=np.float32), np.array(labels, dtype=np.int64), class_names
+
+
+def holdout_accuracy(features, labels, class_names, method, k, split=0.1, seed=42):
+    """Accuracy of the classifier on a random held-out split"""
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(labels))
+    num_test = max(1, int(len(labels) * split))
+    test_idx, train_idx = order[:num_test], order[num_test:]
+
+    classifier = LandmarkClassifier(features[train_idx], labels[train_idx], class_names, method=method, k=k)
+    predicted = classifier.predict_proba(features[test_idx]).argmax(axis=1)
+    return float((predicted == labels[test_idx]).mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the landmark classifier index from image folders")
+    parser.add_argument('directory', help="Dataset root with one folder per class (e.g. asl_alphabet_train)")
+    parser.add_argument('--output', default='landmark_index.npz', help="Output index file")
+    parser.add_argument('--max-per-class', type=int, default=300, help="Images sampled per class (0 = all)")
+    parser.add_argument('--method', choices=['knn', 'centroid'], default='knn', help="Method used for the accuracy check")
+    parser.add_argument('--k', type=int, default=5, help="Neighbours for k-NN")
+    args = parser.parse_args()
+
+    if not Path(args.directory).is_dir():
+        print(f"❌ Dataset directory not found: {args.directory}")
+        return 1
+
+    print(f"\nExtracting landmarks from: {args.directory}\n")
+    features, labels, class_names = extract_landmarks(args.directory, args.max_per_class)
+    if len(labels) == 0:
+        print("\n❌ No landmarks extracted")
+        return 1
+
+    np.savez_compressed(args.output, features=features, labels=labels, class_names=np.array(class_names))
+    print(f"\n✓ Saved {len(labels)} samples, {len(class_names)} classes to {args.output}")
+
+    accuracy = holdout_accuracy(features, labels, class_names, args.method, args.k)
+    print(f"✓ Hold-out accuracy ({args.method}): {accuracy*100:.1f}%")
+    print("\nSet CLASSIFIER_MODE = 'landmark' in config.py to use it.\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
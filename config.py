@@ -9,18 +9,66 @@ Customize these settings based on your model and requirements
 
 # Path to your trained model
 MODEL_PATH = "model.h5"  # Change this to your model path
-# Examples: "asl_model.h5", "model.keras", "models/sign_language_model.h5"
+# Examples: "asl_model.h5", "model.keras", "models/sign_language_model.h5",
+#           "asl_model_int8.tflite" (TFLite backend is picked from the extension)
+
+# Model store - Keras models are converted once into an optimized artifact kept
+# under the content hash of the model file; later launches load it directly
+MODEL_STORE_DIR = ".model_store"      # None loads the .h5/.keras file every launch
+MODEL_STORE_FORMAT = 'saved_model'    # 'saved_model' (traced forward function) or 'tflite'
+
+# Thread count for the TFLite interpreter (None = TFLite default)
+TFLITE_NUM_THREADS = None
 
 # Input image size expected by your model
 IMG_SIZE = 64  # Adjust based on your model's input size
 
+# Largest number of images classified in one forward pass (SignLanguageModel.predict_batch)
+MAX_BATCH_SIZE = 32
+
+# Multi-stream server: how long a hand crop waits for crops from other streams
+# to join its batch (milliseconds)
+MAX_BATCH_WAIT_MS = 5
+
+# Recognition service (recognition_service.py) - WebSocket / chunked HTTP on localhost
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_WORKERS = 2       # Executor threads; bounds the frames processed at once
+SERVICE_QUEUE_SIZE = 2    # Frames buffered per connection
+SERVICE_POLICY = 'drop'   # Full queue: 'drop' the oldest frame or 'block' (TCP backpressure)
+
+# Shared model host (model_host.py) - one process holds the model, others send
+# crops through shared memory. Set the address to make the app a client.
+MODEL_HOST_ADDRESS = None          # e.g. "127.0.0.1:6010"
+MODEL_HOST_AUTHKEY = "sign-language-host"
+MODEL_HOST_SLOTS = 8               # Requests in flight at once across all clients
+MODEL_HOST_LEASE_TIMEOUT = 30.0    # Seconds before a slot held by a dead client is taken back
+
+# Classifier mode
+# 'cnn'      - crop the hand and classify pixels with the Keras model
+# 'landmark' - classify the 21 MediaPipe landmarks directly (no crop, no CNN)
+CLASSIFIER_MODE = 'cnn'
+
+# Landmark index built with: python build_landmark_dataset.py <asl_alphabet_train>
+LANDMARK_INDEX_PATH = "landmark_index.npz"
+LANDMARK_METHOD = 'knn'  # 'knn' or 'centroid'
+LANDMARK_K = 5
+
 # Class labels - customize based on your training data
-# Option 1: Standard ASL Alphabet (A-Z)
+# Default: the 29 asl_alphabet_train folders in the order the training notebook
+# sees them (A-Z, then del, nothing, space), matching its Dense(29) output
 CLASS_LABELS = [
     'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M',
-    'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z'
+    'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z',
+    'del', 'nothing', 'space'
 ]
 
+# Option 1: Letters only (A-Z), for a model with 26 outputs
+# CLASS_LABELS = [
+#     'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M',
+#     'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z'
+# ]
+
 # Option 2: If your model includes numbers or special characters
 # CLASS_LABELS = [
 #     'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M',
@@ -39,19 +87,43 @@ CLASS_LABELS = [
 # DETECTION CONFIGURATION
 # ============================================================================
 
-# Prediction stability - number of consistent frames needed before adding to text
+# How per-frame predictions become committed letters
+# 'temporal'  - moving average of the class probabilities plus a sliding-window
+#               vote; a letter is committed once per decisive change
+# 'stability' - legacy rule: the same letter on STABILITY_THRESHOLD + 1 frames in a row
+SMOOTHING_METHOD = 'temporal'
+
+# Prediction stability - number of consistent frames needed before adding to text ('stability')
 STABILITY_THRESHOLD = 5  # Increase for more stable predictions, decrease for faster response
 
 # Minimum confidence threshold for predictions (0.0 to 1.0)
 MIN_CONFIDENCE = 0.7  # Only accept predictions with confidence above this value
 
+# 'temporal' smoothing settings
+SMOOTHING_ALPHA = 0.5      # Weight of the newest frame in the moving average (1.0 = no smoothing)
+VOTE_WINDOW = 5            # Recent frames taking part in the vote
+VOTE_MIN = 3               # Votes a letter needs within the window to be committed
+RELEASE_CONFIDENCE = 0.4   # The same letter can repeat only after its confidence drops below this
+
 # Hand detection confidence
 HAND_DETECTION_CONFIDENCE = 0.7
 HAND_TRACKING_CONFIDENCE = 0.5
 
-# Maximum number of hands to detect
+# Maximum number of hands to detect (all hands of a frame are classified in one
+# batch; each gets its own smoothing and a Left/Right label)
 MAX_HANDS = 1
 
+# Region-of-interest tracking - run hand detection on the area around the last
+# hand instead of the full frame (falls back to the full frame when the hand is lost)
+ROI_TRACKING = True
+ROI_MARGIN = 0.5  # Extra search space around the hand, as a fraction of its size
+# While fewer than MAX_HANDS hands are tracked, search the full frame every N frames
+ROI_REDETECT_INTERVAL = 10
+
+# Scale of the frame used for full-frame hand detection (1.0 = full resolution,
+# 0.5 = half width and height; helps on 720p/1080p cameras)
+DETECTION_SCALE = 1.0
+
 
 # ============================================================================
 # CAMERA CONFIGURATION
@@ -67,6 +139,28 @@ CAMERA_HEIGHT = 480
 # Frame rate (frames per second)
 FPS = 30
 
+# Maximum display refresh rate, independent of the inference rate
+DISPLAY_FPS = 30
+
+# Classifier cadence - run the classifier at least every N frames (1 = every frame)
+CLASSIFY_EVERY_N_FRAMES = 2
+
+# Classify early when hand landmarks move more than this since the last
+# classification (normalized image units, 0 disables)
+MOTION_THRESHOLD = 0.03
+
+# Automatically raise/lower the cadence to hold FPS
+ADAPTIVE_CADENCE = True
+MAX_CLASSIFY_INTERVAL = 8
+
+# Prediction cache - reuse the class probabilities of a recently seen, near-identical
+# hand crop (perceptual hash) or landmark set instead of running the classifier
+PREDICTION_CACHE_SIZE = 256       # Entries kept (0 disables the cache)
+PREDICTION_CACHE_TTL = 1.0        # Seconds an entry stays valid (0 = no expiry)
+PREDICTION_CACHE_HASH_SIZE = 8    # dHash grid of the crop (larger = stricter match)
+PREDICTION_CACHE_SIZE_STEP = 16   # Crops only match if their width/height fall in the same N-pixel bucket
+LANDMARK_CACHE_STEP = 0.05        # Landmark quantization step ('landmark' mode)
+
 
 # ============================================================================
 # UI CONFIGURATION
@@ -118,8 +212,26 @@ USE_GPU = True
 # TensorFlow logging level (0=all, 1=info, 2=warning, 3=error)
 TF_LOG_LEVEL = '2'
 
-# Enable performance monitoring
+# Thread pools (None = library default). Applied before the model loads;
+# 'python benchmark.py --tune-threads' reports the best values for this machine
+TF_INTRA_OP_THREADS = None   # Threads inside one TensorFlow op
+TF_INTER_OP_THREADS = None   # TensorFlow ops run in parallel
+OPENCV_THREADS = None        # cv2.setNumThreads
+
+# Pin the app's threads to cores (Linux only), e.g.
+# {'capture': [0], 'inference': [1, 2], 'ui': [3]}; None = no pinning
+CPU_AFFINITY = None
+
+# Enable performance monitoring (per-stage timings and metrics export)
 ENABLE_PERFORMANCE_STATS = False
 
-# Debug mode - shows additional information
+# Debug mode - shows additional information (including the performance HUD)
 DEBUG_MODE = False
+
+# Draw FPS, per-stage latency, queue depths and dropped frames on the video
+PERFORMANCE_HUD = False
+
+# Metrics export (active when ENABLE_PERFORMANCE_STATS, DEBUG_MODE or PERFORMANCE_HUD is on)
+METRICS_JSONL_PATH = None      # e.g. "metrics.jsonl" - one JSON snapshot per line
+METRICS_PORT = None            # e.g. 9108 - Prometheus text at http://127.0.0.1:9108/metrics
+METRICS_EXPORT_INTERVAL = 10   # Seconds between JSON-lines snapshots
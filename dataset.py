@@ -0,0 +1,103 @@
+"""
+Dataset Helpers for Sign Language Detection
+Lists labelled image folders and decodes/resizes images in a bounded worker pool
+"""
+
+import multiprocessing as mp
+import os
+from collections import deque
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# Folder names of the ASL alphabet dataset mapped to the labels the app understands
+LABEL_ALIASES = {'del': 'Delete', 'space': 'Space', 'nothing': 'Nothing'}
+
+
+def list_labelled_images(directory):
+    """
+    List (path, label) pairs from a labelled folder tree
+
+    Two layouts are understood:
+    - one sub-folder per class (asl_alphabet_train): the label is the folder name
+    - a flat folder (asl_alphabet_test): the label is the file name up to the
+      first underscore, e.g. 'A_test.jpg' -> 'A'
+
+    Returns:
+        Sorted list of (path, label) tuples
+    """
+    directory = Path(directory)
+    folders = sorted(entry.name for entry in os.scandir(directory) if entry.is_dir())
+    items = []
+    if folders:
+        for folder in folders:
+            for root, _, files in os.walk(directory / folder):
+                items.extend((os.path.join(root, f), folder) for f in sorted(files)
+                             if f.lower().endswith(IMAGE_EXTENSIONS))
+    else:
+        for f in sorted(os.listdir(directory)):
+            if f.lower().endswith(IMAGE_EXTENSIONS):
+                items.append((str(directory / f), Path(f).stem.split('_')[0]))
+    return items
+
+
+def resolve_label(label, class_labels):
+    """Map a dataset label to an index in `class_labels` (None if unknown)"""
+    for candidate in (label, LABEL_ALIASES.get(label.lower()), label.upper()):
+        if candidate in class_labels:
+            return class_labels.index(candidate)
+    return None
+
+
+def load_resized(paths, img_size):
+    """
+    Decode and resize a group of images (runs in a worker process)
+
+    Returns:
+        (images, ok) tuple: uint8 BGR array of shape (len(paths), img_size, img_size, 3)
+        and a boolean mask of the images that could be read
+    """
+    images = np.zeros((len(paths), img_size, img_size, 3), dtype=np.uint8)
+    ok = np.zeros(len(paths), dtype=bool)
+    for i, path in enumerate(paths):
+        image = cv2.imread(path)
+        if image is not None:
+            cv2.resize(image, (img_size, img_size), dst=images[i])
+            ok[i] = True
+    return images, ok
+
+
+def iter_resized(paths, img_size, chunk_size=64, workers=None, max_pending=None):
+    """
+    Decode and resize images in a process pool, yielding chunks in order
+
+    At most `max_pending` chunks are decoded ahead of the consumer, so memory
+    use does not grow with the dataset size.
+
+    Args:
+        paths: List of image paths
+        img_size: Output size (square)
+        chunk_size: Images per worker task
+        workers: Worker processes (default: CPU count)
+        max_pending: Chunks in flight (default: twice the worker count)
+
+    Yields:
+        (start_index, images, ok) for consecutive chunks of `paths`
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    pending = deque()
+
+    with mp.get_context('spawn').Pool(workers) as pool:
+        for start in range(0, len(paths), chunk_size):
+            job = pool.apply_async(load_resized, (paths[start:start + chunk_size], img_size))
+            pending.append((start, job))
+            if len(pending) >= max_pending:
+                done_start, done_job = pending.popleft()
+                yield (done_start,) + done_job.get()
+        while pending:
+            done_start, done_job = pending.popleft()
+            yield (done_start,) + done_job.get()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Preprocessed Dataset Cache for Sign Language Detection
+Decodes and resizes an image folder tree once into memory-mapped .npy shards,
+so evaluation, benchmarking and retraining read batches without decoding
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from dataset import iter_resized, list_labelled_images
+
+INDEX_FILE = 'index.json'
+CACHE_VERSION = 1
+
+
+def is_cache(path):
+    """True if `path` is a directory written by build_cache"""
+    return (Path(path) / INDEX_FILE).is_file()
+
+
+def build_cache(directory, output_dir, img_size=64, shard_size=10000, workers=None, verbose=True):
+    """
+    Convert a labelled folder tree into memory-mapped shards
+
+    Each shard is a pair of .npy files: uint8 BGR images of shape
+    (N, img_size, img_size, 3) and int16 labels indexing the class names in
+    index.json.
+
+    Args:
+        directory: Class sub-folders or a flat '<label>_*.jpg' folder
+        output_dir: Cache directory (created if needed)
+        img_size: Stored image size (use the model input size)
+        shard_size: Images per shard
+        workers: Decoding processes (default: CPU count)
+        verbose: Print progress
+
+    Returns:
+        The index dictionary
+    """
+    items = list_labelled_images(directory)
+    class_names = sorted({label for _, label in items})
+    label_ids = {name: i for i, name in enumerate(class_names)}
+    paths = [path for path, _ in items]
+    labels = np.array([label_ids[label] for _, label in items], dtype=np.int16)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    shards = []
+    images_out = labels_out = None
+    written = capacity = 0  # images in / size of the current shard
+    start = time.perf_counter()
+
+    def close_shard():
+        images_out.flush()
+        labels_out.flush()
+        shards[-1]['count'] = written
+
+    for offset, images, ok in iter_resized(paths, img_size, workers=workers):
+        images, chunk_labels = images[ok], labels[offset:offset + len(ok)][ok]
+        while len(images):
+            if images_out is None or written == capacity:
+                if images_out is not None:
+                    close_shard()
+                # Size the shard for at most the images still to come
+                capacity = min(shard_size, len(images) + len(paths) - offset - len(ok))
+                name = f"shard_{len(shards):05d}"
+                images_out = np.lib.format.open_memmap(output_dir / f"{name}_images.npy", mode='w+',
+                                                       dtype=np.uint8, shape=(capacity, img_size, img_size, 3))
+                labels_out = np.lib.format.open_memmap(output_dir / f"{name}_labels.npy", mode='w+',
+                                                       dtype=np.int16, shape=(capacity,))
+                shards.append({'images': f"{name}_images.npy", 'labels': f"{name}_labels.npy", 'count': 0})
+                written = 0
+            n = min(len(images), capacity - written)
+            images_out[written:written + n] = images[:n]
+            labels_out[written:written + n] = chunk_labels[:n]
+            written += n
+            images, chunk_labels = images[n:], chunk_labels[n:]
+        if verbose:
+            done = offset + len(ok)
+            print(f"\r  {done}/{len(paths)} images, {done / (time.perf_counter() - start):.1f} images/sec",
+                  end="", flush=True)
+    if verbose:
+        print()
+    if images_out is not None:
+        close_shard()
+
+    index = {
+        'version': CACHE_VERSION,
+        'source': str(directory),
+        'img_size': img_size,
+        'channel_order': 'BGR',
+        'class_names': class_names,
+        'num_images': sum(shard['count'] for shard in shards),
+        'shards': shards
+    }
+    with open(output_dir / INDEX_FILE, 'w') as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+class DatasetCache:
+    """Read-only view of a cache written by build_cache"""
+
+    def __init__(self, cache_dir):
+        """
+        Open a cache (shards are memory-mapped, nothing is read yet)
+
+        Args:
+            cache_dir: Directory containing index.json and the shard files
+        """
+        self.cache_dir = Path(cache_dir)
+        with open(self.cache_dir / INDEX_FILE, 'r') as f:
+            self.index = json.load(f)
+        if self.index.get('version') != CACHE_VERSION:
+            raise ValueError(f"Unsupported cache version in {cache_dir}: {self.index.get('version')}")
+
+        self.img_size = self.index['img_size']
+        self.class_names = self.index['class_names']
+        self.shards = []
+        for shard in self.index['shards']:
+            count = shard['count']
+            # Unreadable images can leave unused rows at the end of a shard
+            images = np.load(self.cache_dir / shard['images'], mmap_mode='r')[:count]
+            labels = np.load(self.cache_dir / shard['labels'], mmap_mode='r')[:count]
+            self.shards.append((images, labels))
+
+    def __len__(self):
+        return self.index['num_images']
+
+    def iter_batches(self, batch_size=32, shuffle=False, seed=None, limit=None):
+        """
+        Yield (images, labels) batches
+
+        Batches are slices of the memory-mapped shards (no copy, no decoding).
+        With shuffle=True the order of shards and of batches within each shard
+        is randomized; images inside a batch stay contiguous on disk.
+
+        Args:
+            batch_size: Images per batch (batches do not span shards)
+            shuffle: Randomize the batch order
+            seed: Random seed for shuffling
+            limit: Stop after this many images
+
+        Yields:
+            (uint8 BGR images of shape (n, img_size, img_size, 3), int16 labels of shape (n,))
+        """
+        blocks = [(s, start) for s, (images, _) in enumerate(self.shards)
+                  for start in range(0, len(images), batch_size)]
+        if shuffle:
+            np.random.default_rng(seed).shuffle(blocks)
+
+        remaining = len(self) if limit is None else limit
+        for s, start in blocks:
+            if remaining <= 0:
+                return
+            images, labels = self.shards[s]
+            end = min(start + batch_size, len(images), start + remaining)
+            remaining -= end - start
+            yield images[start:end], labels[start:end]
+
+    def as_tf_dataset(self, batch_size=32, shuffle=True, seed=None):
+        """
+        Wrap the cache as a tf.data.Dataset of (RGB uint8 images, int labels) for retraining
+
+        Labels index `class_names`, which are sorted like image_dataset_from_directory.
+        """
+        import tensorflow as tf
+
+        def generator():
+            for images, labels in self.iter_batches(batch_size, shuffle=shuffle, seed=seed):
+                yield images[..., ::-1], labels.astype(np.int32)
+
+        size = self.img_size
+        return tf.data.Dataset.from_generator(generator, output_signature=(
+            tf.TensorSpec(shape=(None, size, size, 3), dtype=tf.uint8),
+            tf.TensorSpec(shape=(None,), dtype=tf.int32)
+        )).prefetch(tf.data.AUTOTUNE)
+
+    def images(self):
+        """Yield every image in order (e.g. as frames for the pipeline benchmark)"""
+        for images, _ in self.shards:
+            yield from images
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a memory-mapped cache of a labelled image folder")
+    parser.add_argument('directory', help="Class folders or a flat folder of '<label>_*.jpg' files")
+    parser.add_argument('--output', required=True, help="Cache directory")
+    parser.add_argument('--img-size', type=int, default=64, help="Stored image size (model input size)")
+    parser.add_argument('--shard-size', type=int, default=10000, help="Images per shard")
+    parser.add_argument('--workers', type=int, default=None, help="Decoding processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"❌ Dataset directory not found: {args.directory}")
+        return 1
+
+    print(f"\nCaching {args.directory} at {args.img_size}x{args.img_size}...")
+    index = build_cache(args.directory, args.output, args.img_size, args.shard_size, args.workers)
+    if index['num_images'] == 0:
+        print("❌ No images found")
+        return 1
+
+    size_mb = sum(f.stat().st_size for f in Path(args.output).glob('*.npy')) / (1024 * 1024)
+    print(f"✓ {index['num_images']} images, {len(index['class_names'])} classes, "
+          f"{len(index['shards'])} shard(s), {size_mb:.1f} MB in {args.output}")
+    print(f"\nUse it with: python evaluate_model.py {args.output}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Display Stage for Sign Language Detection
+Converts processed frames for the Tk video label without per-frame allocations
+"""
+
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+
+class DisplayStage:
+    """Reuses one RGB buffer and one PhotoImage, and caps the display refresh rate"""
+
+    def __init__(self, size=(640, 480), max_fps=30):
+        """
+        Initialize the display stage
+
+        Args:
+            size: Display size (width, height)
+            max_fps: Maximum display refresh rate, independent of the inference rate
+        """
+        self.width, self.height = size
+        self.max_fps = max_fps
+        self.interval_ms = max(1, int(1000 / max_fps)) if max_fps else 1
+
+        # Preallocated buffers: resized BGR (only used when sizes differ) and RGB output
+        self._resized = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._rgb = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.photo = None
+
+    def convert(self, frame):
+        """
+        Convert a BGR frame to display-sized RGB in a reused buffer
+
+        The returned array is overwritten by the next call.
+
+        Args:
+            frame: Processed BGR frame
+
+        Returns:
+            RGB array of shape (height, width, 3)
+        """
+        h, w = frame.shape[:2]
+        if (w, h) == (self.width, self.height):
+            source = frame
+        else:
+            # INTER_AREA when shrinking, INTER_LINEAR when enlarging; both far cheaper than LANCZOS
+            interpolation = cv2.INTER_AREA if w > self.width else cv2.INTER_LINEAR
+            source = cv2.resize(frame, (self.width, self.height), dst=self._resized,
+                                interpolation=interpolation)
+        return cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+    def render(self, frame, label):
+        """
+        Show a frame on a Tk label (must run on the Tk thread)
+
+        The first call creates the PhotoImage; later calls update it in place.
+        """
+        image = Image.fromarray(self.convert(frame))
+        if self.photo is None:
+            self.photo = ImageTk.PhotoImage(image)
+            label.config(image=self.photo)
+            label.image = self.photo
+        else:
+            self.photo.paste(image)
+
+    def reset(self):
+        """Forget the PhotoImage (e.g. after the label was cleared)"""
+        self.photo = None
+
+
+def legacy_convert(frame, size=(640, 480)):
+    """Previous display path: new RGB array, PIL image and LANCZOS resize every frame"""
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    frame_pil = Image.fromarray(frame_rgb)
+    return frame_pil.resize(size, Image.Resampling.LANCZOS)
+
+
+def measure(convert, frames):
+    """Mean per-frame CPU time (ms) and traced allocations (KB) of `convert`"""
+    import tracemalloc
+
+    cpu_ms, alloc_kb = [], []
+    tracemalloc.start()
+    try:
+        for frame in frames:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            start = time.thread_time()
+            convert(frame)
+            cpu_ms.append((time.thread_time() - start) * 1000.0)
+            _, peak = tracemalloc.get_traced_memory()
+            alloc_kb.append((peak - before) / 1024.0)
+    finally:
+        tracemalloc.stop()
+    return float(np.mean(cpu_ms)), float(np.mean(alloc_kb))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare the legacy and current display paths")
+    parser.add_argument('--frames', type=int, default=300, help="Number of frames per run")
+    parser.add_argument('--width', type=int, default=640, help="Source frame width")
+    parser.add_argument('--height', type=int, default=480, help="Source frame height")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8) for _ in range(8)]
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+
+    stage = DisplayStage()
+    paths = {'legacy (LANCZOS + PIL)': legacy_convert, 'display stage': stage.convert}
+
+    # Include PhotoImage creation / in-place paste when a display is available
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        label = tk.Label(root)
+        paths['legacy + new PhotoImage'] = lambda f: ImageTk.PhotoImage(legacy_convert(f))
+        paths['display stage + paste'] = lambda f: stage.render(f, label)
+    except Exception:
+        print("(No display available - PhotoImage updates not measured)")
+
+    print("\n" + "="*64)
+    print(f"DISPLAY STAGE ({args.width}x{args.height} -> 640x480, {args.frames} frames)")
+    print("="*64)
+    print(f"{'Path':28s} {'CPU ms/frame':>14s} {'Alloc KB/frame':>16s}")
+    for name, convert in paths.items():
+        cpu, alloc = measure(convert, frames)
+        print(f"{name:28s} {cpu:14.3f} {alloc:16.1f}")
+    print("="*64)
+    print("Allocations are those visible to tracemalloc (Python and NumPy).\n")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Model Evaluation for Sign Language Detection
+Streams a labelled image folder through SignLanguageModel and reports accuracy,
+a per-class confusion matrix and throughput
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+import config
+from model_wrapper import SignLanguageModel
+from runtime_config import load_cli_config
+
+
+def print_evaluation(result):
+    """Print accuracy, per-class accuracy and the confusion matrix"""
+    names = result['class_names']
+    confusion = result['confusion_matrix']
+    rows = [i for i in range(len(names)) if confusion[i].sum() or confusion[:, i].sum()]
+
+    print("\n" + "="*60)
+    print("EVALUATION")
+    print("="*60)
+    print(f"Images:      {result['num_images']}")
+    print(f"Accuracy:    {result['accuracy']*100:.2f}%")
+    print(f"Throughput:  {result['images_per_sec']:.1f} images/sec ({result['seconds']:.1f}s)")
+    if result['unreadable']:
+        print(f"Unreadable:  {result['unreadable']} images")
+
+    print("\nPer-class accuracy:")
+    for name, accuracy in result['per_class_accuracy'].items():
+        print(f"  {name:10s} {accuracy*100:6.1f}%")
+
+    # Compact matrix: rows = true class, columns = predicted class
+    labels = [names[i][:4] for i in rows]
+    print("\nConfusion matrix (rows = true, columns = predicted):")
+    print(" " * 6 + "".join(f"{label:>5s}" for label in labels))
+    for i, label in zip(rows, labels):
+        print(f"{label:>5s} " + "".join(f"{confusion[i, j]:5d}" for j in rows))
+    print("="*60 + "\n")
+
+
+def save_confusion_csv(result, path):
+    """Write the confusion matrix with class names as header row and column"""
+    names = result['class_names']
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['true \\ predicted'] + names)
+        for name, row in zip(names, result['confusion_matrix']):
+            writer.writerow([name] + [int(v) for v in row])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate a model on a labelled image folder")
+    parser.add_argument('directory', help="Class folders, a flat folder of '<label>_*.jpg' files "
+                                          "or a cache built by dataset_cache.py")
+    parser.add_argument('--model', help="Model path (.h5, .keras or .tflite, default: MODEL_PATH)")
+    parser.add_argument('--labels', help="JSON file with the model's class labels (e.g. class_labels.json)")
+    parser.add_argument('--img-size', type=int, default=None, help="Model input size (default: IMG_SIZE)")
+    parser.add_argument('--batch-size', type=int, help="Images per forward pass (default: MAX_BATCH_SIZE)")
+    parser.add_argument('--workers', type=int, default=None, help="Decoding processes (default: CPU count)")
+    parser.add_argument('--limit', type=int, default=None, help="Evaluate a random sample of N images")
+    parser.add_argument('--confusion-csv', help="Also write the confusion matrix to this CSV file")
+    args = parser.parse_args()
+
+    # config.py, the model's metadata and SIGN_* overrides (explicit options still win)
+    if load_cli_config(args, {'batch_size': 'MAX_BATCH_SIZE', 'img_size': 'IMG_SIZE'}) is None:
+        return 1
+
+    if not os.path.isdir(args.directory):
+        print(f"❌ Dataset directory not found: {args.directory}")
+        return 1
+
+    class_labels = config.CLASS_LABELS
+    if args.labels:
+        with open(args.labels, 'r') as f:
+            class_labels = json.load(f)
+
+    model = SignLanguageModel(args.model, img_size=args.img_size, class_labels=class_labels,
+                              max_batch_size=args.batch_size, num_threads=config.TFLITE_NUM_THREADS)
+    print(f"\nEvaluating on {args.directory}...")
+    result = model.evaluate(args.directory, batch_size=args.batch_size, workers=args.workers, limit=args.limit)
+    if result['num_images'] == 0:
+        print("❌ No images with known labels found")
+        return 1
+
+    print_evaluation(result)
+    if args.confusion_csv:
+        save_confusion_csv(result, args.confusion_csv)
+        print(f"✓ Confusion matrix written to {args.confusion_csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,14 @@ and prepare it for use with the sign language detection application
 """
 
 import os
+import sys
 import json
+import argparse
+import random
 from pathlib import Path
 
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
 def create_model_export_instructions():
     """Create instructions for exporting model from notebook"""
     
@@ -67,7 +72,10 @@ model_config = {
     'img_size': img_size,
     'input_shape': list(input_shape),
     'num_classes': len(class_labels),
-    'class_labels': class_labels
+    'class_labels': class_labels,
+    # How the app scales pixels before the model: use scale 1.0 if the model
+    # starts with a Rescaling(1./255) layer, otherwise 1/255
+    'preprocessing': {'scale': 1.0, 'offset': 0.0, 'channel_order': 'RGB'}
 }
 
 with open('model_config.json', 'w') as f:
@@ -122,6 +130,7 @@ def export_model_for_app(model, class_labels, model_name='asl_model'):
     
     # Get model info
     img_size = model.input_shape[1]
+    rescales = any(type(layer).__name__ == 'Rescaling' for layer in model.layers[:3])
     
     # Save configuration
     config = {
@@ -129,7 +138,8 @@ def export_model_for_app(model, class_labels, model_name='asl_model'):
         'img_size': img_size,
         'input_shape': list(model.input_shape),
         'num_classes': len(class_labels),
-        'class_labels': class_labels
+        'class_labels': class_labels,
+        'preprocessing': {'scale': 1.0 if rescales else 1.0 / 255.0, 'offset': 0.0, 'channel_order': 'RGB'}
     }
     
     with open('model_config.json', 'w') as f:
@@ -253,13 +263,15 @@ def export_model_for_app(model, class_labels, model_name='asl_model'):
     
     # Get model info
     img_size = model.input_shape[1]
+    rescales = any(type(layer).__name__ == 'Rescaling' for layer in model.layers[:3])
     
     # Save configuration
     config = {
         'model_file': f'{model_name}.h5',
         'img_size': img_size,
         'num_classes': len(class_labels),
-        'class_labels': class_labels
+        'class_labels': class_labels,
+        'preprocessing': {'scale': 1.0 if rescales else 1.0 / 255.0, 'offset': 0.0, 'channel_order': 'RGB'}
     }
     
     with open('model_config.json', 'w') as f:
@@ -294,7 +306,164 @@ export_model_for_app(model, class_labels, 'my_asl_model')
     print(f"✓ Code snippets saved to '{snippets_dir}/' directory")
     print("  You can copy-paste these into your notebook")
 
-if __name__ == "__main__":
+def representative_dataset(dataset_dir, img_size, num_samples=200, seed=42, normalization=None):
+    """
+    Build a representative-dataset generator for int8 calibration
+    
+    Images go through the same Preprocessor the app uses for hand crops.
+    Without a dataset directory, random images are used (lower int8 accuracy).
+    
+    Args:
+        dataset_dir: Folder tree of training images (one sub-folder per class), or None
+        img_size: Model input size
+        num_samples: Number of calibration images
+        seed: Random seed for sampling
+        normalization: Preprocessing contract from preprocessing.resolve_normalization
+    """
+    import cv2
+    import numpy as np
+    from preprocessing import Preprocessor
+    
+    paths = []
+    if dataset_dir:
+        for root, _, files in os.walk(dataset_dir):
+            paths.extend(os.path.join(root, f) for f in files if f.lower().endswith(IMAGE_EXTENSIONS))
+        random.Random(seed).shuffle(paths)
+        paths = paths[:num_samples]
+    
+    def generator():
+        preprocessor = Preprocessor(img_size, **(normalization or {}))
+        if not paths:
+            rng = np.random.default_rng(seed)
+            for _ in range(num_samples):
+                image = rng.integers(0, 256, (img_size, img_size, 3), dtype=np.uint8)
+                yield [preprocessor(image).copy()]
+            return
+        for path in paths:
+            image = cv2.imread(path)
+            if image is None:
+                continue
+            yield [preprocessor(image).copy()]
+    
+    return generator
+
+
+def export_tflite(model_path, output_dir='.', dataset_dir=None, num_samples=200, num_threads=None, runs=50):
+    """
+    Convert a trained Keras model to float32, float16 and int8 TFLite files
+    
+    Args:
+        model_path: Path to the .h5 / .keras model
+        output_dir: Directory for the .tflite files
+        dataset_dir: Training image folders used for int8 calibration (optional)
+        num_samples: Number of calibration images
+        num_threads: Interpreter thread count used when timing each variant
+        runs: Number of timed calls per variant
+        
+    Returns:
+        Dictionary mapping variant name to {'path', 'size_mb', 'mean_ms', 'p95_ms'}
+    """
+    import tensorflow as tf
+    import numpy as np
+    from inference_engine import InferenceEngine, TFLiteEngine
+    from preprocessing import load_model_metadata, metadata_sidecar, resolve_normalization
+    
+    model = tf.keras.models.load_model(model_path)
+    img_size = model.input_shape[1]
+    normalization = resolve_normalization(model_path, model)
+    # The sidecar is the only metadata read for the .tflite files, so it carries the labels too
+    source_metadata = load_model_metadata(model_path)
+    sidecar = {'source_model': str(model_path), 'img_size': img_size, 'preprocessing': normalization,
+               'num_classes': int(model.output_shape[-1])}
+    if source_metadata.get('class_labels') is not None:
+        sidecar['class_labels'] = source_metadata['class_labels']
+    stem = Path(model_path).stem
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    if not dataset_dir:
+        print("⚠️  No dataset directory given - calibrating int8 with random images")
+    
+    def convert(variant):
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        if variant == 'float16':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        elif variant == 'int8':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = representative_dataset(
+                dataset_dir, img_size, num_samples, normalization=normalization)
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        return converter.convert()
+    
+    dummy = np.random.rand(1, img_size, img_size, 3).astype(np.float32)
+    results = {}
+    
+    # Keras baseline
+    keras_engine = InferenceEngine(model, img_size=img_size)
+    for _ in range(runs):
+        keras_engine.predict(dummy)
+    summary = keras_engine.compiled_latency.summary()
+    results['keras'] = {
+        'path': str(model_path),
+        'size_mb': os.path.getsize(model_path) / (1024 * 1024),
+        'mean_ms': summary['mean_ms'],
+        'p95_ms': summary['p95_ms']
+    }
+    
+    for variant in ('float32', 'float16', 'int8'):
+        print(f"Converting {variant}...")
+        tflite_path = output_dir / f"{stem}_{variant}.tflite"
+        with open(tflite_path, 'wb') as f:
+            f.write(convert(variant))
+        # The Keras layers are gone after conversion, so record the input contract next to the file
+        with open(metadata_sidecar(tflite_path), 'w') as f:
+            json.dump(sidecar, f, indent=2)
+        
+        engine = TFLiteEngine(tflite_path, num_threads=num_threads)
+        for _ in range(runs):
+            engine.predict(dummy)
+        summary = engine.compiled_latency.summary()
+        results[variant] = {
+            'path': str(tflite_path),
+            'size_mb': os.path.getsize(tflite_path) / (1024 * 1024),
+            'mean_ms': summary['mean_ms'],
+            'p95_ms': summary['p95_ms']
+        }
+        print(f"  ✓ {tflite_path}")
+    
+    print("\n" + "="*60)
+    print("TFLITE EXPORT")
+    print("="*60)
+    print(f"{'Variant':10s} {'Size (MB)':>10s} {'Mean (ms)':>10s} {'p95 (ms)':>10s}")
+    for variant, r in results.items():
+        print(f"{variant:10s} {r['size_mb']:10.2f} {r['mean_ms']:10.2f} {r['p95_ms']:10.2f}")
+    print("="*60)
+    print("\nUse a .tflite file by setting MODEL_PATH in config.py\n")
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model export helper")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    tflite_parser = subparsers.add_parser('tflite', help="Convert a trained model to float32/float16/int8 TFLite")
+    tflite_parser.add_argument('model', help="Path to the trained .h5 / .keras model")
+    tflite_parser.add_argument('--dataset', default=None, help="Training image folders for int8 calibration")
+    tflite_parser.add_argument('--output-dir', default='.', help="Directory for the .tflite files")
+    tflite_parser.add_argument('--samples', type=int, default=200, help="Number of calibration images")
+    tflite_parser.add_argument('--threads', type=int, default=None, help="Interpreter threads used for timing")
+    
+    args = parser.parse_args()
+    
+    if args.command == 'tflite':
+        if not os.path.exists(args.model):
+            print(f"❌ Model file not found: {args.model}")
+            return 1
+        export_tflite(args.model, args.output_dir, args.dataset, args.samples, args.threads)
+        return 0
+    
     print("\n" + "="*60)
     print("  Model Export Helper")
     print("="*60)
@@ -310,3 +479,8 @@ if __name__ == "__main__":
     print("\nCreating notebook code snippets...")
     create_notebook_cell_snippets()
     print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
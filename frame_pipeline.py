@@ -0,0 +1,74 @@
+"""
+Frame Pipeline Helpers for Sign Language Detection
+Camera setup and bounded queues that join the capture, inference and render stages
+"""
+
+import queue
+
+import cv2
+
+import config
+
+
+def open_camera(index=None, width=None, height=None, fps=None):
+    """
+    Open a camera and request a resolution and frame rate
+
+    Args:
+        index: Camera device index (default: config.CAMERA_INDEX)
+        width, height: Requested resolution (default: config.CAMERA_WIDTH/HEIGHT)
+        fps: Requested frame rate (default: config.FPS)
+
+    Returns:
+        cv2.VideoCapture (check isOpened(); drivers may pick the nearest supported mode)
+    """
+    cap = cv2.VideoCapture(config.CAMERA_INDEX if index is None else index)
+    if cap.isOpened():
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width or config.CAMERA_WIDTH)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height or config.CAMERA_HEIGHT)
+        cap.set(cv2.CAP_PROP_FPS, fps or config.FPS)
+    return cap
+
+
+class LatestFrameQueue(queue.Queue):
+    """Bounded queue that drops the oldest item when full, so the newest frame always wins"""
+
+    def __init__(self, maxsize=1):
+        """
+        Initialize the queue
+
+        Args:
+            maxsize: Number of items held before the oldest one is dropped
+        """
+        super().__init__(maxsize=max(1, maxsize))
+        self.dropped = 0
+
+    def put_latest(self, item):
+        """
+        Put an item without blocking, discarding the oldest queued item if full
+
+        Args:
+            item: Item to enqueue (None is used as the end-of-stream marker)
+        """
+        while True:
+            try:
+                self.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get_latest(self, timeout=0.1):
+        """
+        Wait for the next item
+
+        Args:
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            The next item, or raises queue.Empty on timeout
+        """
+        return self.get(timeout=timeout)
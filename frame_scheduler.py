@@ -0,0 +1,110 @@
+"""
+Adaptive Inference Scheduler for Sign Language Detection
+Decides on which frames the classifier runs so video keeps up with the target FPS
+"""
+
+import numpy as np
+
+
+class AdaptiveScheduler:
+    """Runs the classifier every N frames or on hand motion, adapting N to a target FPS"""
+
+    def __init__(self, classify_every=1, motion_threshold=0.0, target_fps=30,
+                 adaptive=True, max_interval=10, adjust_every=15, smoothing=0.1):
+        """
+        Initialize the scheduler
+
+        Args:
+            classify_every: Classify at least every N frames (1 = every frame)
+            motion_threshold: Classify early when the mean landmark displacement since
+                the last classification exceeds this (normalized image units, 0 disables)
+            target_fps: Frame rate the adaptive cadence tries to hold
+            adaptive: If True, N is raised/lowered automatically to hold target_fps
+            max_interval: Upper bound for N when adapting
+            adjust_every: Number of frames between two cadence adjustments
+            smoothing: Weight of the newest frame time in the moving average
+        """
+        self.min_interval = max(1, int(classify_every))
+        self.interval = self.min_interval
+        self.max_interval = max(self.min_interval, int(max_interval))
+        self.motion_threshold = motion_threshold
+        self.target_fps = target_fps
+        self.adaptive = adaptive
+        self.adjust_every = adjust_every
+        self.smoothing = smoothing
+
+        self.avg_frame_time = None
+        self.frames_since_adjust = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the last classification (e.g. when the hand leaves the frame)"""
+        self.last_landmarks = None
+        self.frames_since_classify = 0
+
+    @staticmethod
+    def landmarks_to_array(hand_landmarks):
+        """Convert MediaPipe hand landmarks to a (21, 2) array of normalized x, y"""
+        return np.array([(lm.x, lm.y) for lm in hand_landmarks.landmark], dtype=np.float32)
+
+    def motion(self, landmarks):
+        """Mean landmark displacement since the last classification"""
+        if self.last_landmarks is None or landmarks is None or landmarks.shape != self.last_landmarks.shape:
+            return float('inf')
+        return float(np.linalg.norm(landmarks - self.last_landmarks, axis=1).mean())
+
+    def should_classify(self, landmarks=None):
+        """
+        Decide whether the classifier should run on the current frame
+
+        Args:
+            landmarks: (21, 2) landmark array for the current frame (21 rows per
+                hand when several hands are classified together), or None
+
+        Returns:
+            True if the classifier should run, False to reuse the last prediction
+        """
+        self.frames_since_classify += 1
+        if self.last_landmarks is None or self.frames_since_classify >= self.interval:
+            return True
+        if self.motion_threshold > 0 and self.motion(landmarks) >= self.motion_threshold:
+            return True
+        return False
+
+    def mark_classified(self, landmarks=None):
+        """Record that the classifier ran on the current frame"""
+        self.last_landmarks = landmarks
+        self.frames_since_classify = 0
+
+    def record_frame_time(self, seconds):
+        """
+        Feed the processing time of one frame and adapt the cadence
+
+        Args:
+            seconds: Time spent processing the frame
+        """
+        if self.avg_frame_time is None:
+            self.avg_frame_time = seconds
+        else:
+            self.avg_frame_time += self.smoothing * (seconds - self.avg_frame_time)
+
+        if not self.adaptive or not self.target_fps:
+            return
+
+        self.frames_since_adjust += 1
+        if self.frames_since_adjust < self.adjust_every:
+            return
+        self.frames_since_adjust = 0
+
+        fps = self.current_fps
+        if fps < self.target_fps * 0.95 and self.interval < self.max_interval:
+            self.interval += 1
+        elif fps > self.target_fps * 1.2 and self.interval > self.min_interval:
+            self.interval -= 1
+
+    @property
+    def current_fps(self):
+        """Frame rate achievable at the current average frame time"""
+        if not self.avg_frame_time:
+            return 0.0
+        return 1.0 / self.avg_frame_time
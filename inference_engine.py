@@ -0,0 +1,368 @@
+"""
+Inference Engine for Sign Language Detection
+Compiled, warmed-up forward pass shared by the app and the model wrapper
+"""
+
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+# TensorFlow is imported inside the functions that need it so importing this
+# module (and model_wrapper / the app) stays fast.
+
+
+class LatencyStats:
+    """Rolling record of per-call latencies in milliseconds"""
+
+    def __init__(self, window=500):
+        """
+        Initialize the latency record
+
+        Args:
+            window: Number of most recent calls to keep
+        """
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, latency_ms):
+        """Record one call latency (milliseconds)"""
+        self.samples.append(latency_ms)
+        self.count += 1
+
+    def summary(self):
+        """Return mean / p50 / p95 of the recorded latencies"""
+        if not self.samples:
+            return {'calls': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0}
+        values = np.fromiter(self.samples, dtype=np.float64)
+        return {
+            'calls': self.count,
+            'mean_ms': float(values.mean()),
+            'p50_ms': float(np.percentile(values, 50)),
+            'p95_ms': float(np.percentile(values, 95))
+        }
+
+
+class InferenceEngine:
+    """Runs a Keras model through a tf.function with a fixed input signature"""
+
+    backend = 'keras'
+
+    def __init__(self, model, img_size=64, channels=3, warmup_runs=3):
+        """
+        Initialize the inference engine
+
+        Args:
+            model: Loaded Keras model
+            img_size: Input image size expected by the model
+            channels: Number of input channels
+            warmup_runs: Number of dummy calls made at startup to trace the graph
+                (0 defers tracing until warmup() or the first prediction)
+        """
+        import tensorflow as tf
+
+        self.model = model
+        self.img_size = img_size
+        self.channels = channels
+        self.input_shape = tuple(model.input_shape)
+        self.output_shape = tuple(model.output_shape)
+
+        # The batch dimension is left open so single frames and batches share
+        # one traced graph instead of retracing per batch size.
+        input_signature = [
+            tf.TensorSpec(shape=(None, img_size, img_size, channels), dtype=tf.float32)
+        ]
+        self._compiled_forward = tf.function(self._forward, input_signature=input_signature)
+
+        self.compiled_latency = LatencyStats()
+        self.legacy_latency = LatencyStats()
+
+        self.warmup(warmup_runs)
+
+    def _forward(self, batch):
+        """Direct model call, traced once by tf.function"""
+        return self.model(batch, training=False)
+
+    def warmup(self, runs=3):
+        """Trace the graph and run a few dummy batches so the first frame is fast"""
+        dummy = np.zeros((1, self.img_size, self.img_size, self.channels), dtype=np.float32)
+        for _ in range(runs):
+            self._compiled_forward(dummy)
+
+    def predict(self, batch):
+        """
+        Run the compiled forward pass
+
+        Args:
+            batch: Preprocessed input batch of shape (N, img_size, img_size, channels)
+
+        Returns:
+            NumPy array of class probabilities with shape (N, num_classes)
+        """
+        batch = np.asarray(batch, dtype=np.float32)
+        start = time.perf_counter()
+        predictions = self._compiled_forward(batch).numpy()
+        self.compiled_latency.add((time.perf_counter() - start) * 1000.0)
+        return predictions
+
+    def predict_legacy(self, batch):
+        """Run the original `model.predict` path (kept for latency comparison)"""
+        batch = np.asarray(batch, dtype=np.float32)
+        start = time.perf_counter()
+        predictions = self.model.predict(batch, verbose=0)
+        self.legacy_latency.add((time.perf_counter() - start) * 1000.0)
+        return predictions
+
+    def compare_with_legacy(self, runs=50, batch_size=1):
+        """
+        Time the compiled path against `model.predict` on the same dummy input
+
+        Args:
+            runs: Number of calls made on each path
+            batch_size: Batch size of the dummy input
+
+        Returns:
+            Dictionary with 'compiled' and 'legacy' latency summaries and the speedup
+        """
+        dummy = np.random.rand(batch_size, self.img_size, self.img_size, self.channels).astype(np.float32)
+        compiled = LatencyStats(window=runs)
+        legacy = LatencyStats(window=runs)
+
+        for _ in range(runs):
+            start = time.perf_counter()
+            self._compiled_forward(dummy).numpy()
+            compiled.add((time.perf_counter() - start) * 1000.0)
+
+            start = time.perf_counter()
+            self.model.predict(dummy, verbose=0)
+            legacy.add((time.perf_counter() - start) * 1000.0)
+
+        compiled_summary = compiled.summary()
+        legacy_summary = legacy.summary()
+        speedup = legacy_summary['mean_ms'] / compiled_summary['mean_ms'] if compiled_summary['mean_ms'] else 0.0
+        return {'compiled': compiled_summary, 'legacy': legacy_summary, 'speedup': speedup}
+
+    def latency_report(self):
+        """Return a printable per-call latency report for both paths"""
+        return format_latency_report((('compiled', self.compiled_latency), ('legacy', self.legacy_latency)))
+
+
+class TFLiteEngine:
+    """Runs a .tflite model through the TFLite interpreter"""
+
+    backend = 'tflite'
+
+    def __init__(self, model_path, num_threads=None, warmup_runs=3):
+        """
+        Initialize the TFLite engine
+
+        Args:
+            model_path: Path to the .tflite file
+            num_threads: Interpreter thread count (None = TFLite default)
+            warmup_runs: Number of dummy calls made at startup (0 to skip)
+        """
+        self.model_path = str(model_path)
+        self.num_threads = num_threads
+        self.interpreter = load_tflite_interpreter(self.model_path, num_threads)
+        self.interpreter.allocate_tensors()
+        self._refresh_details()
+
+        self.img_size = int(self.input_shape[1])
+        self.channels = int(self.input_shape[3])
+        self.compiled_latency = LatencyStats()
+
+        self.warmup(warmup_runs)
+
+    def _refresh_details(self):
+        """Cache input/output tensor details after (re)allocation"""
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self.input_shape = tuple(int(d) for d in self._input['shape'])
+        self.output_shape = tuple(int(d) for d in self._output['shape'])
+
+    def warmup(self, runs=3):
+        """Run a few dummy batches so the first frame is fast"""
+        dummy = np.zeros((1, self.img_size, self.img_size, self.channels), dtype=np.float32)
+        for _ in range(runs):
+            self._invoke(dummy)
+
+    def _invoke(self, batch):
+        """Feed one batch through the interpreter, handling quantized input/output"""
+        if batch.shape[0] != self.input_shape[0]:
+            self.interpreter.resize_tensor_input(self._input['index'], list(batch.shape))
+            self.interpreter.allocate_tensors()
+            self._refresh_details()
+
+        input_dtype = self._input['dtype']
+        if input_dtype != np.float32:
+            scale, zero_point = self._input['quantization']
+            info = np.iinfo(input_dtype)
+            batch = np.clip(np.round(batch / scale + zero_point), info.min, info.max).astype(input_dtype)
+
+        self.interpreter.set_tensor(self._input['index'], batch)
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self._output['index'])
+
+        if self._output['dtype'] != np.float32:
+            scale, zero_point = self._output['quantization']
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output.copy()
+
+    def predict(self, batch):
+        """
+        Run the interpreter
+
+        Args:
+            batch: Preprocessed input batch of shape (N, img_size, img_size, channels)
+
+        Returns:
+            NumPy array of class probabilities with shape (N, num_classes)
+        """
+        batch = np.asarray(batch, dtype=np.float32)
+        start = time.perf_counter()
+        predictions = self._invoke(batch)
+        self.compiled_latency.add((time.perf_counter() - start) * 1000.0)
+        return predictions
+
+    def latency_report(self):
+        """Return a printable per-call latency report"""
+        return format_latency_report((('tflite', self.compiled_latency),))
+
+
+class SavedModelEngine:
+    """Runs the forward function of a SavedModel written by the model store (already traced)"""
+
+    backend = 'saved_model'
+
+    def __init__(self, saved_model_dir, warmup_runs=3):
+        """
+        Initialize the SavedModel engine
+
+        Args:
+            saved_model_dir: Directory holding a SavedModel with a `forward` function
+            warmup_runs: Number of dummy calls made at startup (0 to skip)
+        """
+        import tensorflow as tf
+
+        # Restoring the concrete function skips rebuilding the Keras layers and retracing
+        self._loaded = tf.saved_model.load(str(saved_model_dir))
+        self._forward = self._loaded.forward
+        concrete = self._forward.get_concrete_function()
+        self.input_shape = tuple(concrete.structured_input_signature[0][0].shape.as_list())
+        self.output_shape = tuple(concrete.structured_outputs.shape.as_list())
+        self.img_size = int(self.input_shape[1])
+        self.channels = int(self.input_shape[3])
+        self.compiled_latency = LatencyStats()
+
+        self.warmup(warmup_runs)
+
+    def warmup(self, runs=3):
+        """Run a few dummy batches so the first frame is fast"""
+        dummy = np.zeros((1, self.img_size, self.img_size, self.channels), dtype=np.float32)
+        for _ in range(runs):
+            self._forward(dummy)
+
+    def predict(self, batch):
+        """
+        Run the restored forward function
+
+        Args:
+            batch: Preprocessed input batch of shape (N, img_size, img_size, channels)
+
+        Returns:
+            NumPy array of class probabilities with shape (N, num_classes)
+        """
+        batch = np.asarray(batch, dtype=np.float32)
+        start = time.perf_counter()
+        predictions = self._forward(batch).numpy()
+        self.compiled_latency.add((time.perf_counter() - start) * 1000.0)
+        return predictions
+
+    def latency_report(self):
+        """Return a printable per-call latency report"""
+        return format_latency_report((('saved', self.compiled_latency),))
+
+
+def format_latency_report(named_stats):
+    """Format (name, LatencyStats) pairs as a printable report"""
+    lines = ["Inference latency per call:"]
+    for name, stats in named_stats:
+        s = stats.summary()
+        if s['calls'] == 0:
+            lines.append(f"  {name:9s} - no calls recorded")
+        else:
+            lines.append(f"  {name:9s} - {s['calls']} calls, mean {s['mean_ms']:.2f} ms, "
+                         f"p50 {s['p50_ms']:.2f} ms, p95 {s['p95_ms']:.2f} ms")
+    return "\n".join(lines)
+
+
+def load_tflite_interpreter(model_path, num_threads=None):
+    """Create a TFLite interpreter, preferring the lightweight tflite_runtime package"""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter(model_path=str(model_path), num_threads=num_threads)
+
+
+def load_engine(model_path, img_size=64, num_threads=None, warmup_runs=3, use_store=True):
+    """
+    Load a model and pick the inference backend from the file extension
+
+    Keras models go through the content-hashed model store (config.MODEL_STORE_DIR)
+    when it is enabled: the optimized artifact is built on the first launch and
+    loaded directly afterwards.
+
+    Args:
+        model_path: Path to a .tflite, .h5 or .keras model
+        img_size: Input image size expected by a Keras model
+        num_threads: Interpreter thread count for .tflite models
+        warmup_runs: Number of dummy calls made after loading (0 to skip)
+        use_store: Load Keras models through the model store if it is enabled
+
+    Returns:
+        (model, engine) tuple; model is None for .tflite files and store artifacts
+    """
+    if Path(model_path).suffix.lower() == '.tflite':
+        return None, TFLiteEngine(model_path, num_threads=num_threads, warmup_runs=warmup_runs)
+    if use_store:
+        import config
+        if config.MODEL_STORE_DIR:
+            from model_store import ModelStore
+            return None, ModelStore().load(model_path, img_size=img_size, num_threads=num_threads,
+                                           warmup_runs=warmup_runs)
+    import tensorflow as tf
+    model = tf.keras.models.load_model(model_path)
+    return model, InferenceEngine(model, img_size=img_size, warmup_runs=warmup_runs)
+
+
+def print_comparison(result):
+    """Print the output of `InferenceEngine.compare_with_legacy`"""
+    print("\n" + "="*60)
+    print("INFERENCE LATENCY (per call)")
+    print("="*60)
+    for name in ('compiled', 'legacy'):
+        s = result[name]
+        label = 'tf.function' if name == 'compiled' else 'model.predict'
+        print(f"{label:14s} mean {s['mean_ms']:7.2f} ms | p50 {s['p50_ms']:7.2f} ms | p95 {s['p95_ms']:7.2f} ms")
+    print(f"Speedup: {result['speedup']:.1f}x")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python inference_engine.py <path_to_model.h5> [runs]")
+        sys.exit(1)
+
+    model_path = sys.argv[1]
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    import tensorflow as tf
+    model = tf.keras.models.load_model(model_path)
+    img_size = model.input_shape[1]
+    engine = InferenceEngine(model, img_size=img_size)
+    print_comparison(engine.compare_with_legacy(runs=runs))
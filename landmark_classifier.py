@@ -0,0 +1,141 @@
+"""
+Landmark Classifier for Sign Language Detection
+Classifies the 21 MediaPipe hand landmarks directly, without pixel crops or a CNN
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+
+NUM_LANDMARKS = 21
+FEATURE_SIZE = NUM_LANDMARKS * 3
+
+
+def normalize_landmarks(hand_landmarks, aspect_ratio=1.0):
+    """
+    Convert hand landmarks to a translation- and scale-invariant feature vector
+
+    MediaPipe divides x by the image width and y by the height, so the same
+    hand is squashed differently in a square dataset image and a 4:3 camera
+    frame. x and z are first scaled by width / height, which puts all three
+    axes in units of the image height.
+
+    Args:
+        hand_landmarks: MediaPipe hand landmarks, or an array of shape (21, 3)
+        aspect_ratio: Width / height of the image the landmarks were detected in
+
+    Returns:
+        float32 vector of 63 values (x, y, z per landmark, wrist at the origin)
+    """
+    if hasattr(hand_landmarks, 'landmark'):
+        points = np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+    else:
+        points = np.array(hand_landmarks, dtype=np.float32).reshape(NUM_LANDMARKS, 3)
+
+    # z uses roughly the same scale as x
+    points[:, [0, 2]] *= aspect_ratio
+
+    # Wrist at the origin, hand size normalized to 1
+    points = points - points[0]
+    scale = float(np.linalg.norm(points[:, :2], axis=1).max())
+    if scale > 0:
+        points /= scale
+    return points.reshape(FEATURE_SIZE)
+
+
+class LandmarkClassifier:
+    """NumPy k-NN / nearest-centroid classifier over normalized landmark vectors"""
+
+    def __init__(self, features, labels, class_names, method='knn', k=5, temperature=0.1):
+        """
+        Initialize the classifier
+
+        Args:
+            features: Array of shape (num_samples, 63) of normalized landmark vectors
+            labels: Integer class index per sample
+            class_names: List of class labels
+            method: 'knn' (vote among the k nearest samples) or 'centroid'
+            k: Number of neighbours for 'knn'
+            temperature: Softness of the distance-to-probability mapping for 'centroid'
+        """
+        if method not in ('knn', 'centroid'):
+            raise ValueError(f"Unknown landmark classifier method: {method}")
+
+        self.class_names = list(class_names)
+        self.method = method
+        self.k = max(1, min(int(k), len(labels)))
+        self.temperature = temperature
+
+        self.features = np.ascontiguousarray(features, dtype=np.float32)
+        self.labels = np.asarray(labels, dtype=np.int64)
+        self._feature_norms = np.einsum('ij,ij->i', self.features, self.features)
+
+        num_classes = len(self.class_names)
+        self.centroids = np.zeros((num_classes, self.features.shape[1]), dtype=np.float32)
+        for class_idx in range(num_classes):
+            members = self.features[self.labels == class_idx]
+            if len(members):
+                self.centroids[class_idx] = members.mean(axis=0)
+        self._present = np.bincount(self.labels, minlength=num_classes) > 0
+
+    @classmethod
+    def load(cls, path, method='knn', k=5):
+        """
+        Load a landmark index written by build_landmark_dataset.py
+
+        Args:
+            path: Path to the .npz index
+            method: 'knn' or 'centroid'
+            k: Number of neighbours for 'knn'
+        """
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Landmark index not found: {path}")
+        data = np.load(path, allow_pickle=False)
+        return cls(data['features'], data['labels'], data['class_names'].tolist(), method=method, k=k)
+
+    def predict_proba(self, vectors):
+        """
+        Class probabilities for a batch of landmark vectors
+
+        Args:
+            vectors: Array of shape (N, 63) or a single vector of shape (63,)
+
+        Returns:
+            Array of shape (N, num_classes)
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        num_classes = len(self.class_names)
+
+        if self.method == 'centroid':
+            diff = vectors[:, None, :] - self.centroids[None, :, :]
+            distances = np.sqrt(np.einsum('nck,nck->nc', diff, diff))
+            logits = -distances / self.temperature
+            logits[:, ~self._present] = -np.inf
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            return probs / probs.sum(axis=1, keepdims=True)
+
+        # Squared distances via |f|^2 - 2 f.v + |v|^2
+        distances = self._feature_norms[None, :] - 2.0 * vectors @ self.features.T
+        distances += np.einsum('ij,ij->i', vectors, vectors)[:, None]
+        nearest = np.argpartition(distances, self.k - 1, axis=1)[:, :self.k]
+
+        probs = np.zeros((len(vectors), num_classes), dtype=np.float32)
+        rows = np.repeat(np.arange(len(vectors)), self.k)
+        np.add.at(probs, (rows, self.labels[nearest].ravel()), 1.0 / self.k)
+        return probs
+
+    def predict(self, vector):
+        """
+        Classify a single landmark vector
+
+        Args:
+            vector: Normalized landmark vector of shape (63,)
+
+        Returns:
+            (prediction, confidence) tuple
+        """
+        probs = self.predict_proba(vector)[0]
+        class_idx = int(np.argmax(probs))
+        return self.class_names[class_idx], float(probs[class_idx])
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Shared Model Host for Sign Language Detection
+One process loads the model; app instances and worker processes on the same
+host write preprocessed crops into a shared-memory ring buffer and read the
+class probabilities back from it, so neither frames nor results are pickled
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.managers import BaseManager
+
+import numpy as np
+
+import config
+from inference_engine import LatencyStats, format_latency_report, load_engine
+from preprocessing import resolve_normalization
+from runtime_config import load_cli_config
+from thread_settings import apply_thread_settings
+
+
+class SharedRing:
+    """Fixed slots of input crops and output probabilities laid out in one shared-memory block"""
+
+    def __init__(self, shm, slots, max_batch_size, input_shape, num_classes):
+        """
+        Map the ring onto a shared-memory block
+
+        Args:
+            shm: SharedMemory of at least SharedRing.nbytes(...) bytes
+            slots: Number of requests that can be in flight at once
+            max_batch_size: Crops per slot
+            input_shape: Shape of one crop, e.g. (64, 64, 3)
+            num_classes: Length of one probability vector
+        """
+        self.shm = shm
+        self.inputs = np.ndarray((slots, max_batch_size) + tuple(input_shape), dtype=np.float32, buffer=shm.buf)
+        self.outputs = np.ndarray((slots, max_batch_size, num_classes), dtype=np.float32,
+                                  buffer=shm.buf, offset=self.inputs.nbytes)
+
+    @staticmethod
+    def nbytes(slots, max_batch_size, input_shape, num_classes):
+        """Size of the shared-memory block for the given layout"""
+        return 4 * slots * max_batch_size * (int(np.prod(input_shape)) + num_classes)
+
+    def close(self):
+        """Drop the array views and detach from the block"""
+        self.inputs = self.outputs = None
+        self.shm.close()
+
+
+class SlotPool:
+    """
+    Hands out ring slots to clients as leases
+
+    A client that dies or loses its connection while holding a slot never
+    releases it; its lease expires after `lease_timeout` seconds and the slot
+    goes back into the pool. Each lease carries a token, so a late request or
+    release under an expired lease cannot touch the slot's next holder.
+
+    The token does not guard the shared memory itself: a client renews its
+    lease before writing a chunk into the slot and checks it still holds the
+    lease after reading the results (see ModelHostClient.predict).
+    """
+
+    def __init__(self, slots, lease_timeout=30.0):
+        """
+        Initialize the pool
+
+        Args:
+            slots: Number of slots
+            lease_timeout: Seconds a client may hold a slot (None = forever)
+        """
+        self.lease_timeout = lease_timeout
+        self.free = queue.Queue()
+        for slot in range(slots):
+            self.free.put(slot)
+        self.leases = {}
+        self.tokens = 0
+        self.reclaimed = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Wait for a free slot
+
+        Returns:
+            (slot, token) tuple; pass both to release()
+        """
+        while True:
+            try:
+                slot = self.free.get(timeout=1.0)
+                break
+            except queue.Empty:
+                self.reclaim()
+        with self.lock:
+            self.tokens += 1
+            deadline = None if self.lease_timeout is None else time.monotonic() + self.lease_timeout
+            self.leases[slot] = (self.tokens, deadline)
+            return slot, self.tokens
+
+    def release(self, slot, token):
+        """Return a slot (ignored if its lease already expired)"""
+        with self.lock:
+            if self.leases.get(slot, (None,))[0] != token:
+                return
+            del self.leases[slot]
+        self.free.put(slot)
+
+    def holds(self, slot, token):
+        """True if `token` is the current, unexpired lease of `slot`"""
+        with self.lock:
+            return self._valid(slot, token, time.monotonic())
+
+    def renew(self, slot, token):
+        """
+        Restart the lease timeout of a held slot
+
+        Returns:
+            False if the lease already expired (the slot may have a new holder)
+        """
+        now = time.monotonic()
+        with self.lock:
+            if not self._valid(slot, token, now):
+                return False
+            deadline = None if self.lease_timeout is None else now + self.lease_timeout
+            self.leases[slot] = (token, deadline)
+            return True
+
+    def _valid(self, slot, token, now):
+        lease_token, deadline = self.leases.get(slot, (None, None))
+        return lease_token == token and (deadline is None or deadline >= now)
+
+    def reclaim(self):
+        """Take back the slots whose lease expired"""
+        now = time.monotonic()
+        with self.lock:
+            expired = [slot for slot, (_, deadline) in self.leases.items()
+                       if deadline is not None and deadline < now]
+            for slot in expired:
+                del self.leases[slot]
+            self.reclaimed += len(expired)
+        for slot in expired:
+            self.free.put(slot)
+        return len(expired)
+
+
+class _HostManager(BaseManager):
+    """Control channel of the host: only slot numbers and counts cross it"""
+
+
+# Clients only need the names; ModelHost.serve_forever binds them to its queues
+for _typeid in ('requests', 'slots', 'replies', 'info'):
+    _HostManager.register(_typeid)
+
+
+class ModelHost:
+    """Loads the model once and answers crops from every client in batched forward passes"""
+
+    def __init__(self, model_path, address, authkey=None, slots=8, max_batch_size=32, img_size=64,
+                 num_threads=None, lease_timeout=None):
+        """
+        Initialize the host
+
+        Args:
+            model_path: Path to the model (.h5, .keras or .tflite)
+            address: (host, port) of the control channel
+            authkey: Shared secret clients must present (default: config.MODEL_HOST_AUTHKEY)
+            slots: Requests in flight at once (across all clients)
+            max_batch_size: Crops per request; requests waiting together are merged
+            img_size: Input image size expected by a Keras model
+            num_threads: TFLite interpreter thread count (.tflite models only)
+            lease_timeout: Seconds before a slot held by an unresponsive client is
+                taken back (default: config.MODEL_HOST_LEASE_TIMEOUT)
+        """
+        # TensorFlow / OpenCV thread pools from config.py, sized before TensorFlow starts
+        apply_thread_settings()
+        model, self.engine = load_engine(model_path, img_size=img_size, num_threads=num_threads)
+        img_size = getattr(self.engine, 'img_size', img_size)
+        channels = getattr(self.engine, 'channels', 3)
+        input_shape = (img_size, img_size, channels)
+        num_classes = int(self.engine.predict(np.zeros((1,) + input_shape, dtype=np.float32)).shape[1])
+
+        self.max_batch_size = max(1, max_batch_size)
+        shm = shared_memory.SharedMemory(
+            create=True, size=SharedRing.nbytes(slots, self.max_batch_size, input_shape, num_classes))
+        self.ring = SharedRing(shm, slots, self.max_batch_size, input_shape, num_classes)
+
+        self.requests = queue.Queue()
+        self.slots = SlotPool(slots, config.MODEL_HOST_LEASE_TIMEOUT if lease_timeout is None else lease_timeout)
+        self.replies = [queue.Queue() for _ in range(slots)]
+        self.info = {
+            'shm_name': shm.name,
+            'slots': slots,
+            'lease_timeout': self.slots.lease_timeout,
+            'max_batch_size': self.max_batch_size,
+            'input_shape': input_shape,
+            'num_classes': num_classes,
+            'normalization': resolve_normalization(model_path, model, self.engine),
+            'model_path': str(model_path),
+            'pid': os.getpid()
+        }
+
+        self.address = address
+        self.authkey = authkey or config.MODEL_HOST_AUTHKEY.encode('utf-8')
+        self.images = 0
+        self.batches = 0
+
+    def _run(self):
+        """Serve queued requests, merging the ones that wait together into one batch"""
+        while True:
+            pending = []
+            total = 0
+            request = self.requests.get()
+            while True:
+                slot, count, token = request
+                # Requests under an expired lease are dropped; the slot has a new holder
+                if self.slots.holds(slot, token):
+                    pending.append(request)
+                    total += count
+                if total >= self.max_batch_size:
+                    break
+                try:
+                    request = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+            if not pending:
+                continue
+
+            try:
+                if len(pending) == 1:
+                    slot, count, _ = pending[0]
+                    probs = self.engine.predict(self.ring.inputs[slot, :count])
+                else:
+                    probs = self.engine.predict(
+                        np.concatenate([self.ring.inputs[slot, :count] for slot, count, _ in pending]))
+            except Exception as e:
+                for slot, _, token in pending:
+                    self.replies[slot].put((token, str(e)))
+                continue
+
+            offset = 0
+            for slot, count, token in pending:
+                # A lease that expired during the forward pass: its slot may belong to another client now
+                if self.slots.holds(slot, token):
+                    self.ring.outputs[slot, :count] = probs[offset:offset + count]
+                    self.replies[slot].put((token, count))
+                offset += count
+            self.images += total
+            self.batches += 1
+
+    def serve_forever(self):
+        """Answer clients until interrupted, then release the shared memory"""
+        _HostManager.register('requests', callable=lambda: self.requests)
+        _HostManager.register('slots', callable=lambda: self.slots)
+        _HostManager.register('replies', callable=lambda slot: self.replies[slot])
+        _HostManager.register('info', callable=lambda: self.info)
+        server = _HostManager(address=self.address, authkey=self.authkey).get_server()
+
+        threading.Thread(target=self._run, daemon=True).start()
+        print(f"✓ Model host on {self.address[0]}:{self.address[1]} "
+              f"({self.info['slots']} slots, shared memory {self.ring.shm.size / 1e6:.1f} MB)")
+        try:
+            server.serve_forever()
+        finally:
+            shm = self.ring.shm
+            self.ring.close()
+            shm.unlink()
+
+
+class ModelHostClient:
+    """
+    Runs predictions on a ModelHost
+
+    Has the same predict signature as InferenceEngine / TFLiteEngine, so it can
+    stand in for them (see SignLanguageModel's model_host argument).
+    """
+
+    backend = 'shared'
+
+    def __init__(self, address=None, authkey=None, timeout=0.0):
+        """
+        Connect to a running host
+
+        Args:
+            address: 'host:port' or (host, port) (default: config.MODEL_HOST_ADDRESS)
+            authkey: Shared secret (default: config.MODEL_HOST_AUTHKEY)
+            timeout: Keep retrying a refused connection for this many seconds
+        """
+        address = address or config.MODEL_HOST_ADDRESS
+        if isinstance(address, str):
+            host, _, port = address.rpartition(':')
+            address = (host or '127.0.0.1', int(port))
+        manager = _HostManager(address=address, authkey=authkey or config.MODEL_HOST_AUTHKEY.encode('utf-8'))
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                manager.connect()
+                break
+            except ConnectionRefusedError:
+                if time.perf_counter() >= deadline:
+                    raise
+                time.sleep(0.5)
+
+        self.info = manager.info()._getvalue()
+        self._requests = manager.requests()
+        self._slots = manager.slots()
+        self._replies = [manager.replies(slot) for slot in range(self.info['slots'])]
+        self.ring = SharedRing(_attach_shared_memory(self.info['shm_name']), self.info['slots'],
+                               self.info['max_batch_size'], self.info['input_shape'], self.info['num_classes'])
+
+        self.address = address
+        self.img_size = self.info['input_shape'][0]
+        self.channels = self.info['input_shape'][2]
+        self.input_shape = (None,) + tuple(self.info['input_shape'])
+        self.output_shape = (None, self.info['num_classes'])
+        self.normalization = self.info['normalization']
+        self.compiled_latency = LatencyStats()
+
+    def warmup(self, runs=3):
+        """The host warms its engine up; one dummy call checks the round trip"""
+        if runs:
+            self.predict(np.zeros((1, self.img_size, self.img_size, self.channels), dtype=np.float32))
+
+    def predict(self, batch):
+        """
+        Copy a preprocessed batch into a free slot and wait for its probabilities
+
+        Args:
+            batch: Preprocessed input batch of shape (N, img_size, img_size, channels)
+
+        Returns:
+            NumPy array of class probabilities with shape (N, num_classes)
+        """
+        start = time.perf_counter()
+        count = len(batch)
+        result = np.empty((count, self.info['num_classes']), dtype=np.float32)
+        step = self.info['max_batch_size']
+        timeout = self.info['lease_timeout']
+        slot, token = self._slots.acquire()
+        try:
+            for offset in range(0, count, step):
+                chunk = batch[offset:offset + step]
+                # The slot's memory is only ours while the lease holds; each chunk renews it
+                if not self._slots.renew(slot, token):
+                    raise RuntimeError("Model host slot lease expired")
+                self.ring.inputs[slot, :len(chunk)] = chunk
+                self._requests.put((slot, len(chunk), token))
+                while True:
+                    try:
+                        reply_token, reply = self._replies[slot].get(timeout=timeout)
+                    except queue.Empty:
+                        raise RuntimeError("Model host did not answer before the slot lease expired")
+                    # A reply meant for an earlier, expired lease of this slot
+                    if reply_token == token:
+                        break
+                if isinstance(reply, str):
+                    raise RuntimeError(f"Model host error: {reply}")
+                result[offset:offset + len(chunk)] = self.ring.outputs[slot, :len(chunk)]
+                # Still held after the copy: nobody else wrote the slot in the meantime
+                if not self._slots.holds(slot, token):
+                    raise RuntimeError("Model host slot lease expired while reading the results")
+        finally:
+            try:
+                self._slots.release(slot, token)
+            except (OSError, EOFError):
+                # Connection lost: the host takes the slot back when the lease expires
+                pass
+        self.compiled_latency.add((time.perf_counter() - start) * 1000.0)
+        return result
+
+    def latency_report(self):
+        """Return a printable per-call latency report (including the round trip)"""
+        return format_latency_report((('shared', self.compiled_latency),))
+
+    def close(self):
+        """Detach from the shared memory (the host keeps running)"""
+        self.ring.close()
+
+
+def _attach_shared_memory(name):
+    """Open an existing block without letting this process's resource tracker unlink it at exit"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers attached blocks as if this process owned them
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+# ============================================================================
+# Resident memory comparison
+# ============================================================================
+
+def process_memory_mb(pid):
+    """
+    Resident memory of a process
+
+    Returns:
+        (rss_mb, pss_mb) - PSS splits shared pages between the processes using
+        them; None where the platform does not report it
+    """
+    try:
+        values = {}
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in ('Rss', 'Pss'):
+                    values[name] = int(rest.split()[0]) / 1024.0
+        return values.get('Rss'), values.get('Pss')
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / (1024.0 * 1024.0), None
+    except (ImportError, OSError):
+        return None, None
+
+
+def _client_process(model_path, model_host, ready, stop):
+    """Worker of the comparison: load (or connect to) the model, classify once, then idle"""
+    from model_wrapper import SignLanguageModel
+    model = SignLanguageModel(model_path, img_size=config.IMG_SIZE, class_labels=config.CLASS_LABELS,
+                              model_host=model_host)
+    model.predict_batch([np.zeros((config.IMG_SIZE, config.IMG_SIZE, 3), dtype=np.uint8)] * 4)
+    ready.put(os.getpid())
+    stop.wait()
+
+
+def _host_process(model_path, address, slots, max_batch_size):
+    """Host of the comparison; SIGTERM shuts it down cleanly"""
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    ModelHost(model_path, address, slots=slots, max_batch_size=max_batch_size, img_size=config.IMG_SIZE,
+              num_threads=config.TFLITE_NUM_THREADS).serve_forever()
+
+
+def measure_setup(model_path, clients, model_host=None, host_pid=None):
+    """Start `clients` worker processes and measure the memory of all of them (and of the host)"""
+    ctx = mp.get_context('spawn')
+    ready, stop = ctx.Queue(), ctx.Event()
+    workers = [ctx.Process(target=_client_process, args=(model_path, model_host, ready, stop))
+               for _ in range(clients)]
+    for worker in workers:
+        worker.start()
+    try:
+        pids = [ready.get(timeout=300) for _ in workers]
+        if host_pid is not None:
+            pids.append(host_pid)
+        memory = [process_memory_mb(pid) for pid in pids]
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=10)
+
+    def total(index):
+        values = [m[index] for m in memory]
+        return sum(values) if all(v is not None for v in values) else None
+
+    return {'processes': len(pids), 'rss_mb': total(0), 'pss_mb': total(1),
+            'per_process_rss_mb': [m[0] for m in memory]}
+
+
+def compare_memory(model_path, clients, address, slots=8, max_batch_size=32):
+    """Resident memory of N standalone model processes against one host plus N clients"""
+    results = {'clients': clients}
+    print(f"Measuring {clients} processes that each load the model...")
+    results['per_process'] = measure_setup(model_path, clients)
+
+    print(f"Measuring one model host and {clients} clients...")
+    ctx = mp.get_context('spawn')
+    host = ctx.Process(target=_host_process, args=(model_path, address, slots, max_batch_size))
+    host.start()
+    try:
+        # Wait until the host accepts connections before starting the clients
+        ModelHostClient(address, timeout=300).close()
+        results['shared'] = measure_setup(model_path, clients, f"{address[0]}:{address[1]}", host.pid)
+    finally:
+        host.terminate()
+        host.join(timeout=10)
+    return results
+
+
+def print_memory_comparison(results):
+    """Print the memory comparison table"""
+    def mb(value):
+        return f"{value:10.1f}" if value is not None else f"{'n/a':>10s}"
+
+    print("\n" + "="*64)
+    print(f"RESIDENT MEMORY - {results['clients']} CLIENTS")
+    print("="*64)
+    print(f"{'Setup':28s} {'Processes':>9s} {'RSS MB':>10s} {'PSS MB':>10s}")
+    for name, label in (('per_process', 'One model per process'), ('shared', 'Shared model host')):
+        s = results[name]
+        print(f"{label:28s} {s['processes']:9d} {mb(s['rss_mb'])} {mb(s['pss_mb'])}")
+    before, after = results['per_process']['pss_mb'], results['shared']['pss_mb']
+    if before and after:
+        print("-"*64)
+        print(f"Shared host saves {before - after:.0f} MB ({(1 - after / before) * 100:.0f}%)")
+    print("="*64 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve one model to many processes through shared memory")
+    parser.add_argument('--model', help="Model path (.h5, .keras or .tflite, default: MODEL_PATH)")
+    parser.add_argument('--address', help="HOST:PORT of the control channel "
+                                          "(default: MODEL_HOST_ADDRESS or 127.0.0.1:6010)")
+    parser.add_argument('--slots', type=int, help="Requests in flight at once (default: MODEL_HOST_SLOTS)")
+    parser.add_argument('--max-batch', type=int, help="Crops per request (default: MAX_BATCH_SIZE)")
+    parser.add_argument('--compare', type=int, metavar='N',
+                        help="Report resident memory of N clients against N standalone processes")
+    args = parser.parse_args()
+
+    # config.py, the model's metadata and SIGN_* overrides (explicit options still win)
+    if load_cli_config(args, {'address': 'MODEL_HOST_ADDRESS', 'slots': 'MODEL_HOST_SLOTS', 'max_batch': 'MAX_BATCH_SIZE'}) is None:
+        return 1
+
+    if not os.path.exists(args.model):
+        print(f"❌ Model file not found: {args.model}")
+        return 1
+    host, _, port = (args.address or '127.0.0.1:6010').rpartition(':')
+    address = (host or '127.0.0.1', int(port))
+
+    if args.compare:
+        print_memory_comparison(compare_memory(args.model, args.compare, address, args.slots, args.max_batch))
+        return 0
+
+    ModelHost(args.model, address, slots=args.slots, max_batch_size=args.max_batch, img_size=config.IMG_SIZE,
+              num_threads=config.TFLITE_NUM_THREADS).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
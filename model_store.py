@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Model Store for Sign Language Detection
+Caches the optimized form of a Keras model (SavedModel with a traced forward
+function, or TFLite) under the content hash of the model file and its metadata,
+so later launches skip Keras deserialization and graph tracing
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are still atomic, but may run twice
+    fcntl = None
+
+import config
+from inference_engine import SavedModelEngine, TFLiteEngine
+from preprocessing import load_model_metadata, resolve_normalization
+
+ARTIFACT_FORMATS = ('saved_model', 'tflite')
+DEFAULT_STORE_DIR = '.model_store'
+METADATA_FILE = 'model.json'
+
+# Hashes are remembered per path, size and modification time so an unchanged
+# model file is not read again on every launch
+INDEX_FILE = 'index.json'
+
+# Held while a process checks for and builds an artifact or rewrites the index;
+# app workers, model host clients and benchmark trials may share one store
+LOCK_FILE = '.lock'
+
+
+class ModelStore:
+    """Directory of optimized model artifacts keyed by content hash"""
+
+    def __init__(self, root=None, artifact_format=None):
+        """
+        Initialize the store
+
+        Args:
+            root: Store directory (default: config.MODEL_STORE_DIR)
+            artifact_format: 'saved_model' or 'tflite' (default: config.MODEL_STORE_FORMAT)
+        """
+        self.root = Path(root or config.MODEL_STORE_DIR or DEFAULT_STORE_DIR)
+        self.artifact_format = artifact_format or config.MODEL_STORE_FORMAT
+        if self.artifact_format not in ARTIFACT_FORMATS:
+            raise ValueError(f"Unknown artifact format: {self.artifact_format}")
+        self.last_load = None
+
+    def content_hash(self, model_path):
+        """SHA-256 of the model file and its metadata (<stem>.meta.json / model_config.json)"""
+        model_path = Path(model_path)
+        stat = model_path.stat()
+        metadata = load_model_metadata(model_path)
+        metadata_json = json.dumps(metadata, sort_keys=True)
+        key = str(model_path.resolve())
+
+        entry = self._read_index().get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns \
+                and entry['metadata'] == metadata_json:
+            return entry['sha256']
+
+        digest = hashlib.sha256()
+        with open(model_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(metadata_json.encode('utf-8'))
+        sha = digest.hexdigest()
+
+        with self._lock():
+            index = self._read_index()
+            index[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'metadata': metadata_json,
+                          'sha256': sha}
+            self._write_index(index)
+        return sha
+
+    def artifact_dir(self, sha):
+        """Directory of the artifact for a content hash in this store's format"""
+        return self.root / f"{sha[:16]}-{self.artifact_format}"
+
+    def build(self, model_path, sha, img_size=64):
+        """
+        Convert a Keras model into the store's optimized format
+
+        Call while holding the store lock (load() does), so two processes never
+        build the same artifact at once.
+
+        Returns:
+            Path of the artifact directory
+        """
+        import tensorflow as tf
+
+        model = tf.keras.models.load_model(model_path)
+        input_shape = tuple(model.input_shape[1:]) if model.input_shape[1] else (img_size, img_size, 3)
+        signature = [tf.TensorSpec(shape=(None,) + input_shape, dtype=tf.float32)]
+
+        # Build in a private scratch directory so an interrupted build never looks complete
+        target = self.artifact_dir(sha)
+        self.root.mkdir(parents=True, exist_ok=True)
+        scratch = Path(tempfile.mkdtemp(prefix=target.name + '.', suffix='.tmp', dir=self.root))
+        try:
+            self._build_into(scratch, model, model_path, sha, input_shape, signature)
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(scratch, target)
+        except BaseException:
+            shutil.rmtree(scratch, ignore_errors=True)
+            raise
+        return target
+
+    def _build_into(self, scratch, model, model_path, sha, input_shape, signature):
+        """Write the artifact and its metadata into the scratch directory"""
+        import tensorflow as tf
+
+        if self.artifact_format == 'saved_model':
+            module = tf.Module()
+            module.model = model
+            module.forward = tf.function(lambda batch: model(batch, training=False), input_signature=signature)
+            tf.saved_model.save(module, str(scratch / 'saved_model'))
+        else:
+            converter = tf.lite.TFLiteConverter.from_keras_model(model)
+            with open(scratch / 'model.tflite', 'wb') as f:
+                f.write(converter.convert())
+
+        # The Keras layers are gone after conversion, so record the input contract with the artifact
+        metadata = {
+            'sha256': sha,
+            'source_model': str(model_path),
+            'format': self.artifact_format,
+            'input_shape': list(input_shape),
+            'num_classes': int(model.output_shape[-1]),
+            'preprocessing': resolve_normalization(model_path, model),
+            'model_config': load_model_metadata(model_path),
+            'tensorflow': tf.__version__,
+            'created': datetime.now().isoformat(timespec='seconds')
+        }
+        with open(scratch / METADATA_FILE, 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+    def load(self, model_path, img_size=64, num_threads=None, warmup_runs=3):
+        """
+        Load the optimized artifact of a model, building it on the first call
+
+        A dummy batch is always run at load; the time from the start of the call
+        to the end of that first prediction is recorded in `last_load` (and on
+        the returned engine as `load_report`).
+
+        Returns:
+            SavedModelEngine or TFLiteEngine with `normalization` and `metadata` attributes
+        """
+        start = time.perf_counter()
+        sha = self.content_hash(model_path)
+        hashed = time.perf_counter()
+
+        target = self.artifact_dir(sha)
+        cache_hit = (target / METADATA_FILE).exists()
+        if not cache_hit:
+            with self._lock():
+                # Another process may have built it while this one waited for the lock
+                cache_hit = (target / METADATA_FILE).exists()
+                if not cache_hit:
+                    print(f"Building optimized {self.artifact_format} artifact for {model_path}...")
+                    self.build(model_path, sha, img_size)
+        built = time.perf_counter()
+
+        with open(target / METADATA_FILE, 'r') as f:
+            metadata = json.load(f)
+        if self.artifact_format == 'saved_model':
+            engine = SavedModelEngine(target / 'saved_model', warmup_runs=0)
+        else:
+            engine = TFLiteEngine(target / 'model.tflite', num_threads=num_threads, warmup_runs=0)
+        loaded = time.perf_counter()
+
+        engine.predict(np.zeros((1,) + tuple(metadata['input_shape']), dtype=np.float32))
+        first_prediction = time.perf_counter()
+        engine.warmup(max(0, warmup_runs - 1))
+
+        engine.normalization = metadata['preprocessing']
+        engine.metadata = metadata
+        engine.load_report = self.last_load = {
+            'sha256': sha,
+            'format': self.artifact_format,
+            'cache_hit': cache_hit,
+            'hash_ms': (hashed - start) * 1000.0,
+            'build_ms': (built - hashed) * 1000.0,
+            'load_ms': (loaded - built) * 1000.0,
+            'first_prediction_ms': (first_prediction - loaded) * 1000.0,
+            'time_to_first_prediction_ms': (first_prediction - start) * 1000.0
+        }
+        print(f"✓ Model store {'hit' if cache_hit else 'build'} {sha[:12]} ({self.artifact_format}): "
+              f"time to first prediction {self.last_load['time_to_first_prediction_ms']:.0f} ms")
+        return engine
+
+    def entries(self):
+        """Metadata of every artifact in the store"""
+        if not self.root.exists():
+            return []
+        entries = []
+        for metadata_path in sorted(self.root.glob(f"*/{METADATA_FILE}")):
+            if metadata_path.parent.name.endswith('.tmp'):
+                continue  # build in progress
+            with open(metadata_path, 'r') as f:
+                metadata = json.load(f)
+            metadata['path'] = str(metadata_path.parent)
+            metadata['size_mb'] = sum(p.stat().st_size for p in metadata_path.parent.rglob('*') if p.is_file()) \
+                / (1024 * 1024)
+            entries.append(metadata)
+        return entries
+
+    def _read_index(self):
+        try:
+            with open(self.root / INDEX_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=self.root, prefix=INDEX_FILE + '.', suffix='.tmp',
+                                         delete=False) as f:
+            json.dump(index, f, indent=2)
+        os.replace(f.name, self.root / INDEX_FILE)
+
+    @contextmanager
+    def _lock(self):
+        """Exclusive lock on the store across processes (no-op where fcntl is unavailable)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.root / LOCK_FILE, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# ============================================================================
+# Time-to-first-prediction comparison
+# ============================================================================
+
+def _time_to_first_prediction(model_path, img_size, store_root, artifact_format):
+    """Run in a fresh process: import TensorFlow, load the model and classify one dummy batch"""
+    start = time.perf_counter()
+    import tensorflow as tf  # noqa: F401 - the import is part of a real launch
+    imported = time.perf_counter()
+    if store_root is None:
+        from inference_engine import InferenceEngine
+        model = tf.keras.models.load_model(model_path)
+        engine = InferenceEngine(model, img_size=model.input_shape[1] or img_size, warmup_runs=0)
+        engine.predict(np.zeros((1, engine.img_size, engine.img_size, engine.channels), dtype=np.float32))
+        report = {}
+    else:
+        report = ModelStore(store_root, artifact_format).load(model_path, img_size, warmup_runs=1).load_report
+    report['import_ms'] = (imported - start) * 1000.0
+    report['total_ms'] = (time.perf_counter() - start) * 1000.0
+    return report
+
+
+def compare_startup(model_path, img_size=64, store_root=None, artifact_format=None):
+    """Time to first prediction of a plain Keras load against a cold and a warm store load"""
+    store = ModelStore(store_root, artifact_format)
+    shutil.rmtree(store.artifact_dir(store.content_hash(model_path)), ignore_errors=True)
+
+    results = {}
+    ctx = mp.get_context('spawn')
+    for name, root in (('keras', None), ('store_cold', str(store.root)), ('store_warm', str(store.root))):
+        with ctx.Pool(1) as pool:
+            results[name] = pool.apply(_time_to_first_prediction,
+                                       (model_path, img_size, root, store.artifact_format))
+    return results
+
+
+def print_startup_comparison(results):
+    """Print the time-to-first-prediction table"""
+    print("\n" + "="*64)
+    print("TIME TO FIRST PREDICTION")
+    print("="*64)
+    print(f"{'Launch':14s} {'TF import':>10s} {'Load+1st':>10s} {'Total':>10s}  (ms)")
+    labels = {'keras': 'Keras .h5', 'store_cold': 'Store (build)', 'store_warm': 'Store (cached)'}
+    for name, r in results.items():
+        print(f"{labels[name]:14s} {r['import_ms']:10.0f} {r['total_ms'] - r['import_ms']:10.0f} "
+              f"{r['total_ms']:10.0f}")
+    keras, warm = results['keras']['total_ms'], results['store_warm']['total_ms']
+    print("-"*64)
+    print(f"Cached artifact: {keras - warm:.0f} ms faster than loading the Keras model")
+    print("="*64 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the content-hashed model artifact store")
+    subparsers = parser.add_subparsers(dest='command')
+    build_parser = subparsers.add_parser('build', help="Build (or load) the cached artifact of a model")
+    build_parser.add_argument('model', nargs='?', help="Path to the .h5 / .keras model (default: MODEL_PATH)")
+    compare_parser = subparsers.add_parser('compare', help="Report time to first prediction with and without the store")
+    compare_parser.add_argument('model', nargs='?', help="Path to the .h5 / .keras model (default: MODEL_PATH)")
+    subparsers.add_parser('list', help="List cached artifacts")
+    subparsers.add_parser('clear', help="Delete the store")
+    for sub in subparsers.choices.values():
+        sub.add_argument('--store', help=f"Store directory (default: MODEL_STORE_DIR or {DEFAULT_STORE_DIR})")
+        sub.add_argument('--format', choices=ARTIFACT_FORMATS, help="Artifact format (default: MODEL_STORE_FORMAT)")
+    args = parser.parse_args()
+    if args.command is None:
+        parser.print_help()
+        return 1
+
+    # runtime_config validates MODEL_STORE_FORMAT against this module, so import it here
+    from runtime_config import load_cli_config
+
+    # config.py, the model's metadata and SIGN_* overrides (explicit options still win)
+    if load_cli_config(args, {'store': 'MODEL_STORE_DIR', 'format': 'MODEL_STORE_FORMAT'}) is None:
+        return 1
+    args.store = args.store or DEFAULT_STORE_DIR
+
+    if args.command in ('build', 'compare') and not os.path.exists(args.model):
+        print(f"❌ Model file not found: {args.model}")
+        return 1
+
+    if args.command == 'build':
+        engine = ModelStore(args.store, args.format).load(args.model, img_size=config.IMG_SIZE)
+        print(json.dumps(engine.load_report, indent=2))
+    elif args.command == 'compare':
+        print_startup_comparison(compare_startup(args.model, config.IMG_SIZE, args.store, args.format))
+    elif args.command == 'list':
+        for entry in ModelStore(args.store, args.format).entries():
+            print(f"{entry['sha256'][:12]}  {entry['format']:12s} {entry['size_mb']:7.1f} MB  "
+                  f"{entry['created']}  {entry['source_model']}")
+    elif args.command == 'clear':
+        shutil.rmtree(args.store, ignore_errors=True)
+        print(f"✓ Removed {args.store}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
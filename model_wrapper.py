@@ -3,46 +3,87 @@ Model Wrapper for Sign Language Detection
 This module helps integrate your trained model with the application
 """
 
+import threading
+import time
 import numpy as np
-import cv2
-import tensorflow as tf
 from pathlib import Path
 
+import config
+from inference_engine import load_engine
+from preprocessing import Preprocessor
+from runtime_config import validate_model_shapes
+from thread_settings import apply_thread_settings
+from dataset import iter_resized, list_labelled_images, resolve_label
+from dataset_cache import DatasetCache, is_cache
+
 
 class SignLanguageModel:
     """Wrapper class for sign language detection model"""
     
-    def __init__(self, model_path, img_size=64, class_labels=None):
+    def __init__(self, model_path, img_size=64, class_labels=None, max_batch_size=32, num_threads=None,
+                 model_host=None):
         """
         Initialize the model wrapper
         
         Args:
-            model_path: Path to the saved model (.h5 or .keras)
+            model_path: Path to the saved model (.h5, .keras or .tflite)
             img_size: Input image size expected by the model
-            class_labels: List of class labels (default: A-Z alphabet)
+            class_labels: List of class labels (default: config.CLASS_LABELS)
+            max_batch_size: Largest batch sent through the model in one forward pass
+            num_threads: TFLite interpreter thread count (.tflite models only)
+            model_host: 'host:port' of a running model_host.py; predictions then run
+                in that shared process and this one never loads TensorFlow
         """
         self.model_path = model_path
         self.img_size = img_size
+        self.max_batch_size = max_batch_size
+        
+        # TensorFlow / OpenCV thread pools from config.py, sized before TensorFlow starts
+        apply_thread_settings()
         
-        # Load model
-        if Path(model_path).exists():
-            self.model = tf.keras.models.load_model(model_path)
-            print(f"✓ Model loaded successfully from {model_path}")
+        if model_host:
+            # Client mode: crops go through the host's shared-memory ring buffer
+            from model_host import ModelHostClient
+            self.model, self.engine = None, ModelHostClient(model_host)
+            self.backend = self.engine.backend
+            self.img_size = self.engine.img_size
+            preprocessor = Preprocessor.for_model(img_size=self.img_size, max_batch_size=max_batch_size,
+                                                  engine=self.engine)
+            print(f"✓ Using the shared model host at {model_host}")
+        # Load model; the backend is picked from the file extension and the
+        # forward pass is compiled and warmed up once
+        elif Path(model_path).exists():
+            self.model, self.engine = load_engine(model_path, img_size=img_size, num_threads=num_threads)
+            self.backend = self.engine.backend
+            print(f"✓ Model loaded successfully from {model_path} ({self.backend} backend)")
+            
+            # Resize / BGR->RGB / scaling into one reused input tensor, following the
+            # normalization saved with the model (model_config.json or a Rescaling layer)
+            preprocessor = Preprocessor.for_model(model_path, self.model, img_size, max_batch_size,
+                                                  engine=self.engine)
         else:
             raise FileNotFoundError(f"Model file not found: {model_path}")
         
-        # Set class labels
-        if class_labels is None:
-            # Default ASL alphabet + special commands
-            self.class_labels = [
-                'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M',
-                'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z'
-            ]
-        else:
-            self.class_labels = class_labels
+        # Preprocessors reuse their buffers, so every calling thread gets its own copy
+        self._preprocessor_template = preprocessor
+        self._local = threading.local()
+        self._local.preprocessor = preprocessor
+        
+        # Set class labels and check them (and the input size) against the model
+        self.class_labels = list(config.CLASS_LABELS if class_labels is None else class_labels)
+        validate_model_shapes(self.engine.input_shape, self.engine.output_shape, self.engine.img_size,
+                              self.class_labels)
         
         print(f"✓ Model ready with {len(self.class_labels)} classes")
     
+    @property
+    def preprocessor(self):
+        """Preprocessor of the calling thread"""
+        preprocessor = getattr(self._local, 'preprocessor', None)
+        if preprocessor is None:
+            preprocessor = self._local.preprocessor = self._preprocessor_template.copy()
+        return preprocessor
+    
     def preprocess_image(self, image):
         """
         Preprocess image for model input
@@ -51,21 +92,16 @@ class SignLanguageModel:
             image: Input image (BGR format from OpenCV)
             
         Returns:
-            Preprocessed image ready for prediction
+            Preprocessed image ready for prediction (a view into this thread's
+            reused buffer, overwritten by its next call)
         """
-        # Resize to model input size
-        img_resized = cv2.resize(image, (self.img_size, self.img_size))
-        
-        # Convert BGR to RGB
-        img_rgb = cv2.cvtColor(img_resized, cv2.COLOR_BGR2RGB)
-        
-        # Normalize to [0, 1]
-        img_normalized = img_rgb.astype(np.float32) / 255.0
-        
-        # Add batch dimension
-        img_batch = np.expand_dims(img_normalized, axis=0)
-        
-        return img_batch
+        return self.preprocessor(image)
+    
+    def _get_label(self, class_idx):
+        """Map a class index to its label"""
+        if class_idx < len(self.class_labels):
+            return self.class_labels[class_idx]
+        return f"Unknown_{class_idx}"
     
     def predict(self, image, return_confidence=True):
         """
@@ -83,48 +119,188 @@ class SignLanguageModel:
         processed_img = self.preprocess_image(image)
         
         # Make prediction
-        predictions = self.model.predict(processed_img, verbose=0)
+        predictions = self.engine.predict(processed_img)
         
         # Get class with highest probability
         class_idx = np.argmax(predictions[0])
         confidence = float(predictions[0][class_idx])
         
         # Get class label
-        if class_idx < len(self.class_labels):
-            prediction = self.class_labels[class_idx]
-        else:
-            prediction = f"Unknown_{class_idx}"
+        prediction = self._get_label(class_idx)
         
         if return_confidence:
             return prediction, confidence
         else:
             return prediction
     
-    def predict_batch(self, images):
+    def predict_batch(self, images, max_batch_size=None):
         """
         Predict multiple images at once
         
+        All images are preprocessed into one preallocated input array and
+        classified with a single forward pass per chunk of `max_batch_size`.
+        
         Args:
-            images: List of images
+            images: List of images (BGR format from OpenCV, any size)
+            max_batch_size: Largest chunk per forward pass (default: self.max_batch_size)
             
         Returns:
             List of (prediction, confidence) tuples
         """
+        if max_batch_size is None:
+            max_batch_size = self.max_batch_size
+        max_batch_size = max(1, int(max_batch_size))
+        
+        num_images = len(images)
+        if num_images == 0:
+            return []
+        
         results = []
-        for image in images:
-            pred, conf = self.predict(image)
-            results.append((pred, conf))
+        for start in range(0, num_images, max_batch_size):
+            chunk = images[start:start + max_batch_size]
+            count = len(chunk)
+            
+            # Every chunk is written into the preprocessor's reused input tensor
+            predictions = self.engine.predict(self.preprocessor.batch(chunk))
+            
+            # Argmax and confidence extraction for the whole chunk
+            class_indices = np.argmax(predictions, axis=1)
+            confidences = predictions[np.arange(count), class_indices]
+            
+            results.extend(
+                (self._get_label(int(idx)), float(conf))
+                for idx, conf in zip(class_indices, confidences)
+            )
         return results
     
+    def evaluate(self, directory, batch_size=None, workers=None, limit=None, seed=42, verbose=True):
+        """
+        Evaluate the model on a labelled folder tree or a dataset cache
+        
+        Folder images are decoded and resized in a worker pool and classified in
+        batches as they arrive; a cache built by dataset_cache.py is read straight
+        from its memory-mapped shards. Only a few batches are in memory at any time.
+        
+        Args:
+            directory: Class sub-folders (asl_alphabet_train style), a flat folder
+                of '<label>_*.jpg' files (asl_alphabet_test style) or a cache directory
+            batch_size: Images per forward pass (default: self.max_batch_size)
+            workers: Decoding processes (default: CPU count)
+            limit: Evaluate a random sample of this many images
+            seed: Random seed for `limit` sampling
+            verbose: Print progress
+            
+        Returns:
+            Dictionary with accuracy, per-class accuracy, confusion matrix
+            (rows = true class, columns = predicted class) and images/sec
+        """
+        batch_size = max(1, int(batch_size or self.max_batch_size))
+        counts = {'unreadable': 0, 'unknown': set(), 'total': 0}
+        if is_cache(directory):
+            batches = self._cache_batches(directory, batch_size, limit, seed, counts)
+        else:
+            batches = self._folder_batches(directory, batch_size, workers, limit, seed, counts)
+        
+        confusion = None
+        done = 0
+        start = time.perf_counter()
+        for images, true in batches:
+            done += len(images)
+            if len(images) == 0:
+                continue
+            predictions = self.engine.predict(self.preprocessor.batch(images))
+            if confusion is None:
+                size = max(len(self.class_labels), predictions.shape[1])
+                confusion = np.zeros((size, size), dtype=np.int64)
+            np.add.at(confusion, (true, np.argmax(predictions, axis=1)), 1)
+            
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f"\r  {done}/{counts['total']} images, {done / elapsed:.1f} images/sec", end="", flush=True)
+        if verbose:
+            print()
+        
+        elapsed = time.perf_counter() - start
+        if confusion is None:
+            confusion = np.zeros((len(self.class_labels),) * 2, dtype=np.int64)
+        total = int(confusion.sum())
+        support = confusion.sum(axis=1)
+        class_names = [self._get_label(i) for i in range(len(confusion))]
+        return {
+            'num_images': total,
+            'accuracy': float(np.trace(confusion) / total) if total else 0.0,
+            'per_class_accuracy': {
+                class_names[i]: float(confusion[i, i] / support[i]) for i in range(len(confusion)) if support[i]
+            },
+            'confusion_matrix': confusion,
+            'class_names': class_names,
+            'images_per_sec': total / elapsed if elapsed > 0 else 0.0,
+            'seconds': elapsed,
+            'unreadable': counts['unreadable'],
+            'unknown_labels': sorted(counts['unknown'])
+        }
+    
+    def _folder_batches(self, directory, batch_size, workers, limit, seed, counts):
+        """Yield (images, class indices) from an image folder, decoded in a worker pool"""
+        items = list_labelled_images(directory)
+        if limit and limit < len(items):
+            rng = np.random.default_rng(seed)
+            items = [items[i] for i in sorted(rng.choice(len(items), limit, replace=False))]
+        
+        # Keep only images whose label the model knows
+        paths, targets = [], []
+        for path, label in items:
+            idx = resolve_label(label, self.class_labels)
+            if idx is None:
+                counts['unknown'].add(label)
+            else:
+                paths.append(path)
+                targets.append(idx)
+        self._warn_unknown(counts['unknown'])
+        targets = np.array(targets, dtype=np.int64)
+        counts['total'] = len(paths)
+        
+        for offset, images, ok in iter_resized(paths, self.img_size, chunk_size=batch_size, workers=workers):
+            counts['unreadable'] += int((~ok).sum())
+            yield images[ok], targets[offset:offset + len(ok)][ok]
+    
+    def _cache_batches(self, cache_dir, batch_size, limit, seed, counts):
+        """Yield (images, class indices) straight from a memory-mapped dataset cache"""
+        cache = DatasetCache(cache_dir)
+        mapping = np.array([-1 if idx is None else idx
+                            for idx in (resolve_label(name, self.class_labels) for name in cache.class_names)],
+                           dtype=np.int64)
+        counts['unknown'].update(name for name, idx in zip(cache.class_names, mapping) if idx < 0)
+        self._warn_unknown(counts['unknown'])
+        counts['total'] = min(len(cache), limit) if limit else len(cache)
+        
+        # A limited run takes random contiguous batches instead of the first classes
+        for images, labels in cache.iter_batches(batch_size, shuffle=bool(limit), seed=seed, limit=limit):
+            targets = mapping[labels]
+            known = targets >= 0
+            if known.all():
+                yield images, targets
+            else:
+                yield images[known], targets[known]
+    
+    @staticmethod
+    def _warn_unknown(labels):
+        """Print the dataset labels that have no matching model class"""
+        if labels:
+            print(f"⚠️  Skipping labels not in the model's classes: {', '.join(sorted(labels))}")
+    
     def get_model_info(self):
         """Get information about the loaded model"""
         info = {
             'model_path': self.model_path,
-            'input_shape': self.model.input_shape,
-            'output_shape': self.model.output_shape,
+            'backend': self.backend,
+            'input_shape': self.model.input_shape if self.model is not None else self.engine.input_shape,
+            'output_shape': self.model.output_shape if self.model is not None else self.engine.output_shape,
             'num_classes': len(self.class_labels),
             'class_labels': self.class_labels,
-            'img_size': self.img_size
+            'img_size': self.img_size,
+            'input_scale': float(self.preprocessor.scale),
+            'max_batch_size': self.max_batch_size
         }
         return info
     
@@ -133,7 +309,11 @@ class SignLanguageModel:
         print("\n" + "="*60)
         print("MODEL SUMMARY")
         print("="*60)
-        self.model.summary()
+        if self.model is not None:
+            self.model.summary()
+        else:
+            print(f"{self.backend} model: {self.model_path}")
+            print(f"Input: {self.engine.input_shape}  Output: {self.engine.output_shape}")
         print("="*60)
         print(f"Input Size: {self.img_size}x{self.img_size}")
         print(f"Number of Classes: {len(self.class_labels)}")
@@ -144,6 +324,7 @@ class SignLanguageModel:
 # Example usage and testing
 if __name__ == "__main__":
     import sys
+    from inference_engine import print_comparison
     
     print("\n🔍 Sign Language Model Wrapper - Test Mode\n")
     
@@ -179,6 +360,11 @@ if __name__ == "__main__":
         prediction, confidence = model.predict(dummy_image)
         print(f"✓ Prediction: {prediction} (Confidence: {confidence*100:.2f}%)")
         
+        # Compare compiled inference against model.predict
+        if model.backend == 'keras':
+            print("\nMeasuring inference latency...")
+            print_comparison(model.engine.compare_with_legacy(runs=50))
+        
         print("\n✅ Model wrapper is working correctly!")
         
     except Exception as e:
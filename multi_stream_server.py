@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Multi-Stream Inference Server for Sign Language Detection
+Serves several camera feeds, video files or socket clients from one model,
+classifying hand crops from every stream in shared micro-batches
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+import cv2
+import numpy as np
+
+import config
+from frame_pipeline import open_camera
+from inference_engine import LatencyStats, load_engine
+from preprocessing import Preprocessor, resolve_normalization
+from recognition_engine import RecognitionEngine
+from runtime_config import ConfigError, load_cli_config, validate_model_shapes
+
+# Socket protocol: each message is a 4-byte big-endian length followed by a JPEG frame;
+# the server answers every frame with one JSON line describing the recognition event.
+HEADER = struct.Struct('>I')
+
+
+class MicroBatcher:
+    """Gathers single-crop predictions from many threads into batched forward passes"""
+
+    def __init__(self, inference_engine, max_batch_size=32, max_wait_ms=5.0):
+        """
+        Initialize the batcher
+
+        Args:
+            inference_engine: Shared InferenceEngine / TFLiteEngine
+            max_batch_size: Most crops sent through the model at once (a single
+                request with more crops is sent on its own)
+            max_wait_ms: How long the first request of a batch waits for others
+        """
+        self.inference_engine = inference_engine
+        # (height, width, channels) of one crop, or None if the engine does not say
+        input_shape = getattr(inference_engine, 'input_shape', None)
+        self.crop_shape = tuple(input_shape[1:]) if input_shape and None not in input_shape[1:] else None
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.requests = queue.Queue()
+
+        # A request that did not fit into the previous batch starts the next one
+        self._carry = None
+
+        self.images = 0
+        self.batches = 0
+        self.start_time = time.perf_counter()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def predict(self, batch):
+        """
+        Submit a preprocessed batch and wait for its probabilities
+
+        Has the same signature as InferenceEngine.predict, so a RecognitionEngine
+        can use the batcher as its inference engine.
+
+        Raises:
+            ValueError: The crops do not have the model's input shape (they could
+                not be batched with other streams' crops)
+        """
+        batch = np.asarray(batch, dtype=np.float32)
+        if batch.ndim != 4 or (self.crop_shape is not None and batch.shape[1:] != self.crop_shape):
+            expected = f"(N,) + {self.crop_shape}" if self.crop_shape else "(N, height, width, channels)"
+            raise ValueError(f"Batch of shape {batch.shape} does not match the model input {expected}")
+        future = Future()
+        self.requests.put((batch, future))
+        return future.result()
+
+    def _run(self):
+        """Batching loop: wait for a request, gather more until full or timed out"""
+        while True:
+            if self._carry is not None:
+                pending, self._carry = [self._carry], None
+            else:
+                pending = [self.requests.get()]
+            count = len(pending[0][0])
+            deadline = time.perf_counter() + self.max_wait
+            while count < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                # Requests carry one crop per hand; never split one across batches
+                if count + len(request[0]) > self.max_batch_size:
+                    self._carry = request
+                    break
+                pending.append(request)
+                count += len(request[0])
+
+            # Any failure belongs to this batch's callers; the loop must keep serving the others
+            try:
+                batch = np.concatenate([inputs for inputs, _ in pending], axis=0)
+                predictions = self.inference_engine.predict(batch)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            # Route each slice of the batch back to its caller
+            offset = 0
+            for inputs, future in pending:
+                future.set_result(predictions[offset:offset + len(inputs)])
+                offset += len(inputs)
+
+            self.images += count
+            self.batches += 1
+
+    def stats(self):
+        """Overall throughput and batching statistics"""
+        elapsed = time.perf_counter() - self.start_time
+        return {
+            'images': self.images,
+            'batches': self.batches,
+            'mean_batch_size': self.images / self.batches if self.batches else 0.0,
+            'images_per_sec': self.images / elapsed if elapsed > 0 else 0.0
+        }
+
+
+class StreamWorker(threading.Thread):
+    """Runs hand detection, stability tracking and text assembly for one stream"""
+
+    def __init__(self, stream_id, frames, batcher, preprocessor, on_event=None, flip=False):
+        """
+        Initialize the stream worker
+
+        Args:
+            stream_id: Name used in reports
+            frames: Iterable of BGR frames
+            batcher: Shared MicroBatcher used for classification
+            preprocessor: This stream's Preprocessor (own input buffer, model's normalization)
+            on_event: Callback `on_event(stream_id, event)` for every frame
+            flip: Mirror frames horizontally (as the app does for webcams)
+        """
+        super().__init__(daemon=True)
+        self.stream_id = stream_id
+        self.frames = frames
+        self.on_event = on_event
+        self.flip = flip
+        self.latency = LatencyStats(window=1000)
+
+        # Each stream has its own MediaPipe tracker but shares the model via the batcher
+        self.recognizer = RecognitionEngine(model_path=None, classifier_mode='cnn')
+        self.recognizer.load_hands()
+        self.recognizer.inference_engine = batcher
+        self.recognizer.preprocessor = preprocessor
+
+    def run(self):
+        try:
+            for frame in self.frames:
+                start = time.perf_counter()
+                if self.flip:
+                    frame = cv2.flip(frame, 1)
+                event, _ = self.recognizer.update(frame)
+                self.latency.add((time.perf_counter() - start) * 1000.0)
+                if self.on_event:
+                    self.on_event(self.stream_id, event)
+        finally:
+            self.recognizer.close()
+
+
+def capture_frames(source):
+    """Yield frames from a camera index or a video file"""
+    cap = open_camera(int(source)) if str(source).isdigit() else cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Could not open source: {source}")
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame
+    finally:
+        cap.release()
+
+
+def read_exactly(conn, size):
+    """Read exactly `size` bytes from a socket, or return None on disconnect"""
+    data = bytearray()
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            return None
+        data.extend(chunk)
+    return bytes(data)
+
+
+def socket_frames(conn):
+    """Yield frames received from a socket client (length-prefixed JPEGs)"""
+    while True:
+        header = read_exactly(conn, HEADER.size)
+        if header is None:
+            return
+        payload = read_exactly(conn, HEADER.unpack(header)[0])
+        if payload is None:
+            return
+        frame = cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is not None:
+            yield frame
+
+
+class MultiStreamServer:
+    """Loads the model once and serves many streams through one MicroBatcher"""
+
+    def __init__(self, model_path, max_batch_size=32, max_wait_ms=5.0):
+        """
+        Initialize the server
+
+        Args:
+            model_path: Path to the model (.h5, .keras or .tflite)
+            max_batch_size: Largest micro-batch
+            max_wait_ms: Maximum time a crop waits for others to join its batch
+        """
+        model, inference_engine = load_engine(model_path, img_size=config.IMG_SIZE,
+                                              num_threads=config.TFLITE_NUM_THREADS)
+        # Checked once here for every stream (the workers share this model)
+        validate_model_shapes(inference_engine.input_shape, inference_engine.output_shape,
+                              config.IMG_SIZE, config.CLASS_LABELS)
+        self.img_size = inference_engine.img_size
+        self.normalization = resolve_normalization(model_path, model, inference_engine)
+        self.batcher = MicroBatcher(inference_engine, max_batch_size, max_wait_ms)
+        self.workers = []
+        self._lock = threading.Lock()
+
+    def add_stream(self, stream_id, frames, on_event=None, flip=False):
+        """Start serving a new stream"""
+        preprocessor = Preprocessor(self.img_size, max_batch_size=config.MAX_HANDS, **self.normalization)
+        worker = StreamWorker(stream_id, frames, self.batcher, preprocessor,
+                              on_event or self.print_event, flip)
+        with self._lock:
+            self.workers.append(worker)
+        worker.start()
+        return worker
+
+    @staticmethod
+    def print_event(stream_id, event):
+        """Default event handler: print committed text"""
+        if event.committed_text_delta:
+            print(f"[{stream_id}] frame {event.frame_index}: {event.letter} "
+                  f"({event.confidence*100:.0f}%) -> {event.committed_text_delta!r}")
+
+    def listen(self, host, port):
+        """Accept socket clients in a background thread; each connection is a stream"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((host, port))
+        server.listen()
+        print(f"✓ Listening for frame streams on {host}:{port}")
+
+        def accept_loop():
+            while True:
+                conn, address = server.accept()
+                stream_id = f"socket:{address[0]}:{address[1]}"
+                send_lock = threading.Lock()
+
+                def reply(stream_id, event, conn=conn, send_lock=send_lock):
+                    line = json.dumps(event._asdict()) + "\n"
+                    with send_lock:
+                        try:
+                            conn.sendall(line.encode('utf-8'))
+                        except OSError:
+                            pass
+
+                self.add_stream(stream_id, socket_frames(conn), on_event=reply)
+
+        threading.Thread(target=accept_loop, daemon=True).start()
+
+    def report(self):
+        """Printable per-stream latency and overall throughput"""
+        lines = ["\n" + "="*64, "MULTI-STREAM REPORT", "="*64]
+        with self._lock:
+            workers = list(self.workers)
+        for worker in workers:
+            s = worker.latency.summary()
+            state = "running" if worker.is_alive() else "done"
+            lines.append(f"{worker.stream_id:28s} {s['calls']:6d} frames  "
+                         f"p50 {s['p50_ms']:6.1f} ms  p95 {s['p95_ms']:6.1f} ms  ({state})")
+        stats = self.batcher.stats()
+        lines.append("-"*64)
+        lines.append(f"Model: {stats['images']} images in {stats['batches']} batches "
+                     f"(mean batch {stats['mean_batch_size']:.1f}), {stats['images_per_sec']:.1f} images/sec")
+        lines.append("="*64)
+        return "\n".join(lines)
+
+
+def send_video(host, port, source, quality=90):
+    """Test client: stream a video file or camera to the server and print its replies"""
+    conn = socket.create_connection((host, port))
+    reader = conn.makefile('r', encoding='utf-8')
+
+    def print_replies():
+        for line in reader:
+            event = json.loads(line)
+            if event['committed_text_delta']:
+                print(f"frame {event['frame_index']}: {event['letter']} -> {event['committed_text_delta']!r}")
+
+    threading.Thread(target=print_replies, daemon=True).start()
+    for frame in capture_frames(source):
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if ok:
+            conn.sendall(HEADER.pack(len(jpeg)) + jpeg.tobytes())
+    conn.shutdown(socket.SHUT_WR)
+    time.sleep(1.0)
+    conn.close()
+
+
+def parse_address(address):
+    """Split 'host:port' (or just 'port') into a tuple"""
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve many camera/video streams from one model")
+    parser.add_argument('sources', nargs='*', help="Camera indices (e.g. 0 1) or video files")
+    parser.add_argument('--model', help="Model path (.h5, .keras or .tflite, default: MODEL_PATH)")
+    parser.add_argument('--listen', metavar='HOST:PORT', help="Also accept frame streams on a local socket")
+    parser.add_argument('--max-batch', type=int, help="Largest micro-batch (default: MAX_BATCH_SIZE)")
+    parser.add_argument('--max-wait-ms', type=float,
+                        help="Maximum time a crop waits for a batch to fill (default: MAX_BATCH_WAIT_MS)")
+    parser.add_argument('--report-every', type=float, default=10.0, help="Seconds between reports")
+    parser.add_argument('--send', metavar='HOST:PORT', help="Client mode: stream the first source to a server")
+    args = parser.parse_args()
+
+    # config.py, the model's metadata and SIGN_* overrides (explicit options still win)
+    if load_cli_config(args, {'max_batch': 'MAX_BATCH_SIZE', 'max_wait_ms': 'MAX_BATCH_WAIT_MS'}) is None:
+        return 1
+
+    if args.send:
+        if not args.sources:
+            print("❌ Client mode needs a source (camera index or video file)")
+            return 1
+        host, port = parse_address(args.send)
+        send_video(host, port, args.sources[0])
+        return 0
+
+    if not args.sources and not args.listen:
+        parser.print_help()
+        return 1
+    if not os.path.exists(args.model):
+        print(f"❌ Model file not found: {args.model}")
+        return 1
+
+    try:
+        server = MultiStreamServer(args.model, args.max_batch, args.max_wait_ms)
+    except ConfigError as e:
+        print(f"❌ {e}")
+        return 1
+    for source in args.sources:
+        server.add_stream(f"source:{source}", capture_frames(source), flip=str(source).isdigit())
+    if args.listen:
+        server.listen(*parse_address(args.listen))
+
+    try:
+        last_report = time.perf_counter()
+        while args.listen or any(w.is_alive() for w in server.workers):
+            time.sleep(0.2)
+            if time.perf_counter() - last_report >= args.report_every:
+                print(server.report())
+                last_report = time.perf_counter()
+    except KeyboardInterrupt:
+        pass
+    for worker in server.workers:
+        worker.join(timeout=1.0)
+    print(server.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
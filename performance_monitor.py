@@ -0,0 +1,214 @@
+"""
+Performance Monitor for Sign Language Detection
+On-frame HUD and periodic metrics export (JSON lines or a Prometheus text endpoint)
+built on the per-stage timings
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+# Stages in pipeline order, for the HUD
+HUD_STAGES = ['capture', 'color_convert', 'hand_detection', 'crop_resize', 'inference',
+              'smoothing', 'display_convert']
+
+
+class PerformanceMonitor:
+    """Collects FPS and queue statistics next to a StageTimings and publishes them"""
+
+    def __init__(self, timings, queues=None, window=120, hud_refresh=0.5, caches=None):
+        """
+        Initialize the monitor
+
+        Args:
+            timings: StageTimings with the per-stage ring buffers
+            queues: Optional {name: LatestFrameQueue} whose depth and drops are reported
+            window: Number of recent frame timestamps used for the FPS estimate
+            hud_refresh: Seconds between two HUD text updates (percentiles are not
+                recomputed on every frame)
+            caches: Optional {name: PredictionCache} whose hit rate is reported
+        """
+        self.timings = timings
+        self.queues = dict(queues or {})
+        self.caches = dict(caches or {})
+        self.frame_times = deque(maxlen=window)
+        self.frames = 0
+        self.hud_refresh = hud_refresh
+
+        self._hud_lines = []
+        self._hud_updated = 0.0
+        self._stop = threading.Event()
+        self._threads = []
+        self._server = None
+
+    def set_queues(self, queues):
+        """Replace the monitored queues (e.g. after the camera restarts)"""
+        self.queues = dict(queues)
+
+    def tick(self):
+        """Record that one frame went through the pipeline"""
+        self.frame_times.append(time.perf_counter())
+        self.frames += 1
+
+    @property
+    def fps(self):
+        """Frames per second over the recent window"""
+        times = list(self.frame_times)
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def snapshot(self):
+        """
+        Current metrics
+
+        Returns:
+            Dictionary with timestamp, fps, frames, per-stage latency summary, queue
+            and cache stats
+        """
+        return {
+            'timestamp': time.time(),
+            'fps': self.fps,
+            'frames': self.frames,
+            'stages': self.timings.summary(),
+            'queues': {name: {'depth': q.qsize(), 'dropped': q.dropped} for name, q in self.queues.items()},
+            'caches': {name: cache.stats() for name, cache in self.caches.items()}
+        }
+
+    def draw_overlay(self, frame):
+        """
+        Draw the HUD (FPS, per-stage ms, queue depths, dropped frames) on a frame in place
+
+        The text is refreshed every `hud_refresh` seconds.
+        """
+        now = time.perf_counter()
+        if now - self._hud_updated >= self.hud_refresh:
+            self._hud_updated = now
+            self._hud_lines = self._format_hud()
+
+        h = frame.shape[0]
+        y = h - 10 - 18 * (len(self._hud_lines) - 1)
+        for line in self._hud_lines:
+            cv2.putText(frame, line, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 0, 0), 3)
+            cv2.putText(frame, line, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 255), 1)
+            y += 18
+        return frame
+
+    def _format_hud(self):
+        """HUD text lines from the current metrics"""
+        stages = self.timings.summary()
+        lines = [f"FPS {self.fps:5.1f}"]
+        for name in HUD_STAGES + [s for s in stages if s not in HUD_STAGES and s != 'frame_total']:
+            if name in stages:
+                s = stages[name]
+                lines.append(f"{name:15s} {s['p50_ms']:6.1f} ms  p95 {s['p95_ms']:6.1f}")
+        for name, q in self.queues.items():
+            lines.append(f"queue {name:9s} depth {q.qsize()}  dropped {q.dropped}")
+        for name, cache in self.caches.items():
+            lines.append(f"cache {name:9s} hits {cache.hit_rate*100:4.0f}%  size {len(cache)}")
+        return lines
+
+    def prometheus_text(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP sign_pipeline_fps Frames processed per second (recent window)",
+            "# TYPE sign_pipeline_fps gauge",
+            f"sign_pipeline_fps {self.fps:.3f}",
+            "# HELP sign_pipeline_frames_total Frames processed",
+            "# TYPE sign_pipeline_frames_total counter",
+            f"sign_pipeline_frames_total {self.frames}",
+            "# HELP sign_stage_latency_ms Per-stage latency (quantiles over the recent window)",
+            "# TYPE sign_stage_latency_ms summary",
+        ]
+        totals = dict(self.timings.totals)
+        for stage, s in self.timings.summary().items():
+            for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+                lines.append(f'sign_stage_latency_ms{{stage="{stage}",quantile="{quantile}"}} {s[key]:.3f}')
+            count, total = totals.get(stage, (s['count'], s['mean_ms'] * s['count']))
+            lines.append(f'sign_stage_latency_ms_sum{{stage="{stage}"}} {total:.3f}')
+            lines.append(f'sign_stage_latency_ms_count{{stage="{stage}"}} {count}')
+        lines += ["# HELP sign_queue_depth Items waiting in a pipeline queue",
+                  "# TYPE sign_queue_depth gauge"]
+        lines += [f'sign_queue_depth{{queue="{name}"}} {q.qsize()}' for name, q in self.queues.items()]
+        lines += ["# HELP sign_queue_dropped_total Frames dropped because a queue was full",
+                  "# TYPE sign_queue_dropped_total counter"]
+        lines += [f'sign_queue_dropped_total{{queue="{name}"}} {q.dropped}' for name, q in self.queues.items()]
+        lines += ["# HELP sign_cache_hits_total Lookups answered from a prediction cache",
+                  "# TYPE sign_cache_hits_total counter"]
+        lines += [f'sign_cache_hits_total{{cache="{name}"}} {c.hits}' for name, c in self.caches.items()]
+        lines += ["# HELP sign_cache_misses_total Lookups that had to run the classifier",
+                  "# TYPE sign_cache_misses_total counter"]
+        lines += [f'sign_cache_misses_total{{cache="{name}"}} {c.misses}' for name, c in self.caches.items()]
+        lines += ["# HELP sign_cache_hit_ratio Fraction of lookups answered from a prediction cache",
+                  "# TYPE sign_cache_hit_ratio gauge"]
+        lines += [f'sign_cache_hit_ratio{{cache="{name}"}} {c.hit_rate:.4f}' for name, c in self.caches.items()]
+        return "\n".join(lines) + "\n"
+
+    def start_jsonl_export(self, path, interval=10.0):
+        """Append a snapshot to a JSON-lines file every `interval` seconds (background thread)"""
+        def export():
+            while not self._stop.wait(interval):
+                with open(path, 'a') as f:
+                    f.write(json.dumps(self.snapshot()) + "\n")
+
+        thread = threading.Thread(target=export, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        print(f"✓ Exporting metrics to {path} every {interval:g}s")
+
+    def start_prometheus_endpoint(self, port, host='127.0.0.1'):
+        """Serve prometheus_text() at http://host:port/metrics (background thread)"""
+        monitor = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('/metrics', ''):
+                    self.send_error(404)
+                    return
+                body = monitor.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        print(f"✓ Serving metrics at http://{host}:{port}/metrics")
+
+    def stop(self):
+        """Stop the exporters"""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def create_monitor(timings, queues=None, caches=None):
+    """
+    Build a PerformanceMonitor from config.py and start the configured exporters
+
+    Returns:
+        PerformanceMonitor, or None when performance stats are disabled
+    """
+    import config
+
+    if not (config.ENABLE_PERFORMANCE_STATS or config.DEBUG_MODE or config.PERFORMANCE_HUD):
+        return None
+    timings.enabled = True
+    monitor = PerformanceMonitor(timings, queues, caches=caches)
+    if config.METRICS_JSONL_PATH:
+        monitor.start_jsonl_export(config.METRICS_JSONL_PATH, config.METRICS_EXPORT_INTERVAL)
+    if config.METRICS_PORT:
+        monitor.start_prometheus_endpoint(config.METRICS_PORT)
+    return monitor
@@ -0,0 +1,130 @@
+"""
+Prediction Cache for Sign Language Detection
+LRU cache of softmax vectors keyed by a perceptual hash of the hand crop
+(or by quantized landmarks), so a hand held still is not reclassified
+"""
+
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+def dhash(image, hash_size=8):
+    """
+    Difference hash of an image
+
+    The image is shrunk to (hash_size + 1) x hash_size grayscale pixels and every
+    bit records whether a pixel is brighter than its right neighbour, so small
+    shifts, noise and exposure changes keep the same hash.
+
+    Args:
+        image: BGR image (e.g. a hand crop)
+        hash_size: Bits per row and number of rows
+
+    Returns:
+        Hash as bytes (hash_size * hash_size bits)
+    """
+    small = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes()
+
+
+def crop_key(image, hash_size=8, size_step=16):
+    """
+    Cache key of a hand crop: its dHash plus its size
+
+    The hash alone ignores size and aspect ratio, so two different hand shapes
+    could share it. The width and height, rounded to `size_step` pixels, are
+    part of the key as well.
+
+    Args:
+        image: BGR hand crop
+        hash_size: dHash grid size (see dhash)
+        size_step: Width/height bucket in pixels (0 = ignore the size)
+    """
+    h, w = image.shape[:2]
+    size = (w // size_step, h // size_step) if size_step else (0, 0)
+    return size + (dhash(image, hash_size),)
+
+
+def landmark_key(vector, step=0.05):
+    """
+    Cache key of a normalized landmark vector (see normalize_landmarks)
+
+    Args:
+        vector: Landmark feature vector
+        step: Quantization step; landmarks closer than this share a key
+    """
+    return np.round(np.asarray(vector) / step).astype(np.int16).tobytes()
+
+
+class PredictionCache:
+    """Least-recently-used cache of class probability vectors with a time-to-live"""
+
+    def __init__(self, max_size=256, ttl=1.0):
+        """
+        Initialize the cache
+
+        Args:
+            max_size: Entries kept before the least recently used one is evicted
+            ttl: Seconds an entry stays valid (0 = no expiry)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Look up a key
+
+        Returns:
+            The cached probability vector, or None on a miss or expired entry
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            probs, stored = entry
+            if not self.ttl or time.monotonic() - stored <= self.ttl:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return probs
+            del self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, probs):
+        """Store a probability vector, evicting the least recently used entry if full"""
+        self.entries[key] = (np.array(probs, dtype=np.float32), time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (the hit/miss counters are kept)"""
+        self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Dictionary with size, hits, misses, evictions and hit rate"""
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate
+        }
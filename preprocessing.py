@@ -0,0 +1,155 @@
+"""
+Preprocessing for Sign Language Detection
+Fused resize / colour swap / normalization straight into a preallocated float32 input tensor
+"""
+
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Used when neither the model metadata nor the model itself says how inputs are scaled
+DEFAULT_NORMALIZATION = {'scale': 1.0 / 255.0, 'offset': 0.0, 'channel_order': 'RGB'}
+
+
+def metadata_sidecar(model_path):
+    """Path of the metadata file written next to one model: '<model stem>.meta.json'"""
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.stem + '.meta.json')
+
+
+def load_model_metadata(model_path):
+    """
+    Read the metadata saved next to a model
+
+    Looks for '<model stem>.meta.json' first, then 'model_config.json' in the same
+    folder. A plain '<model stem>.json' is not read: it may be a Keras architecture file.
+
+    Returns:
+        Dictionary (empty if no metadata file exists)
+    """
+    if not model_path:
+        return {}
+    model_path = Path(model_path)
+    for candidate in (metadata_sidecar(model_path), model_path.parent / 'model_config.json'):
+        if candidate.exists():
+            with open(candidate, 'r') as f:
+                return json.load(f)
+    return {}
+
+
+def model_rescales_inputs(model):
+    """True if a Keras model starts with a Rescaling layer (it normalizes pixels itself)"""
+    if model is None:
+        return False
+    for layer in getattr(model, 'layers', [])[:3]:
+        if type(layer).__name__ == 'Rescaling':
+            return True
+    return False
+
+
+def resolve_normalization(model_path=None, model=None, engine=None):
+    """
+    Work out the normalization contract of a model
+
+    Priority: the contract an engine carries (model store artifacts and the
+    shared model host resolved it when they loaded the Keras model), the
+    'preprocessing' entry of the model metadata, then a Rescaling layer inside
+    the model (feed raw 0-255 pixels), then DEFAULT_NORMALIZATION.
+
+    Returns:
+        Dictionary with 'scale', 'offset' and 'channel_order'
+    """
+    normalization = dict(DEFAULT_NORMALIZATION)
+    if getattr(engine, 'normalization', None):
+        normalization.update(engine.normalization)
+        return normalization
+    metadata = load_model_metadata(model_path).get('preprocessing')
+    if metadata:
+        normalization.update({k: metadata[k] for k in normalization if k in metadata})
+    elif model_rescales_inputs(model):
+        normalization['scale'] = 1.0
+    return normalization
+
+
+class Preprocessor:
+    """
+    Writes resized, colour-swapped and normalized crops into a reused input tensor
+
+    Not thread-safe: every call overwrites the same buffers, so each thread needs
+    its own instance (see copy()).
+    """
+
+    def __init__(self, img_size=64, scale=1.0 / 255.0, offset=0.0, channel_order='RGB', max_batch_size=1):
+        """
+        Initialize the preprocessor
+
+        Args:
+            img_size: Model input size
+            scale: Multiplier applied to uint8 pixels
+            offset: Value added after scaling
+            channel_order: 'RGB' (swap from OpenCV's BGR) or 'BGR' (no swap)
+            max_batch_size: Initial capacity of the input tensor (grows on demand)
+        """
+        self.img_size = img_size
+        self.scale = np.float32(scale)
+        self.offset = np.float32(offset)
+        self.swap_channels = channel_order.upper() == 'RGB'
+
+        self._resized = np.empty((img_size, img_size, 3), dtype=np.uint8)
+        self._rgb = np.empty((img_size, img_size, 3), dtype=np.uint8)
+        self.input = np.empty((max(1, max_batch_size), img_size, img_size, 3), dtype=np.float32)
+
+    @classmethod
+    def for_model(cls, model_path=None, model=None, img_size=64, max_batch_size=1, engine=None):
+        """Create a preprocessor using the model's normalization contract"""
+        return cls(img_size, max_batch_size=max_batch_size, **resolve_normalization(model_path, model, engine))
+
+    def copy(self):
+        """A preprocessor with the same settings and its own buffers"""
+        return Preprocessor(self.img_size, float(self.scale), float(self.offset),
+                            'RGB' if self.swap_channels else 'BGR', len(self.input))
+
+    def write(self, image, out):
+        """
+        Preprocess one BGR image into `out`
+
+        Args:
+            image: BGR image of any size (a crop view is fine)
+            out: float32 array of shape (img_size, img_size, 3)
+        """
+        cv2.resize(image, (self.img_size, self.img_size), dst=self._resized)
+        source = self._resized
+        if self.swap_channels:
+            # A reversed-channel view ([:, :, ::-1]) makes NumPy buffer internally;
+            # a swap into a reused contiguous buffer is faster and allocation-free
+            source = cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        np.copyto(out, source, casting='unsafe')
+        np.multiply(out, self.scale, out=out)
+        if self.offset:
+            np.add(out, self.offset, out=out)
+
+    def __call__(self, image):
+        """
+        Preprocess one image
+
+        Returns:
+            View of shape (1, img_size, img_size, 3) into the reused input tensor
+        """
+        self.write(image, self.input[0])
+        return self.input[:1]
+
+    def batch(self, images):
+        """
+        Preprocess several images into the input tensor
+
+        Returns:
+            View of shape (len(images), img_size, img_size, 3)
+        """
+        count = len(images)
+        if count > len(self.input):
+            self.input = np.empty((count, self.img_size, self.img_size, 3), dtype=np.float32)
+        for i, image in enumerate(images):
+            self.write(image, self.input[i])
+        return self.input[:count]
@@ -0,0 +1,659 @@
+"""
+Recognition Engine for Sign Language Detection
+UI-independent hand detection, classification, stability tracking and text assembly
+"""
+
+import copy
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+import config
+from dataset import LABEL_ALIASES
+from frame_scheduler import AdaptiveScheduler
+from landmark_classifier import LandmarkClassifier, normalize_landmarks
+from prediction_cache import PredictionCache, crop_key, landmark_key
+from preprocessing import Preprocessor
+from roi_tracker import RoiTracker
+from runtime_config import ConfigError, validate_model_shapes
+from stage_timing import StageTimings
+from startup_timing import StartupTimer
+from temporal_decoder import create_decoder
+
+# Text delta emitted for a committed "Delete" sign (remove the last character)
+DELETE = '\b'
+
+
+class HandResult(NamedTuple):
+    """Result for one of the hands in a frame"""
+    hand: str  # MediaPipe handedness ('Left'/'Right'), numbered if it occurs twice
+    letter: Optional[str]
+    confidence: float
+    committed_text_delta: str
+    bbox: tuple  # (x_min, y_min, x_max, y_max) in frame pixels
+    committed: Optional[str] = None  # Label the hand's decoder committed on this frame
+
+
+class RecognitionEvent(NamedTuple):
+    """Result of processing one frame"""
+    frame_index: int
+    letter: Optional[str]  # Most confident hand
+    confidence: float
+    committed_text_delta: str  # '' (nothing), text to append, DELETE, or a mix of these
+    hands: tuple = ()  # HandResult per detected hand, left to right
+
+
+class RecognitionEngine:
+    """Turns a stream of frames into a stream of recognition events"""
+
+    def __init__(self, model_path=None, classifier_mode=None, class_labels=None,
+                 stability_threshold=None, scheduler=None, timings=None, roi_tracker=None,
+                 annotate=True, decoder=None, prediction_cache=None):
+        """
+        Initialize the recognition engine (call load() before processing frames)
+
+        Args:
+            model_path: Path to the model (.h5, .keras or .tflite) for 'cnn' mode
+            classifier_mode: 'cnn' or 'landmark' (default: config.CLASSIFIER_MODE)
+            class_labels: Labels for the CNN outputs (default: config.CLASS_LABELS)
+            stability_threshold: Consistent frames needed before a letter is committed
+                (SMOOTHING_METHOD = 'stability' only, default: config.STABILITY_THRESHOLD)
+            scheduler: AdaptiveScheduler deciding when the classifier runs
+                (default: built from config.py)
+            timings: StageTimings collecting per-stage latencies
+            roi_tracker: RoiTracker choosing the region hand detection runs on
+                (default: built from config.py)
+            annotate: Draw landmarks, bounding boxes and instructions on the frame
+                (disable for offline processing)
+            decoder: Temporal decoder turning per-frame probabilities into committed
+                letters (default: built from config.py); with config.MAX_HANDS > 1
+                every hand gets its own copy
+            prediction_cache: PredictionCache answering near-identical crops without
+                running the classifier (default: built from config.py, None if disabled)
+        """
+        self.model_path = model_path
+        self.classifier_mode = classifier_mode or config.CLASSIFIER_MODE
+        self.class_labels = class_labels or list(config.CLASS_LABELS)
+        self.annotate = annotate
+
+        # Temporal smoothing of the per-frame probabilities before letters are committed
+        if stability_threshold is None:
+            stability_threshold = config.STABILITY_THRESHOLD
+        if decoder is None:
+            decoder = create_decoder(
+                method=config.SMOOTHING_METHOD,
+                stability_threshold=stability_threshold,
+                alpha=config.SMOOTHING_ALPHA,
+                window=config.VOTE_WINDOW,
+                min_votes=config.VOTE_MIN,
+                min_confidence=config.MIN_CONFIDENCE,
+                release_confidence=config.RELEASE_CONFIDENCE
+            )
+        self.decoder = decoder
+        self.max_hands = config.MAX_HANDS
+
+        # Classifier cadence: reuse the last prediction between classifications
+        if scheduler is None:
+            scheduler = AdaptiveScheduler(
+                classify_every=config.CLASSIFY_EVERY_N_FRAMES,
+                motion_threshold=config.MOTION_THRESHOLD,
+                target_fps=config.FPS,
+                adaptive=config.ADAPTIVE_CADENCE,
+                max_interval=config.MAX_CLASSIFY_INTERVAL
+            )
+        self.scheduler = scheduler
+        self.timings = timings or StageTimings(enabled=config.ENABLE_PERFORMANCE_STATS)
+
+        # Hand detection on the area around the last hand instead of the full frame
+        if roi_tracker is None:
+            roi_tracker = RoiTracker(
+                enabled=config.ROI_TRACKING,
+                margin=config.ROI_MARGIN,
+                detection_scale=config.DETECTION_SCALE,
+                redetect_interval=config.ROI_REDETECT_INTERVAL
+            )
+        self.roi_tracker = roi_tracker
+
+        # Class probabilities of recently seen crops, for a hand held still
+        if prediction_cache is None and config.PREDICTION_CACHE_SIZE > 0:
+            prediction_cache = PredictionCache(config.PREDICTION_CACHE_SIZE, config.PREDICTION_CACHE_TTL)
+        self.prediction_cache = prediction_cache
+
+        # Filled in by load()
+        self.model = None
+        self.inference_engine = None
+        self.preprocessor = None
+        self.landmark_classifier = None
+        self.hands = None
+        self.roi_hands = None
+        self.mp_hands = None
+        self.mp_draw = None
+
+        self.subscribers = []
+        # Guards `text`, which a UI thread may clear while frames are processed
+        self.text_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset stream state (frame counter, smoothing and text)"""
+        self.frame_index = 0
+        self.last_classification = (None, 0.0)
+        self.last_probabilities = None
+        self.frame_hands = []
+        self.hand_probabilities = {}
+        self.classified_keys = set()
+        self.decoder.reset()
+        self.hand_decoders = {}
+        self.clear_text()
+        self.scheduler.reset()
+        self.roi_tracker.reset()
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear()
+
+    @property
+    def labels(self):
+        """Class names of the active classifier, in output order"""
+        if self.landmark_classifier is not None:
+            return self.landmark_classifier.class_names
+        return self.class_labels
+
+    def label_for(self, class_idx):
+        """Map a class index of the active classifier to its label"""
+        labels = self.labels
+        if class_idx < len(labels):
+            return labels[class_idx]
+        return chr(65 + class_idx) if class_idx < 26 else 'Unknown'
+
+    @property
+    def has_classifier(self):
+        """True if a CNN or landmark classifier is loaded"""
+        return self.inference_engine is not None or self.landmark_classifier is not None
+
+    def load(self, timer=None):
+        """
+        Import TensorFlow/MediaPipe and load the classifier and hand detector
+
+        A missing model or library only prints a warning (hand detection still
+        works); a model that does not match IMG_SIZE / CLASS_LABELS is an error.
+
+        Args:
+            timer: StartupTimer receiving the duration of each loading stage
+
+        Raises:
+            ConfigError: The model's input size or class count disagrees with the settings
+        """
+        timer = timer or StartupTimer()
+        tf = None
+
+        # The landmark classifier does not need TensorFlow at all, and neither
+        # does a CNN served by a shared model host
+        if self.classifier_mode != 'landmark' and not config.MODEL_HOST_ADDRESS:
+            try:
+                with timer.measure("import tensorflow"):
+                    import tensorflow as tf
+            except ImportError:
+                print("Warning: TensorFlow not installed. Classification will not work.")
+
+        if self.classifier_mode == 'landmark':
+            try:
+                with timer.measure("model load"):
+                    self.landmark_classifier = LandmarkClassifier.load(
+                        config.LANDMARK_INDEX_PATH, method=config.LANDMARK_METHOD, k=config.LANDMARK_K)
+                print(f"Landmark classifier loaded from {config.LANDMARK_INDEX_PATH}")
+            except Exception as e:
+                print(f"Error loading landmark classifier: {e}")
+        elif config.MODEL_HOST_ADDRESS:
+            try:
+                from model_host import ModelHostClient
+                with timer.measure("model host connect"):
+                    engine = ModelHostClient(config.MODEL_HOST_ADDRESS)
+                validate_model_shapes(engine.input_shape, engine.output_shape, engine.img_size, self.class_labels)
+                self.inference_engine = engine
+                self.preprocessor = Preprocessor.for_model(img_size=engine.img_size, max_batch_size=self.max_hands,
+                                                           engine=engine)
+                print(f"Using the shared model host at {config.MODEL_HOST_ADDRESS}")
+            except ConfigError:
+                raise
+            except Exception as e:
+                print(f"Error connecting to the model host: {e}")
+        elif tf is not None and self.model_path and os.path.exists(self.model_path):
+            try:
+                from inference_engine import load_engine
+                with timer.measure("model load"):
+                    model, engine = load_engine(self.model_path, img_size=config.IMG_SIZE,
+                                                num_threads=config.TFLITE_NUM_THREADS, warmup_runs=0)
+                # A model that disagrees with IMG_SIZE / CLASS_LABELS is reported instead of misread
+                validate_model_shapes(engine.input_shape, engine.output_shape, config.IMG_SIZE, self.class_labels)
+                with timer.measure("graph warmup"):
+                    engine.warmup()
+                timer.mark("first prediction")
+                self.model, self.inference_engine = model, engine
+                self.preprocessor = Preprocessor.for_model(self.model_path, model,
+                                                           engine.img_size,
+                                                           max_batch_size=self.max_hands, engine=engine)
+                print(f"Model loaded from {self.model_path}")
+            except ConfigError:
+                # The model loaded but does not match IMG_SIZE / CLASS_LABELS: the caller reports it
+                raise
+            except Exception as e:
+                print(f"Error loading model: {e}")
+
+        self.load_hands(timer)
+        timer.mark("models ready")
+        return self
+
+    def load_hands(self, timer=None):
+        """
+        Import MediaPipe and create this engine's hand detectors
+
+        Servers call only this per stream and share one classifier between
+        streams (set `inference_engine` and `preprocessor` afterwards).
+        """
+        timer = timer or StartupTimer()
+        try:
+            with timer.measure("import mediapipe"):
+                import mediapipe as mp
+        except ImportError:
+            print("Warning: MediaPipe not installed. Hand detection will not work.")
+            return self
+
+        with timer.measure("mediapipe init"):
+            self.mp_hands = mp.solutions.hands
+            self.mp_draw = mp.solutions.drawing_utils
+            self.hands = self.create_hands()
+            # ROI crops change size and position from frame to frame; a separate
+            # instance keeps them out of the full-frame instance's tracking state
+            if self.roi_tracker.enabled:
+                self.roi_hands = self.create_hands()
+        return self
+
+    def create_hands(self):
+        """A MediaPipe Hands instance in video (tracking) mode"""
+        return self.mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=self.max_hands,
+            min_detection_confidence=config.HAND_DETECTION_CONFIDENCE,
+            min_tracking_confidence=config.HAND_TRACKING_CONFIDENCE
+        )
+
+    def close(self):
+        """Release the hand detectors"""
+        for hands in (self.hands, self.roi_hands):
+            if hands:
+                hands.close()
+        self.hands = self.roi_hands = None
+
+    def subscribe(self, callback):
+        """Call `callback(event)` for every processed frame"""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop calling `callback`"""
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def run(self, frames):
+        """
+        Process an iterable of BGR frames
+
+        Args:
+            frames: Iterable of frames (e.g. read from a camera or video file)
+
+        Yields:
+            RecognitionEvent for every frame
+        """
+        for frame in frames:
+            event, _ = self.update(frame)
+            yield event
+
+    def update(self, frame):
+        """
+        Process one frame: detect, classify, smooth and assemble text
+
+        Args:
+            frame: BGR frame (annotated in place with landmarks and bounding box)
+
+        Returns:
+            (RecognitionEvent, annotated_frame) tuple
+        """
+        frame_start = time.perf_counter()
+        processed_frame, prediction, confidence = self.process_frame(frame)
+        self.scheduler.record_frame_time(time.perf_counter() - frame_start)
+
+        # Each hand has its own decoder, which decides when its letter is decisive enough.
+        # Only fresh classifications are fed: between classifications (cadence) the
+        # reused probabilities would count the same observation several times.
+        hands = []
+        seen = set()
+        with self.timings.measure('smoothing'):
+            for key, hand, bbox, letter, hand_confidence in self.frame_hands:
+                seen.add(key)
+                decoder = self.decoder_for(key)
+                if key in self.classified_keys:
+                    committed = decoder.update(self.hand_probabilities[key])
+                else:
+                    committed = decoder.update(None) if letter is None else None
+                label = self.label_for(committed) if committed is not None else None
+                delta = self.commit_prediction(label) if label is not None else ''
+                if not delta:
+                    label = None  # 'nothing' is never committed
+                hands.append(HandResult(hand, letter, hand_confidence, delta, bbox, label))
+            # Hands that left the frame
+            for key, decoder in self.hand_decoders.items():
+                if key not in seen:
+                    decoder.update(None)
+
+        delta = ''.join(h.committed_text_delta for h in hands)
+        event = RecognitionEvent(self.frame_index, prediction, float(confidence), delta, tuple(hands))
+        self.frame_index += 1
+        for callback in self.subscribers:
+            callback(event)
+        return event, processed_frame
+
+    def decoder_for(self, key):
+        """Temporal decoder of one hand (the first hand uses `self.decoder`)"""
+        decoder = self.hand_decoders.get(key)
+        if decoder is None:
+            if self.hand_decoders:
+                decoder = copy.deepcopy(self.decoder)
+                decoder.reset()
+            else:
+                decoder = self.decoder
+            self.hand_decoders[key] = decoder
+        return decoder
+
+    def commit_prediction(self, prediction):
+        """
+        Apply a stable prediction to the text (Space/Delete/Nothing semantics)
+
+        Labels are matched case-insensitively and through dataset.LABEL_ALIASES,
+        so the dataset's folder names ('space', 'del', 'nothing') work as well.
+
+        Returns:
+            Text delta: ' ' for Space, DELETE for Delete/Del, '' for Nothing
+            (the text is left alone), otherwise the letter
+        """
+        name = LABEL_ALIASES.get(prediction.lower(), prediction).lower()
+        if name == 'nothing':
+            return ''
+        if name == 'space':
+            delta = " "
+        elif name == 'delete':
+            delta = DELETE
+        else:
+            delta = prediction
+        with self.text_lock:
+            self.text = apply_text_delta(self.text, delta)
+        return delta
+
+    def clear_text(self):
+        """Empty the assembled text (safe to call from another thread)"""
+        with self.text_lock:
+            self.text = ""
+
+    def process_frame(self, frame):
+        """
+        Process a single frame for hand detection and classification
+
+        All hands found in the frame are classified together in one forward pass.
+        Per-hand results are left in `self.frame_hands` as
+        (key, handedness, bbox, letter, confidence) tuples, ordered left to right.
+
+        Returns:
+            (annotated_frame, prediction, confidence) of the most confident hand
+        """
+        h, w, _ = frame.shape
+        prediction = None
+        confidence = 0.0
+        self.frame_hands = []
+        self.classified_keys = set()
+
+        # Detect hands using MediaPipe
+        if self.hands:
+            # Full-frame searches also run while fewer than max_hands hands are tracked
+            on_roi = self.roi_tracker.use_roi(self.max_hands) and self.roi_hands is not None
+            with self.timings.measure('color_convert'):
+                image, region = self.roi_tracker.roi_image(frame) if on_roi else self.roi_tracker.full_frame(frame)
+            with self.timings.measure('hand_detection'):
+                results = (self.roi_hands if on_roi else self.hands).process(image)
+
+            if on_roi and not results.multi_hand_landmarks:
+                # Tracking lost: search the whole frame again
+                self.roi_tracker.reset()
+                with self.timings.measure('color_convert'):
+                    image, region = self.roi_tracker.full_frame(frame)
+                with self.timings.measure('hand_detection'):
+                    results = self.hands.process(image)
+
+            if results.multi_hand_landmarks:
+                RoiTracker.to_frame_coordinates(results.multi_hand_landmarks, image.shape,
+                                                region, frame.shape)
+                detected = []
+                for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+                    # Draw hand landmarks
+                    if self.annotate:
+                        with self.timings.measure('landmark_drawing'):
+                            self.mp_draw.draw_landmarks(
+                                frame,
+                                hand_landmarks,
+                                self.mp_hands.HAND_CONNECTIONS,
+                                self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
+                                self.mp_draw.DrawingSpec(color=(255, 0, 0), thickness=2)
+                            )
+
+                    # Get bounding box
+                    x_coords = [lm.x for lm in hand_landmarks.landmark]
+                    y_coords = [lm.y for lm in hand_landmarks.landmark]
+
+                    x_min, x_max = int(min(x_coords) * w), int(max(x_coords) * w)
+                    y_min, y_max = int(min(y_coords) * h), int(max(y_coords) * h)
+
+                    # Add padding
+                    padding = 30
+                    x_min = max(0, x_min - padding)
+                    y_min = max(0, y_min - padding)
+                    x_max = min(w, x_max + padding)
+                    y_max = min(h, y_max + padding)
+
+                    # Draw bounding box
+                    if self.annotate:
+                        cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (255, 165, 0), 2)
+
+                    detected.append((handedness_label(results, i), (x_min, y_min, x_max, y_max),
+                                     hand_landmarks))
+
+                boxes = [bbox for _, bbox, _ in detected]
+                detected.sort(key=lambda d: d[1][0])
+                keys = self.hand_keys([hand for hand, _, _ in detected])
+                self.classify_frame_hands(frame, keys, detected)
+
+                for key, (hand, bbox, _) in zip(keys, detected):
+                    if self.max_hands > 1:
+                        hand = key
+                    probs = self.hand_probabilities.get(key)
+                    letter, hand_confidence = None, 0.0
+                    if probs is not None:
+                        class_idx = int(np.argmax(probs))
+                        letter, hand_confidence = self.label_for(class_idx), float(probs[class_idx])
+                        if hand_confidence > confidence or prediction is None:
+                            prediction, confidence = letter, hand_confidence
+                    self.frame_hands.append((key, hand, bbox, letter, hand_confidence))
+
+                    # Tell the hands apart on screen
+                    if self.annotate and self.max_hands > 1:
+                        cv2.putText(frame, f"{hand}: {letter or '-'}", (bbox[0], max(15, bbox[1] - 8)),
+                                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 165, 0), 2)
+                self.last_classification = (prediction, confidence)
+
+                # The next frame searches around these boxes
+                self.roi_tracker.update(boxes, frame.shape)
+            else:
+                # Hand lost: classify immediately when it comes back
+                self.scheduler.reset()
+                self.roi_tracker.reset()
+                self.hand_probabilities.clear()
+
+        # Add instructions on frame
+        if self.annotate:
+            cv2.putText(frame, "Show hand sign to camera", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+        return frame, prediction, confidence
+
+    def hand_keys(self, handedness):
+        """
+        Keys identifying each hand's smoothing state from frame to frame
+
+        With a single hand the key is constant, so a flip of MediaPipe's
+        handedness guess does not restart smoothing. With several hands the key
+        is the handedness, numbered left to right when it occurs more than once
+        (e.g. two right hands of two users: 'Right', 'Right 2').
+        """
+        if self.max_hands == 1:
+            return ['hand'] * len(handedness)
+        keys = []
+        for hand in handedness:
+            count = sum(1 for other in keys if other.split(' ')[0] == hand)
+            keys.append(hand if count == 0 else f"{hand} {count + 1}")
+        return keys
+
+    def classify_frame_hands(self, frame, keys, detected):
+        """
+        Classify all hands of a frame in one batch, or reuse their last probabilities
+
+        Args:
+            frame: BGR frame the hands were detected in
+            keys: Hand keys (see hand_keys)
+            detected: (handedness, bbox, hand_landmarks) per hand, in the order of `keys`
+        """
+        if not (self.landmark_classifier or self.inference_engine):
+            return
+        landmarks = np.concatenate([AdaptiveScheduler.landmarks_to_array(lms) for _, _, lms in detected])
+        new_hand = any(key not in self.hand_probabilities for key in keys)
+        if not (self.scheduler.should_classify(landmarks) or new_hand):
+            return
+
+        if self.landmark_classifier:
+            aspect_ratio = frame.shape[1] / frame.shape[0]
+            vectors = [normalize_landmarks(lms, aspect_ratio) for _, _, lms in detected]
+            probs = self.predict_cached(vectors, keys, self.classify_landmark_batch,
+                                        lambda v: landmark_key(v, config.LANDMARK_CACHE_STEP))
+            classified = keys
+        else:
+            crops = [frame[y_min:y_max, x_min:x_max] for _, (x_min, y_min, x_max, y_max), _ in detected]
+            classified = [key for key, crop in zip(keys, crops) if crop.size > 0]
+            crops = [crop for crop in crops if crop.size > 0]
+            probs = self.predict_cached(crops, classified, self.classify_crops,
+                                        lambda c: crop_key(c, config.PREDICTION_CACHE_HASH_SIZE,
+                                                           config.PREDICTION_CACHE_SIZE_STEP)) if crops else None
+
+        self.hand_probabilities = {key: self.hand_probabilities[key] for key in keys
+                                   if key in self.hand_probabilities}
+        if probs is not None:
+            self.hand_probabilities.update(zip(classified, probs))
+            self.classified_keys = set(classified)
+            self.last_probabilities = probs[0]
+        else:
+            for key in classified:
+                self.hand_probabilities.pop(key, None)
+        self.scheduler.mark_classified(landmarks)
+
+    def predict_cached(self, inputs, hand_keys, classify, cache_key):
+        """
+        Class probabilities for a batch of inputs, classifying only the cache misses
+
+        Args:
+            inputs: Hand crops or landmark vectors
+            hand_keys: Hand key of each input (part of the cache key, so one hand
+                never receives another hand's probabilities)
+            classify: Batch classifier returning (len(inputs), num_classes) or None
+            cache_key: Function mapping one input to its cache key
+
+        Returns:
+            Array of shape (len(inputs), num_classes), or None on error
+        """
+        if self.prediction_cache is None:
+            return classify(inputs)
+
+        with self.timings.measure('cache_lookup'):
+            cache_keys = [(hand, cache_key(item)) for hand, item in zip(hand_keys, inputs)]
+            probs = [self.prediction_cache.get(key) for key in cache_keys]
+        missing = [i for i, p in enumerate(probs) if p is None]
+        if missing:
+            fresh = classify([inputs[i] for i in missing])
+            if fresh is None:
+                return None
+            for i, p in zip(missing, fresh):
+                probs[i] = p
+                self.prediction_cache.put(cache_keys[i], p)
+        return np.stack(probs)
+
+    def classify_crops(self, crops):
+        """
+        Classify several hand crops with one forward pass
+
+        Returns:
+            Array of shape (len(crops), num_classes), or None on error
+        """
+        try:
+            # Resize, BGR->RGB and scale straight into the reused input tensor
+            with self.timings.measure('crop_resize'):
+                batch = self.preprocessor.batch(crops)
+
+            # Predict
+            with self.timings.measure('inference'):
+                return self.inference_engine.predict(batch)
+        except Exception as e:
+            print(f"Classification error: {e}")
+            return None
+
+    def classify_landmark_batch(self, vectors):
+        """
+        Classify several hands from their normalized landmark vectors
+
+        Returns:
+            Array of shape (len(vectors), num_classes), or None on error
+        """
+        try:
+            with self.timings.measure('inference'):
+                return self.landmark_classifier.predict_proba(np.stack(vectors))
+        except Exception as e:
+            print(f"Classification error: {e}")
+            return None
+
+    def classify_hand(self, hand_img):
+        """Classify the hand sign using the model"""
+        predictions = self.classify_crops([hand_img])
+        if predictions is None:
+            return None, 0.0
+        self.last_probabilities = predictions[0]
+        class_idx = int(np.argmax(predictions[0]))
+        return self.label_for(class_idx), float(predictions[0][class_idx])
+
+    def classify_landmarks(self, hand_landmarks, aspect_ratio=1.0):
+        """Classify the hand sign from its MediaPipe landmarks (aspect_ratio: frame width / height)"""
+        probs = self.classify_landmark_batch([normalize_landmarks(hand_landmarks, aspect_ratio)])
+        if probs is None:
+            return None, 0.0
+        self.last_probabilities = probs[0]
+        class_idx = int(np.argmax(probs[0]))
+        return self.label_for(class_idx), float(probs[0][class_idx])
+
+
+def handedness_label(results, index):
+    """MediaPipe's 'Left'/'Right' guess for the hand at `index` ('Hand' if unavailable)"""
+    handedness = getattr(results, 'multi_handedness', None)
+    if handedness and index < len(handedness):
+        return handedness[index].classification[0].label
+    return 'Hand'
+
+
+def apply_text_delta(text, delta):
+    """Apply a committed text delta (see RecognitionEngine.commit_prediction) to a string"""
+    for char in delta:
+        text = text[:-1] if char == DELETE else text + char
+    return text
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Recognition Service for Sign Language Detection
+Asyncio server accepting JPEG or raw frames over WebSocket or a chunked HTTP
+upload and streaming back one JSON recognition event per processed frame
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import cv2
+import numpy as np
+
+import config
+from model_wrapper import SignLanguageModel
+from multi_stream_server import HEADER, MicroBatcher
+from preprocessing import Preprocessor, resolve_normalization
+from recognition_engine import RecognitionEngine
+from runtime_config import ConfigError, load_cli_config
+
+WEBSOCKET_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+OP_CONTINUATION, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+
+# Largest accepted frame or WebSocket message
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+# ============================================================================
+# WebSocket framing (RFC 6455) - shared with the load generator
+# ============================================================================
+
+def websocket_accept(key):
+    """Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key"""
+    return base64.b64encode(hashlib.sha1(key.encode('ascii') + WEBSOCKET_GUID).digest()).decode('ascii')
+
+
+def apply_mask(payload, mask):
+    """XOR a payload with a 4-byte WebSocket mask"""
+    data = np.frombuffer(payload, dtype=np.uint8)
+    return (data ^ np.resize(np.frombuffer(mask, dtype=np.uint8), len(data))).tobytes()
+
+
+async def read_websocket_frame(reader):
+    """
+    Read one WebSocket frame
+
+    Returns:
+        (fin, opcode, payload) tuple
+    """
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('>H', await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack('>Q', await reader.readexactly(8))[0]
+    if length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"WebSocket frame too large: {length} bytes")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = apply_mask(payload, mask)
+    return bool(first & 0x80), first & 0x0F, payload
+
+
+def websocket_frame(payload, opcode=OP_BINARY, mask=False):
+    """Encode one unfragmented WebSocket frame (clients must mask, servers must not)"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('>BB', 0x80 | opcode, length | (0x80 if mask else 0))
+    elif length < 1 << 16:
+        header = struct.pack('>BBH', 0x80 | opcode, 126 | (0x80 if mask else 0), length)
+    else:
+        header = struct.pack('>BBQ', 0x80 | opcode, 127 | (0x80 if mask else 0), length)
+    if mask:
+        key = os.urandom(4)
+        return header + key + apply_mask(payload, key)
+    return header + payload
+
+
+async def websocket_messages(reader, writer, mask=False, echo_close=True):
+    """
+    Yield complete data messages, answering pings and stopping at a close frame
+
+    Args:
+        echo_close: Answer a close frame right away (False when the caller still
+                    has messages to send and closes the connection itself)
+
+    Yields:
+        (opcode, payload) of every text or binary message
+    """
+    parts, message_opcode = [], None
+    while True:
+        try:
+            fin, opcode, payload = await read_websocket_frame(reader)
+        except asyncio.IncompleteReadError:
+            return
+        if opcode == OP_CLOSE:
+            if echo_close:
+                writer.write(websocket_frame(payload[:2], OP_CLOSE, mask))
+            return
+        if opcode == OP_PING:
+            writer.write(websocket_frame(payload, OP_PONG, mask))
+            continue
+        if opcode == OP_PONG:
+            continue
+        if opcode != OP_CONTINUATION:
+            message_opcode = opcode
+        parts.append(payload)
+        if fin:
+            yield message_opcode, b''.join(parts)
+            parts = []
+
+
+# ============================================================================
+# HTTP helpers
+# ============================================================================
+
+async def read_http_head(reader):
+    """
+    Read an HTTP request or response head
+
+    Returns:
+        (start_line, {lower-case header: value}) or None if the peer closed
+    """
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        return None
+    lines = head.decode('latin-1').split('\r\n')
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(':')
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers
+
+
+async def http_body(reader, headers):
+    """Yield the pieces of an HTTP body (chunked or with a Content-Length)"""
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            if size == 0:
+                await reader.readuntil(b'\r\n')
+                return
+            chunk = await reader.readexactly(size)
+            await reader.readexactly(2)
+            yield chunk
+    else:
+        remaining = int(headers.get('content-length', 0))
+        while remaining > 0:
+            chunk = await reader.read(min(remaining, 65536))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def length_prefixed(chunks):
+    """Split a byte stream into length-prefixed messages (see multi_stream_server.HEADER)"""
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        while len(buffer) >= HEADER.size:
+            size = HEADER.unpack_from(buffer)[0]
+            if size > MAX_MESSAGE_BYTES:
+                raise ValueError(f"Frame too large: {size} bytes")
+            if len(buffer) < HEADER.size + size:
+                break
+            yield bytes(buffer[HEADER.size:HEADER.size + size])
+            del buffer[:HEADER.size + size]
+
+
+def http_chunk(data):
+    """Encode bytes as one HTTP/1.1 chunk"""
+    return f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n"
+
+
+def http_response(status, body=b'', content_type='application/json', headers=None):
+    """Complete HTTP response with a body"""
+    lines = [f"HTTP/1.1 {status}", f"Content-Type: {content_type}", f"Content-Length: {len(body)}",
+             "Connection: close"] + [f"{name}: {value}" for name, value in (headers or {}).items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
+
+
+# ============================================================================
+# Sessions: per-connection recognition state
+# ============================================================================
+
+class StreamParams:
+    """Per-connection options from the query string"""
+
+    def __init__(self, query):
+        """
+        Args:
+            query: Parsed query string, e.g. mode=frame&format=raw&width=640&height=480
+        """
+        def value(name, default):
+            return query.get(name, [default])[0]
+
+        self.mode = value('mode', 'frame')      # 'frame' (hand detection) or 'crop' (classify as is)
+        self.format = value('format', 'jpeg')   # 'jpeg' or 'raw' (BGR24)
+        self.width = int(value('width', 0))
+        self.height = int(value('height', 0))
+        self.flip = value('flip', '0') == '1'
+        if self.mode not in ('frame', 'crop'):
+            raise ValueError(f"Unknown mode: {self.mode}")
+        if self.format not in ('jpeg', 'raw'):
+            raise ValueError(f"Unknown format: {self.format}")
+        if self.format == 'raw' and (self.width <= 0 or self.height <= 0):
+            raise ValueError("format=raw needs width and height")
+
+    def decode(self, payload):
+        """Turn a received message into a BGR image (None if it cannot be decoded)"""
+        if self.format == 'raw':
+            if len(payload) != self.width * self.height * 3:
+                return None
+            return np.frombuffer(payload, dtype=np.uint8).reshape(self.height, self.width, 3)
+        return cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+class FrameSession:
+    """Full frames: own MediaPipe tracker and smoothing, model shared through the batcher"""
+
+    def __init__(self, service, params):
+        self.params = params
+        self.recognizer = RecognitionEngine(model_path=None, classifier_mode='cnn',
+                                            class_labels=service.model.class_labels, annotate=False)
+        # The model was loaded once by the service; a session only needs hand detection
+        self.recognizer.load_hands()
+        self.recognizer.inference_engine = service.batcher
+        self.recognizer.preprocessor = service.create_preprocessor(self.recognizer.max_hands)
+
+    def process(self, image):
+        if self.params.flip:
+            image = cv2.flip(image, 1)
+        event, _ = self.recognizer.update(image)
+        result = event._asdict()
+        result['hands'] = [hand._asdict() for hand in event.hands]
+        return result
+
+    def close(self):
+        self.recognizer.close()
+
+
+class CropSession:
+    """Hand crops: classified as they are, without hand detection or smoothing"""
+
+    def __init__(self, service, params):
+        self.service = service
+        self.preprocessor = service.create_preprocessor()
+        self.frame_index = 0
+
+    def process(self, image):
+        probs = self.service.batcher.predict(self.preprocessor(image))[0]
+        class_idx = int(np.argmax(probs))
+        result = {'frame_index': self.frame_index, 'letter': self.service.label_for(class_idx),
+                  'confidence': float(probs[class_idx])}
+        self.frame_index += 1
+        return result
+
+    def close(self):
+        pass
+
+
+# ============================================================================
+# Service
+# ============================================================================
+
+class RecognitionService:
+    """Serves recognition over WebSocket and chunked HTTP from one SignLanguageModel"""
+
+    def __init__(self, model, workers=2, queue_size=2, policy='drop', max_batch_size=32, max_wait_ms=5.0):
+        """
+        Initialize the service
+
+        Args:
+            model: Loaded SignLanguageModel (shared by all connections)
+            workers: Executor threads running decoding, hand detection and classification
+            queue_size: Frames buffered per connection while it waits for a worker
+            policy: 'drop' - a full queue discards its oldest frame (clients always get
+                    the freshest result); 'block' - stop reading from the client until
+                    there is room (TCP backpressure, no frame is lost)
+            max_batch_size: Largest micro-batch across connections
+            max_wait_ms: Maximum time a crop waits for a batch to fill
+        """
+        if policy not in ('drop', 'block'):
+            raise ValueError(f"Unknown policy: {policy}")
+        self.model = model
+        self.normalization = resolve_normalization(model.model_path, model.model, model.engine)
+        self.batcher = MicroBatcher(model.engine, max_batch_size, max_wait_ms)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='recognition')
+        self.queue_size = max(1, queue_size)
+        self.policy = policy
+        self._slots = None  # asyncio.Semaphore bounding executor jobs, created in the loop
+        self.workers = workers
+
+        self.connections = 0
+        self.frames_received = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+
+    def create_preprocessor(self, max_batch_size=1):
+        """Preprocessor with its own input buffer and the model's normalization"""
+        img_size = getattr(self.model.engine, 'img_size', self.model.img_size)
+        return Preprocessor(img_size, max_batch_size=max_batch_size, **self.normalization)
+
+    def label_for(self, class_idx):
+        """Map a class index to the model's label"""
+        labels = self.model.class_labels
+        return labels[class_idx] if class_idx < len(labels) else f"Unknown_{class_idx}"
+
+    def stats(self):
+        """Connection, frame and batching counters"""
+        return {
+            'connections': self.connections,
+            'frames_received': self.frames_received,
+            'frames_processed': self.frames_processed,
+            'frames_dropped': self.frames_dropped,
+            'policy': self.policy,
+            'workers': self.workers,
+            'model': self.batcher.stats()
+        }
+
+    async def start(self, host, port):
+        """Start listening; returns the asyncio server"""
+        self._slots = asyncio.Semaphore(self.workers)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_MESSAGE_BYTES)
+
+    async def run_in_executor(self, func, *args):
+        """Run blocking work on the bounded executor, never on the event loop"""
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def handle_connection(self, reader, writer):
+        """Route an HTTP request: WebSocket upgrade, chunked upload, stats or health"""
+        try:
+            head = await read_http_head(reader)
+            if head is None:
+                return
+            start_line, headers = head
+            method, target = start_line.split(' ')[:2]
+            url = urlsplit(target)
+            try:
+                params = StreamParams(parse_qs(url.query))
+            except ValueError as e:
+                writer.write(http_response("400 Bad Request", json.dumps({'error': str(e)}).encode()))
+                return
+
+            if url.path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                await self.serve_websocket(reader, writer, headers, params)
+            elif url.path == '/recognize' and method == 'POST':
+                await self.serve_http_stream(reader, writer, headers, params)
+            elif url.path == '/stats':
+                writer.write(http_response("200 OK", json.dumps(self.stats()).encode()))
+            elif url.path == '/health':
+                writer.write(http_response("200 OK", b'{"status": "ok"}'))
+            else:
+                writer.write(http_response("404 Not Found", b'{"error": "not found"}'))
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            print(f"⚠️  Connection error: {e}")
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve_websocket(self, reader, writer, headers, params):
+        """Binary messages are frames; every event goes back as a text message"""
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {websocket_accept(headers['sec-websocket-key'])}\r\n\r\n")
+                     .encode('latin-1'))
+        await writer.drain()
+
+        async def frames():
+            async for opcode, payload in websocket_messages(reader, writer, echo_close=False):
+                if opcode == OP_BINARY:
+                    yield payload
+
+        async def send(event):
+            writer.write(websocket_frame(json.dumps(event).encode('utf-8'), OP_TEXT))
+            await writer.drain()
+
+        await self.serve_stream(params, frames(), send)
+        writer.write(websocket_frame(struct.pack('>H', 1000), OP_CLOSE))
+
+    async def serve_http_stream(self, reader, writer, headers, params):
+        """The request body is length-prefixed frames; the response is chunked JSON lines"""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+
+        async def send(event):
+            writer.write(http_chunk(json.dumps(event).encode('utf-8') + b"\n"))
+            await writer.drain()
+
+        await self.serve_stream(params, length_prefixed(http_body(reader, headers)), send)
+        writer.write(http_chunk(b''))
+
+    async def serve_stream(self, params, frames, send):
+        """
+        Recognize a stream of encoded frames, sending one event per processed frame
+
+        A reader task fills a small per-connection queue while a processor task
+        runs each frame on the executor. When processing or the client's
+        connection is slower than the incoming frames, the queue fills up and
+        the policy decides: drop the oldest frame or stop reading.
+        """
+        session_type = FrameSession if params.mode == 'frame' else CropSession
+        session = await self.run_in_executor(session_type, self, params)
+        frame_queue = asyncio.Queue(maxsize=self.queue_size)
+        dropped = 0
+        self.connections += 1
+
+        async def receive():
+            nonlocal dropped
+            seq = 0
+            try:
+                async for payload in frames:
+                    self.frames_received += 1
+                    item = (seq, payload, time.perf_counter())
+                    seq += 1
+                    if self.policy == 'drop' and frame_queue.full():
+                        frame_queue.get_nowait()
+                        dropped += 1
+                        self.frames_dropped += 1
+                    await frame_queue.put(item)
+            finally:
+                await frame_queue.put(None)
+
+        def process(payload):
+            image = params.decode(payload)
+            return session.process(image) if image is not None else None
+
+        receiver = asyncio.ensure_future(receive())
+        try:
+            while True:
+                item = await frame_queue.get()
+                if item is None:
+                    break
+                seq, payload, received = item
+                event = await self.run_in_executor(process, payload)
+                if event is None:
+                    continue
+                self.frames_processed += 1
+                event.update(seq=seq, dropped=dropped,
+                             server_ms=(time.perf_counter() - received) * 1000.0)
+                await send(event)
+        finally:
+            receiver.cancel()
+            self.connections -= 1
+            await self.run_in_executor(session.close)
+
+
+async def serve(service, host, port, report_every=10.0):
+    """Run the service until cancelled, printing stats periodically"""
+    server = await service.start(host, port)
+    print(f"✓ Recognition service on ws://{host}:{port}/ws and http://{host}:{port}/recognize "
+          f"({service.workers} workers, policy '{service.policy}')")
+    async with server:
+        while True:
+            await asyncio.sleep(report_every)
+            s = service.stats()
+            print(f"connections {s['connections']}  received {s['frames_received']}  "
+                  f"processed {s['frames_processed']}  dropped {s['frames_dropped']}  "
+                  f"model {s['model']['images_per_sec']:.1f} images/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve sign recognition over WebSocket and HTTP")
+    parser.add_argument('--model', help="Model path (.h5, .keras or .tflite, default: MODEL_PATH)")
+    parser.add_argument('--host', help="Address to listen on (default: SERVICE_HOST)")
+    parser.add_argument('--port', type=int, help="Port to listen on (default: SERVICE_PORT)")
+    parser.add_argument('--workers', type=int,
+                        help="Executor threads, bounds concurrent frames (default: SERVICE_WORKERS)")
+    parser.add_argument('--queue-size', type=int,
+                        help="Frames buffered per connection (default: SERVICE_QUEUE_SIZE)")
+    parser.add_argument('--policy', choices=['drop', 'block'],
+                        help="Full queue: drop the oldest frame or apply backpressure (default: SERVICE_POLICY)")
+    parser.add_argument('--max-batch', type=int, help="Largest micro-batch (default: MAX_BATCH_SIZE)")
+    parser.add_argument('--max-wait-ms', type=float,
+                        help="Maximum time a crop waits for a batch to fill (default: MAX_BATCH_WAIT_MS)")
+    parser.add_argument('--report-every', type=float, default=10.0, help="Seconds between stats lines")
+    args = parser.parse_args()
+
+    # config.py, the model's metadata and SIGN_* overrides (explicit options still win)
+    if load_cli_config(args, {'host': 'SERVICE_HOST', 'port': 'SERVICE_PORT', 'workers': 'SERVICE_WORKERS',
+                              'queue_size': 'SERVICE_QUEUE_SIZE', 'policy': 'SERVICE_POLICY',
+                              'max_batch': 'MAX_BATCH_SIZE', 'max_wait_ms': 'MAX_BATCH_WAIT_MS'}) is None:
+        return 1
+
+    if not os.path.exists(args.model):
+        print(f"❌ Model file not found: {args.model}")
+        return 1
+
+    try:
+        model = SignLanguageModel(args.model, img_size=config.IMG_SIZE, class_labels=config.CLASS_LABELS,
+                                  max_batch_size=args.max_batch, num_threads=config.TFLITE_NUM_THREADS)
+    except ConfigError as e:
+        print(f"❌ {e}")
+        return 1
+    service = RecognitionService(model, args.workers, args.queue_size, args.policy,
+                                 args.max_batch, args.max_wait_ms)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.report_every))
+    except KeyboardInterrupt:
+        print(f"\n{json.dumps(service.stats(), indent=2)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
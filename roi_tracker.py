@@ -0,0 +1,166 @@
+"""
+Region-of-Interest Tracker for Sign Language Detection
+Runs hand detection on the area around the last hand instead of the full frame
+"""
+
+import cv2
+
+
+class RoiTracker:
+    """Crops the next detection to the previous hand box, grown by a motion margin"""
+
+    def __init__(self, enabled=True, margin=0.5, detection_scale=1.0, max_roi_fraction=0.6,
+                 redetect_interval=10):
+        """
+        Initialize the tracker
+
+        Args:
+            enabled: If False, every frame uses full-frame detection
+            margin: Space added around the last hand box, as a fraction of its size
+            detection_scale: Scale of the frame used for full-frame detection
+                (1.0 = full resolution, 0.5 = half width and height)
+            max_roi_fraction: Use the full frame when the ROI would cover more than
+                this fraction of its area (cropping would save little)
+            redetect_interval: While fewer hands than wanted are tracked, search the
+                full frame every this many frames so a new hand is found
+        """
+        self.enabled = enabled
+        self.margin = margin
+        self.detection_scale = detection_scale
+        self.max_roi_fraction = max_roi_fraction
+        self.redetect_interval = max(1, redetect_interval)
+
+        self.roi_detections = 0
+        self.full_detections = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the tracked hand (the next frame uses full-frame detection)"""
+        self.roi = None
+        self.last_center = None
+        self.velocity = (0.0, 0.0)
+        self.hand_count = 0
+        self.frames_since_full = 0
+
+    @property
+    def tracking(self):
+        """True if the next detection runs on a region of interest"""
+        return self.enabled and self.roi is not None
+
+    def use_roi(self, max_hands=1):
+        """
+        True if the next detection should run on the region of interest
+
+        With all `max_hands` hands tracked the ROI is always used. With fewer, a
+        full-frame search runs every `redetect_interval` frames, because a hand
+        entering elsewhere cannot be seen in the ROI.
+        """
+        if not self.tracking:
+            return False
+        return self.hand_count >= max_hands or self.frames_since_full < self.redetect_interval
+
+    def region(self, frame, max_hands=1):
+        """
+        Cut out the image hand detection should run on
+
+        Args:
+            frame: Full BGR frame
+            max_hands: Number of hands detection looks for (see use_roi)
+
+        Returns:
+            (rgb_image, region) tuple; region is (x0, y0, scale) mapping image pixels
+            back to the frame (frame_x = x0 + image_x / scale), or None for the full frame
+        """
+        if self.use_roi(max_hands):
+            return self.roi_image(frame)
+        return self.full_frame(frame)
+
+    def roi_image(self, frame):
+        """Detection input cut to the region of interest (call only while tracking)"""
+        x0, y0, x1, y1 = self.roi
+        self.roi_detections += 1
+        self.frames_since_full += 1
+        return cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2RGB), (x0, y0, 1.0)
+
+    def full_frame(self, frame):
+        """Full-frame detection input, downscaled by detection_scale"""
+        self.full_detections += 1
+        self.frames_since_full = 0
+        scale = self.detection_scale
+        if scale and scale != 1.0:
+            h, w = frame.shape[:2]
+            small = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))),
+                               interpolation=cv2.INTER_AREA)
+            return cv2.cvtColor(small, cv2.COLOR_BGR2RGB), (0, 0, scale)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), None
+
+    @staticmethod
+    def to_frame_coordinates(multi_hand_landmarks, image_shape, region, frame_shape):
+        """
+        Rewrite landmarks detected on a region image into full-frame normalized units (in place)
+
+        Args:
+            multi_hand_landmarks: MediaPipe results.multi_hand_landmarks
+            image_shape: Shape of the image passed to MediaPipe
+            region: Region returned by region()/full_frame()
+            frame_shape: Shape of the full frame
+        """
+        if region is None:
+            return
+        x0, y0, scale = region
+        ih, iw = image_shape[:2]
+        fh, fw = frame_shape[:2]
+        sx, sy = iw / scale / fw, ih / scale / fh
+        ox, oy = x0 / fw, y0 / fh
+        for hand_landmarks in multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+                lm.z = lm.z * sx
+
+    def update(self, boxes, frame_shape):
+        """
+        Track the hands found on this frame
+
+        Args:
+            boxes: List of (x_min, y_min, x_max, y_max) hand boxes in frame pixels
+                (empty when no hand was found)
+            frame_shape: Shape of the full frame
+        """
+        if not boxes:
+            self.reset()
+            return
+
+        self.hand_count = len(boxes)
+        h, w = frame_shape[:2]
+        x_min = min(b[0] for b in boxes)
+        y_min = min(b[1] for b in boxes)
+        x_max = max(b[2] for b in boxes)
+        y_max = max(b[3] for b in boxes)
+
+        # Hand velocity (pixels per frame) widens and shifts the next search area
+        center = ((x_min + x_max) / 2.0, (y_min + y_max) / 2.0)
+        if self.last_center is not None:
+            self.velocity = (center[0] - self.last_center[0], center[1] - self.last_center[1])
+        self.last_center = center
+        vx, vy = self.velocity
+
+        grow = self.margin * max(x_max - x_min, y_max - y_min)
+        x0 = int(max(0, x_min - grow - abs(vx) + min(vx, 0)))
+        y0 = int(max(0, y_min - grow - abs(vy) + min(vy, 0)))
+        x1 = int(min(w, x_max + grow + abs(vx) + max(vx, 0)))
+        y1 = int(min(h, y_max + grow + abs(vy) + max(vy, 0)))
+
+        if x1 <= x0 or y1 <= y0 or (x1 - x0) * (y1 - y0) > self.max_roi_fraction * w * h:
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x1, y1)
+
+    def stats(self):
+        """How often detection ran on the ROI vs the full frame"""
+        total = self.roi_detections + self.full_detections
+        return {
+            'roi_detections': self.roi_detections,
+            'full_frame_detections': self.full_detections,
+            'roi_fraction': self.roi_detections / total if total else 0.0
+        }
@@ -0,0 +1,343 @@
+"""
+Runtime Configuration for Sign Language Detection
+Typed settings merged from config.py, the model's metadata (model_config.json)
+and SIGN_* environment variables, validated before and after the model loads
+"""
+
+import json
+import os
+import typing
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional
+
+import config
+from model_store import ARTIFACT_FORMATS
+from preprocessing import load_model_metadata
+from thread_settings import validate_affinity
+
+# Environment overrides: SIGN_<CONFIG NAME>, e.g. SIGN_CAMERA_WIDTH=1280
+ENV_PREFIX = 'SIGN_'
+
+# Model metadata entries that override config.py (model_config.json written at export)
+METADATA_KEYS = ('img_size', 'class_labels')
+
+
+class ConfigError(ValueError):
+    """Raised when settings are invalid or do not match the loaded model"""
+
+    def __init__(self, problems):
+        self.problems = list(problems)
+        super().__init__("Invalid configuration:\n  - " + "\n  - ".join(self.problems))
+
+    def __reduce__(self):
+        # Keep the problem list when the error crosses a process boundary (worker pools)
+        return type(self), (self.problems,)
+
+
+@dataclass
+class RuntimeConfig:
+    """Settings the components read at runtime; each field mirrors the upper-case name in config.py"""
+
+    model_path: str
+    img_size: int
+    class_labels: List[str]
+    classifier_mode: str
+    tflite_num_threads: Optional[int]
+    max_batch_size: int
+    max_batch_wait_ms: float
+    service_host: str
+    service_port: int
+    service_workers: int
+    service_queue_size: int
+    service_policy: str
+    model_host_authkey: str
+    model_host_slots: int
+    model_host_lease_timeout: Optional[float]
+    landmark_index_path: str
+    landmark_method: str
+    landmark_k: int
+    smoothing_method: str
+    stability_threshold: int
+    min_confidence: float
+    smoothing_alpha: float
+    vote_window: int
+    vote_min: int
+    release_confidence: float
+    hand_detection_confidence: float
+    hand_tracking_confidence: float
+    max_hands: int
+    roi_tracking: bool
+    roi_margin: float
+    roi_redetect_interval: int
+    detection_scale: float
+    camera_index: int
+    camera_width: int
+    camera_height: int
+    fps: int
+    display_fps: int
+    classify_every_n_frames: int
+    motion_threshold: float
+    adaptive_cadence: bool
+    max_classify_interval: int
+    prediction_cache_size: int
+    prediction_cache_ttl: float
+    prediction_cache_hash_size: int
+    prediction_cache_size_step: int
+    landmark_cache_step: float
+    window_width: int
+    window_height: int
+    output_dir: str
+    output_prefix: str
+    use_gpu: bool
+    tf_log_level: str
+    tf_intra_op_threads: Optional[int]
+    tf_inter_op_threads: Optional[int]
+    opencv_threads: Optional[int]
+    cpu_affinity: Optional[Dict[str, List[int]]]
+    enable_performance_stats: bool
+    debug_mode: bool
+    performance_hud: bool
+    metrics_jsonl_path: Optional[str]
+    metrics_port: Optional[int]
+    metrics_export_interval: float
+    model_store_dir: Optional[str]
+    model_store_format: str
+    model_host_address: Optional[str]
+
+    @classmethod
+    def from_sources(cls, module=config, model_path=None, environ=None):
+        """
+        Merge the settings sources (later ones win)
+
+        Args:
+            module: Settings module (config.py)
+            model_path: Model whose metadata is read (default: the module's MODEL_PATH
+                or its SIGN_MODEL_PATH override)
+            environ: Environment mapping (default: os.environ)
+
+        Returns:
+            RuntimeConfig (not yet validated)
+        """
+        environ = os.environ if environ is None else environ
+        values = {f.name: getattr(module, f.name.upper()) for f in fields(cls)}
+        overrides = {}
+        for f in fields(cls):
+            raw = environ.get(ENV_PREFIX + f.name.upper())
+            if raw is not None:
+                overrides[f.name] = parse_value(raw, f.type, f.name)
+
+        values['model_path'] = model_path or overrides.get('model_path', values['model_path'])
+        metadata = load_model_metadata(values['model_path'])
+        for key in METADATA_KEYS:
+            if metadata.get(key) is not None:
+                values[key] = metadata[key]
+        values.update((name, value) for name, value in overrides.items() if name != 'model_path')
+        return cls(**values)
+
+    def validate(self):
+        """Check value ranges and choices; raises ConfigError listing every problem"""
+        problems = []
+
+        def check(condition, message):
+            if not condition:
+                problems.append(message)
+
+        check(self.img_size > 0, f"IMG_SIZE must be positive (got {self.img_size})")
+        check(len(self.class_labels) > 0, "CLASS_LABELS is empty")
+        check(len(set(self.class_labels)) == len(self.class_labels), "CLASS_LABELS contains duplicates")
+        check(self.classifier_mode in ('cnn', 'landmark'),
+              f"CLASSIFIER_MODE must be 'cnn' or 'landmark' (got {self.classifier_mode!r})")
+        check(self.smoothing_method in ('temporal', 'stability'),
+              f"SMOOTHING_METHOD must be 'temporal' or 'stability' (got {self.smoothing_method!r})")
+        check(self.tflite_num_threads is None or self.tflite_num_threads > 0,
+              f"TFLITE_NUM_THREADS must be None or positive (got {self.tflite_num_threads})")
+        check(self.max_batch_size > 0, f"MAX_BATCH_SIZE must be positive (got {self.max_batch_size})")
+        check(self.max_batch_wait_ms >= 0, f"MAX_BATCH_WAIT_MS must be >= 0 (got {self.max_batch_wait_ms})")
+
+        check(bool(self.service_host), "SERVICE_HOST is empty")
+        check(0 < self.service_port <= 65535, f"SERVICE_PORT must be 1-65535 (got {self.service_port})")
+        check(self.service_policy in ('drop', 'block'),
+              f"SERVICE_POLICY must be 'drop' or 'block' (got {self.service_policy!r})")
+        check(bool(self.model_host_authkey), "MODEL_HOST_AUTHKEY is empty")
+        check(self.model_host_lease_timeout is None or self.model_host_lease_timeout > 0,
+              f"MODEL_HOST_LEASE_TIMEOUT must be None or positive (got {self.model_host_lease_timeout})")
+
+        check(self.landmark_method in ('knn', 'centroid'),
+              f"LANDMARK_METHOD must be 'knn' or 'centroid' (got {self.landmark_method!r})")
+        if self.classifier_mode == 'landmark':
+            check(bool(self.landmark_index_path) and os.path.exists(self.landmark_index_path),
+                  f"LANDMARK_INDEX_PATH {self.landmark_index_path!r} does not exist "
+                  "(build it with build_landmark_dataset.py)")
+
+        check(self.stability_threshold >= 0, f"STABILITY_THRESHOLD must be >= 0 (got {self.stability_threshold})")
+        for name in ('min_confidence', 'release_confidence', 'hand_detection_confidence', 'hand_tracking_confidence'):
+            value = getattr(self, name)
+            check(0.0 <= value <= 1.0, f"{name.upper()} must be between 0 and 1 (got {value})")
+        check(self.release_confidence <= self.min_confidence,
+              f"RELEASE_CONFIDENCE ({self.release_confidence}) must not exceed MIN_CONFIDENCE ({self.min_confidence})")
+        check(0.0 < self.smoothing_alpha <= 1.0, f"SMOOTHING_ALPHA must be in (0, 1] (got {self.smoothing_alpha})")
+        check(0 < self.vote_min <= self.vote_window,
+              f"VOTE_MIN must be between 1 and VOTE_WINDOW ({self.vote_window}) (got {self.vote_min})")
+
+        check(self.max_hands > 0, f"MAX_HANDS must be positive (got {self.max_hands})")
+        check(self.roi_margin >= 0, f"ROI_MARGIN must be >= 0 (got {self.roi_margin})")
+        check(0.0 < self.detection_scale <= 1.0, f"DETECTION_SCALE must be in (0, 1] (got {self.detection_scale})")
+        check(self.camera_index >= 0, f"CAMERA_INDEX must be >= 0 (got {self.camera_index})")
+        for name in ('camera_width', 'camera_height', 'fps', 'display_fps', 'window_width', 'window_height',
+                     'service_workers', 'service_queue_size', 'model_host_slots', 'landmark_k', 'vote_window',
+                     'roi_redetect_interval', 'classify_every_n_frames', 'prediction_cache_hash_size',
+                     'prediction_cache_size_step'):
+            value = getattr(self, name)
+            check(value > 0, f"{name.upper()} must be positive (got {value})")
+        check(self.max_classify_interval >= self.classify_every_n_frames,
+              f"MAX_CLASSIFY_INTERVAL ({self.max_classify_interval}) must be >= "
+              f"CLASSIFY_EVERY_N_FRAMES ({self.classify_every_n_frames})")
+        check(self.motion_threshold >= 0, f"MOTION_THRESHOLD must be >= 0 (got {self.motion_threshold})")
+        for name in ('prediction_cache_size', 'prediction_cache_ttl'):
+            value = getattr(self, name)
+            check(value >= 0, f"{name.upper()} must be >= 0 (got {value})")
+        check(self.landmark_cache_step > 0, f"LANDMARK_CACHE_STEP must be positive (got {self.landmark_cache_step})")
+        check(self.tf_log_level in ('0', '1', '2', '3'), f"TF_LOG_LEVEL must be '0'-'3' (got {self.tf_log_level!r})")
+        for name in ('tf_intra_op_threads', 'tf_inter_op_threads', 'opencv_threads'):
+            value = getattr(self, name)
+            check(value is None or value >= 0, f"{name.upper()} must be None or >= 0 (got {value})")
+        problems.extend(validate_affinity(self.cpu_affinity))
+
+        check(self.metrics_port is None or 0 < self.metrics_port <= 65535,
+              f"METRICS_PORT must be None or 1-65535 (got {self.metrics_port})")
+        check(self.metrics_export_interval > 0,
+              f"METRICS_EXPORT_INTERVAL must be positive (got {self.metrics_export_interval})")
+        check(self.model_store_format in ARTIFACT_FORMATS,
+              f"MODEL_STORE_FORMAT must be one of {', '.join(ARTIFACT_FORMATS)} (got {self.model_store_format!r})")
+        check(bool(self.output_dir), "OUTPUT_DIR is empty")
+
+        if problems:
+            raise ConfigError(problems)
+        return self
+
+    def validate_model(self, input_shape, output_shape):
+        """Check the settings against a loaded model's shapes; raises ConfigError"""
+        validate_model_shapes(input_shape, output_shape, self.img_size, self.class_labels)
+        return self
+
+    def apply(self, module=config):
+        """Write the merged settings back to config.py's names, which the components read"""
+        for f in fields(self):
+            setattr(module, f.name.upper(), getattr(self, f.name))
+        return self
+
+    def configure_environment(self):
+        """Settings TensorFlow reads at import time (call before it is imported)"""
+        os.environ['TF_CPP_MIN_LOG_LEVEL'] = self.tf_log_level
+        if not self.use_gpu:
+            os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
+        return self
+
+
+def parse_value(raw, annotation, name):
+    """Convert an environment string to a field's type"""
+    optional = typing.get_origin(annotation) is typing.Union and type(None) in typing.get_args(annotation)
+    if optional:
+        if raw.strip().lower() in ('', 'none', 'null'):
+            return None
+        annotation = next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+
+    try:
+        if annotation is bool:
+            if raw.strip().lower() in ('1', 'true', 'yes', 'on'):
+                return True
+            if raw.strip().lower() in ('0', 'false', 'no', 'off'):
+                return False
+            raise ValueError(raw)
+        if typing.get_origin(annotation) is list:
+            # A JSON list or comma-separated values
+            return json.loads(raw) if raw.strip().startswith('[') else [v.strip() for v in raw.split(',')]
+        if typing.get_origin(annotation) is dict:
+            return json.loads(raw)
+        return annotation(raw)
+    except ValueError:
+        type_name = getattr(annotation, '__name__', annotation)
+        raise ConfigError([f"{ENV_PREFIX}{name.upper()}={raw!r} is not a valid {type_name}"])
+
+
+def validate_model_shapes(input_shape, output_shape, img_size, class_labels):
+    """
+    Check that a model takes img_size x img_size inputs and has one output per label
+
+    Args:
+        input_shape: Model input shape, e.g. (None, 64, 64, 3)
+        output_shape: Model output shape, e.g. (None, 26)
+        img_size: Configured input size
+        class_labels: Configured labels
+
+    Raises:
+        ConfigError listing every mismatch
+    """
+    problems = []
+    height, width = input_shape[1], input_shape[2]
+    if (height, width) != (img_size, img_size) and None not in (height, width):
+        problems.append(f"IMG_SIZE is {img_size} but the model expects {height}x{width} inputs")
+    num_classes = output_shape[-1]
+    if num_classes is not None and num_classes != len(class_labels):
+        problems.append(f"CLASS_LABELS has {len(class_labels)} labels but the model has {num_classes} outputs")
+    if problems:
+        raise ConfigError(problems)
+
+
+def load_runtime_config(model_path=None, module=config, environ=None):
+    """
+    Build, validate and apply the runtime settings
+
+    Call before TensorFlow is imported so TF_LOG_LEVEL and USE_GPU take effect.
+
+    Returns:
+        The validated RuntimeConfig
+    """
+    settings = RuntimeConfig.from_sources(module, model_path, environ).validate()
+    return settings.apply(module).configure_environment()
+
+
+def load_cli_config(args=None, defaults=None, model_path=None):
+    """
+    load_runtime_config for command-line entry points
+
+    Prints the problems instead of raising. Options left at None are filled in
+    from the merged settings afterwards, so the model's metadata and SIGN_*
+    overrides reach them too; options given on the command line still win.
+
+    Args:
+        args: argparse Namespace (a `model` option defaults to MODEL_PATH)
+        defaults: {option attribute: config.py name}, e.g. {'width': 'CAMERA_WIDTH'}
+        model_path: Model whose metadata is read (default: args.model)
+
+    Returns:
+        The validated RuntimeConfig, or None if the settings are invalid (exit with status 1)
+    """
+    if model_path is None and args is not None:
+        model_path = getattr(args, 'model', None)
+    try:
+        settings = load_runtime_config(model_path)
+    except ConfigError as e:
+        print(f"❌ {e}")
+        return None
+
+    defaults = dict(defaults or {})
+    if args is not None and hasattr(args, 'model'):
+        defaults.setdefault('model', 'MODEL_PATH')
+    for attr, name in defaults.items():
+        if getattr(args, attr) is None:
+            setattr(args, attr, getattr(config, name))
+    return settings
+
+
+if __name__ == "__main__":
+    import sys
+
+    try:
+        settings = RuntimeConfig.from_sources(model_path=sys.argv[1] if len(sys.argv) > 1 else None).validate()
+    except ConfigError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    for f in fields(settings):
+        print(f"{f.name.upper():28s} {getattr(settings, f.name)!r}")
+    print("\n✅ Configuration is valid")
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Load Generator for the Recognition Service
+Opens several WebSocket or chunked HTTP streams against a local
+recognition_service.py and reports sustained frames/sec and tail latency
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+from urllib.parse import urlencode
+
+import cv2
+import numpy as np
+
+from benchmark import image_frames, synthetic_frames, video_frames
+from multi_stream_server import HEADER
+from recognition_service import (OP_BINARY, OP_CLOSE, OP_TEXT, http_body, http_chunk, read_http_head,
+                                 websocket_frame, websocket_messages)
+from runtime_config import load_cli_config
+
+
+def encode_frames(frames, fmt='jpeg', quality=90):
+    """Encode frames once up front so the client's own cost stays out of the measurement"""
+    payloads = []
+    for frame in frames:
+        if fmt == 'raw':
+            payloads.append(np.ascontiguousarray(frame).tobytes())
+            continue
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if ok:
+            payloads.append(jpeg.tobytes())
+    return payloads
+
+
+def latency_summary(latencies):
+    """Mean / p50 / p95 / p99 / max of end-to-end latencies (milliseconds)"""
+    if not latencies:
+        return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    values = np.asarray(latencies, dtype=np.float64)
+    return {
+        'count': len(values),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'p99_ms': float(np.percentile(values, 99)),
+        'max_ms': float(values.max())
+    }
+
+
+class StreamClient:
+    """One connection: sends frames (paced and windowed) and matches replies by sequence number"""
+
+    def __init__(self, host, port, transport, query, payloads, fps=0.0, window=4):
+        """
+        Initialize the client
+
+        Args:
+            host, port: Service address
+            transport: 'ws' (WebSocket) or 'http' (chunked POST /recognize)
+            query: Stream options sent in the query string (mode, format, width, height)
+            payloads: Encoded frames, sent in a loop
+            fps: Target send rate (0 = as fast as the window allows)
+            window: Frames in flight before the client waits for replies
+        """
+        self.host, self.port = host, port
+        self.transport = transport
+        self.query = query
+        self.payloads = payloads
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.window = asyncio.Semaphore(max(1, window))
+
+        self.pending = {}   # seq -> send time
+        self.latencies = []  # (receive time, latency ms)
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+        self.error = None
+        self.closed = False
+
+    async def run(self, deadline):
+        """Stream until `deadline` (perf_counter), then drain the remaining replies"""
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except OSError as e:
+            self.error = str(e)
+            return
+        try:
+            if self.transport == 'ws':
+                events = await self._open_websocket(reader, writer)
+            else:
+                events = await self._open_http(reader, writer)
+            receiver = asyncio.ensure_future(self._receive(events))
+            await self._send(writer, deadline)
+            await asyncio.wait_for(receiver, timeout=10.0)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+            self.error = str(e) or type(e).__name__
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _open_websocket(self, reader, writer):
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        writer.write((f"GET /ws?{urlencode(self.query)} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                      "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode('latin-1'))
+        await writer.drain()
+        head = await read_http_head(reader)
+        if head is None or head[0].split(' ')[1:2] != ['101']:
+            raise ConnectionError(f"WebSocket upgrade refused: {head[0] if head else 'no response'}")
+
+        async def events():
+            async for opcode, payload in websocket_messages(reader, writer, mask=True):
+                if opcode == OP_TEXT:
+                    yield json.loads(payload)
+        return events()
+
+    async def _open_http(self, reader, writer):
+        writer.write((f"POST /recognize?{urlencode(self.query)} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                      "Content-Type: application/octet-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+                     .encode('latin-1'))
+        await writer.drain()
+
+        async def events():
+            head = await read_http_head(reader)
+            if head is None or head[0].split(' ')[1:2] != ['200']:
+                raise ConnectionError(f"Upload refused: {head[0] if head else 'no response'}")
+            buffer = b''
+            async for chunk in http_body(reader, head[1]):
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line:
+                        yield json.loads(line)
+        return events()
+
+    def _encode(self, payload):
+        if self.transport == 'ws':
+            return websocket_frame(payload, OP_BINARY, mask=True)
+        return http_chunk(HEADER.pack(len(payload)) + payload)
+
+    async def _send(self, writer, deadline):
+        next_send = time.perf_counter()
+        seq = 0
+        while time.perf_counter() < deadline:
+            await self.window.acquire()
+            if self.closed:
+                return
+            if self.interval:
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_send = max(next_send + self.interval, time.perf_counter() - self.interval)
+            self.pending[seq] = time.perf_counter()
+            writer.write(self._encode(self.payloads[seq % len(self.payloads)]))
+            await writer.drain()
+            seq += 1
+            self.sent += 1
+        if self.transport == 'ws':
+            writer.write(websocket_frame(b'\x03\xe8', OP_CLOSE, mask=True))
+        else:
+            writer.write(http_chunk(b''))
+        await writer.drain()
+
+    async def _receive(self, events):
+        try:
+            async for event in events:
+                now = time.perf_counter()
+                seq = event.get('seq')
+                if seq not in self.pending:
+                    continue
+                # Frames older than a reply were dropped by the server
+                for older in [s for s in self.pending if s < seq]:
+                    del self.pending[older]
+                    self.dropped += 1
+                    self.window.release()
+                self.latencies.append((now, (now - self.pending.pop(seq)) * 1000.0))
+                self.received += 1
+                self.window.release()
+        finally:
+            # The server closed the stream: wake a sender waiting for the window
+            self.closed = True
+            self.window.release()
+
+
+async def run_load(host, port, transport, query, payloads, connections=1, fps=0.0, window=4,
+                   duration=10.0, warmup=2.0):
+    """
+    Run `connections` concurrent streams for `duration` seconds
+
+    Replies received during the first `warmup` seconds are excluded from the statistics.
+
+    Returns:
+        Results dict (throughput, latency percentiles, per-connection counts)
+    """
+    clients = [StreamClient(host, port, transport, query, payloads, fps, window) for _ in range(connections)]
+    start = time.perf_counter()
+    deadline = start + warmup + duration
+    await asyncio.gather(*(client.run(deadline) for client in clients))
+
+    measure_start = start + warmup
+    latencies = [ms for client in clients for t, ms in client.latencies if measure_start <= t <= deadline]
+    return {
+        'transport': transport,
+        'connections': connections,
+        'target_fps_per_connection': fps,
+        'window': window,
+        'duration_s': duration,
+        'frames_per_sec': len(latencies) / duration if duration > 0 else 0.0,
+        'latency': latency_summary(latencies),
+        'sent': sum(c.sent for c in clients),
+        'received': sum(c.received for c in clients),
+        'dropped': sum(c.dropped for c in clients),
+        'errors': [c.error for c in clients if c.error]
+    }
+
+
+def print_results(results):
+    """Print a throughput and latency summary"""
+    lat = results['latency']
+    print("\n" + "="*64)
+    print("RECOGNITION SERVICE LOAD TEST")
+    print("="*64)
+    print(f"Transport: {results['transport']}  connections: {results['connections']}  "
+          f"window: {results['window']}")
+    print(f"Frames: {results['sent']} sent, {results['received']} answered, {results['dropped']} dropped by the server")
+    print(f"Sustained: {results['frames_per_sec']:.1f} frames/sec over {results['duration_s']:.0f} s")
+    print(f"Latency: mean {lat['mean_ms']:.1f} ms  p50 {lat['p50_ms']:.1f}  p95 {lat['p95_ms']:.1f}  "
+          f"p99 {lat['p99_ms']:.1f}  max {lat['max_ms']:.1f}")
+    for error in results['errors']:
+        print(f"⚠️  {error}")
+    print("="*64 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure recognition service throughput and latency")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--synthetic', type=int, metavar='N', default=32, help="Use N random frames (default: 32)")
+    source.add_argument('--video', help="Send frames from a video file")
+    source.add_argument('--images', help="Send images from a directory")
+    parser.add_argument('--host', help="Service address (default: SERVICE_HOST)")
+    parser.add_argument('--port', type=int, help="Service port (default: SERVICE_PORT)")
+    parser.add_argument('--transport', choices=['ws', 'http'], default='ws', help="WebSocket or chunked HTTP")
+    parser.add_argument('--mode', choices=['frame', 'crop'], default='frame',
+                        help="Full frames (hand detection) or hand crops (classifier only)")
+    parser.add_argument('--format', choices=['jpeg', 'raw'], default='jpeg', help="Frame encoding")
+    parser.add_argument('--width', type=int, help="Synthetic frame width (default: CAMERA_WIDTH)")
+    parser.add_argument('--height', type=int, help="Synthetic frame height (default: CAMERA_HEIGHT)")
+    parser.add_argument('--limit', type=int, default=100, help="Maximum frames read from video/images")
+    parser.add_argument('--connections', type=int, default=1, help="Concurrent streams")
+    parser.add_argument('--fps', type=float, default=0.0, help="Send rate per stream (0 = unpaced)")
+    parser.add_argument('--window', type=int, default=4, help="Frames in flight per stream")
+    parser.add_argument('--duration', type=float, default=10.0, help="Measured seconds")
+    parser.add_argument('--warmup', type=float, default=2.0, help="Seconds excluded from the statistics")
+    parser.add_argument('--output', help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    # config.py, the model's metadata and SIGN_* overrides: the same settings the service reads
+    if load_cli_config(args, {'host': 'SERVICE_HOST', 'port': 'SERVICE_PORT',
+                              'width': 'CAMERA_WIDTH', 'height': 'CAMERA_HEIGHT'}) is None:
+        return 1
+
+    if args.video:
+        frames = video_frames(args.video, args.limit)
+    elif args.images:
+        frames = image_frames(args.images, args.limit)
+    else:
+        frames = synthetic_frames(args.synthetic, args.width, args.height)
+    frames = list(frames)
+    if not frames:
+        print("❌ No frames to send")
+        return 1
+    if args.format == 'raw' and len({f.shape for f in frames}) > 1:
+        print("❌ format=raw needs frames of a single size")
+        return 1
+
+    query = {'mode': args.mode, 'format': args.format}
+    if args.format == 'raw':
+        query.update(height=frames[0].shape[0], width=frames[0].shape[1])
+    payloads = encode_frames(frames, args.format)
+
+    results = asyncio.run(run_load(args.host, args.port, args.transport, query, payloads, args.connections,
+                                   args.fps, args.window, args.duration, args.warmup))
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0 if not results['errors'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,24 +3,28 @@ Professional Sign Language Detection Application
 Real-time hand sign detection and text conversion
 """
 
+from startup_timing import StartupTimer
+
+# Started before the heavy imports below so the report covers the whole launch
+startup_timer = StartupTimer()
+
 import cv2
-import numpy as np
 import tkinter as tk
-from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
+from tkinter import messagebox
 import threading
 import queue
 from datetime import datetime
 import os
 
-# Try to import TensorFlow and MediaPipe
-try:
-    import tensorflow as tf
-    import mediapipe as mp
-except ImportError:
-    print("Warning: TensorFlow or MediaPipe not installed. Some features may not work.")
-    tf = None
-    mp = None
+import config
+from display_stage import DisplayStage
+from frame_pipeline import LatestFrameQueue, open_camera
+from performance_monitor import create_monitor
+from recognition_engine import RecognitionEngine, DELETE
+from runtime_config import ConfigError, load_cli_config
+from thread_settings import apply_thread_settings, pin_current_thread
+
+startup_timer.mark("app modules imported")
 
 
 class SignLanguageDetector:
@@ -29,52 +33,87 @@ class SignLanguageDetector:
     def __init__(self, root, model_path=None):
         self.root = root
         self.root.title("Sign Language Alphabet Recognition")
-        self.root.geometry("1400x900")
+        self.root.geometry(f"{config.WINDOW_WIDTH}x{config.WINDOW_HEIGHT}")
         self.root.configure(bg='#2C3E50')
         
-        # Application state
-        self.is_running = False
-        self.cap = None
-        self.detected_text = ""
-        self.last_prediction = ""
-        self.prediction_stability = 0
-        self.stability_threshold = 5  # Number of consistent frames needed
+        # Thread pool sizes and core pinning must be in place before the model loads
+        apply_thread_settings()
+        pin_current_thread('ui')
         
-        # Model setup
-        self.model = None
-        self.model_path = model_path
-        if model_path and os.path.exists(model_path):
-            try:
-                self.model = tf.keras.models.load_model(model_path)
-                print(f"Model loaded from {model_path}")
-            except Exception as e:
-                print(f"Error loading model: {e}")
-        
-        # Hand detection setup
-        if mp:
-            self.mp_hands = mp.solutions.hands
-            self.hands = self.mp_hands.Hands(
-                static_image_mode=False,
-                max_num_hands=1,
-                min_detection_confidence=0.7,
-                min_tracking_confidence=0.5
-            )
-            self.mp_draw = mp.solutions.drawing_utils
-        else:
-            self.hands = None
-        
-        # Class labels for ASL alphabet
-        self.class_labels = [
-            'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M',
-            'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z',
-            'Delete', 'Space'
-        ]
+        self.init_detection_state(model_path)
         
         # Create UI
         self.setup_ui()
         
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        
+        # Show the window now; heavy imports and model loading happen in the background
+        self.start_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Loading models...")
+        self.startup_timer.mark("window ready")
+        self.loader_thread = threading.Thread(target=self.load_models, daemon=True)
+        self.loader_thread.start()
+    
+    def init_detection_state(self, model_path):
+        """Initialize detection state that does not depend on the UI"""
+        # Application state
+        self.is_running = False
+        self.cap = None
+        
+        # Pipeline setup (capture -> inference -> render)
+        self.capture_queue_size = 1  # Inference always works on the newest frame
+        self.render_queue_size = 1  # Display always shows the newest processed frame
+        self.capture_queue = None
+        self.render_queue = None
+        self.capture_thread = None
+        self.video_thread = None
+        # Set to end one camera session; each session gets a new event
+        self.stop_event = None
+        
+        # Display stage: one reused PhotoImage, refresh capped at DISPLAY_FPS
+        self.display = DisplayStage(size=(640, 480), max_fps=config.DISPLAY_FPS)
+        
+        # Detection, classification, stability tracking and text assembly
+        # (models are loaded by load_models on a background thread)
+        self.model_path = model_path
+        self.recognizer = RecognitionEngine(model_path=model_path)
+        self.recognizer.subscribe(self.on_recognition_event)
+        
+        # Optional performance HUD and metrics export (ENABLE_PERFORMANCE_STATS / DEBUG_MODE)
+        caches = {'prediction': self.recognizer.prediction_cache} if self.recognizer.prediction_cache else None
+        self.monitor = create_monitor(self.recognizer.timings, caches=caches)
+        self.show_hud = self.monitor is not None and (config.DEBUG_MODE or config.PERFORMANCE_HUD)
+        self.models_loaded = False
+        self.startup_timer = startup_timer
+        self.camera_opened_once = False
+    
+    def load_models(self):
+        """Load models on a background thread, then re-enable the UI"""
+        # TensorFlow's thread pools start here and inherit the inference cores
+        pin_current_thread('inference')
+        error = None
+        try:
+            self.recognizer.load(self.startup_timer)
+        except ConfigError as e:
+            print(f"❌ {e}")
+            error = e
+        self.root.after(0, self.on_models_loaded, error)
+    
+    def on_models_loaded(self, error=None):
+        """Re-enable the UI once background loading has finished (or report why it failed)"""
+        if error is not None:
+            # The model does not match the settings; its predictions would be mislabelled
+            self.status_label.config(text=f"Configuration error: {error.problems[0]}")
+            messagebox.showerror("Configuration Error", str(error))
+            return
+        self.models_loaded = True
+        self.start_button.config(state=tk.NORMAL)
+        if self.recognizer.has_classifier:
+            self.status_label.config(text="Ready - Click 'Start Camera' to begin")
+        else:
+            self.status_label.config(text="Ready (no model loaded - hand detection only) - Click 'Start Camera' to begin")
+        print(self.startup_timer.report())
     
     def setup_ui(self):
         """Setup the user interface"""
@@ -271,19 +310,42 @@ class SignLanguageDetector:
     
     def start_camera(self):
         """Start camera capture"""
+        # The previous session's threads must be gone: the engine is not thread-safe
+        # and the old capture thread may still hold the camera
+        self.join_camera_threads()
         try:
-            self.cap = cv2.VideoCapture(0)
+            with self.startup_timer.measure("camera open"):
+                self.cap = open_camera()
             if not self.cap.isOpened():
                 messagebox.showerror("Error", "Could not open camera")
                 return
             
             self.is_running = True
+            self.stop_event = threading.Event()
             self.start_button.config(text="Stop Camera", bg='#E74C3C')
             self.status_label.config(text="Camera running - Show hand signs to detect")
             
-            # Start video processing thread
-            self.video_thread = threading.Thread(target=self.process_video, daemon=True)
+            # Bounded queues between stages; when full the oldest frame is dropped
+            self.capture_queue = LatestFrameQueue(maxsize=self.capture_queue_size)
+            self.render_queue = LatestFrameQueue(maxsize=self.render_queue_size)
+            if self.monitor:
+                self.monitor.set_queues({'capture': self.capture_queue, 'render': self.render_queue})
+            
+            # Start capture and inference threads; rendering runs on the Tk thread
+            self.capture_thread = threading.Thread(target=self.capture_frames,
+                                                   args=(self.cap, self.capture_queue, self.stop_event),
+                                                   daemon=True)
+            self.video_thread = threading.Thread(target=self.process_video,
+                                                 args=(self.capture_queue, self.render_queue, self.stop_event),
+                                                 daemon=True)
+            self.capture_thread.start()
             self.video_thread.start()
+            self.render_frames(self.render_queue)
+            
+            if not self.camera_opened_once:
+                self.camera_opened_once = True
+                self.startup_timer.mark("camera ready")
+                print(self.startup_timer.report())
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start camera: {str(e)}")
@@ -291,158 +353,109 @@ class SignLanguageDetector:
     def stop_camera(self):
         """Stop camera capture"""
         self.is_running = False
-        if self.cap:
-            self.cap.release()
+        # Only this session's threads see the event; the capture thread releases
+        # the camera once its current read returns
+        if self.stop_event is not None:
+            self.stop_event.set()
+        self.cap = None
         self.start_button.config(text="Start Camera", bg='#27AE60')
         self.status_label.config(text="Camera stopped")
         self.video_label.config(image='')
+        self.display.reset()
+    
+    def join_camera_threads(self, timeout=2.0):
+        """Wait for the threads of a stopped camera session to exit"""
+        for thread in (self.video_thread, self.capture_thread):
+            if thread is not None and thread.is_alive():
+                thread.join(timeout=timeout)
     
-    def process_video(self):
-        """Process video frames"""
-        while self.is_running:
-            ret, frame = self.cap.read()
-            if not ret:
+    def capture_frames(self, cap, capture_queue, stop_event):
+        """Capture stage: read frames from the camera as fast as it delivers them"""
+        pin_current_thread('capture')
+        try:
+            while not stop_event.is_set():
+                # Includes waiting for the camera's next frame
+                with self.recognizer.timings.measure('capture'):
+                    ret, frame = cap.read()
+                if not ret:
+                    break
+                capture_queue.put_latest(frame)
+        finally:
+            cap.release()
+            # End-of-stream marker for the inference stage
+            capture_queue.put_latest(None)
+    
+    def process_video(self, capture_queue, render_queue, stop_event):
+        """Inference stage: detect and classify the newest captured frame"""
+        pin_current_thread('inference')
+        while not stop_event.is_set():
+            try:
+                frame = capture_queue.get_latest()
+            except queue.Empty:
+                continue
+            if frame is None:
                 break
             
             # Flip frame horizontally for mirror view
             frame = cv2.flip(frame, 1)
             
-            # Process frame
-            processed_frame, prediction, confidence = self.process_frame(frame)
-            
-            # Update prediction with stability check
-            if prediction:
-                if prediction == self.last_prediction:
-                    self.prediction_stability += 1
-                else:
-                    self.prediction_stability = 0
-                    self.last_prediction = prediction
-                
-                # Add to text if stable
-                if self.prediction_stability >= self.stability_threshold:
-                    self.add_prediction_to_text(prediction)
-                    self.prediction_stability = 0
-                
-                # Update UI
-                self.root.after(0, self.update_prediction_display, prediction, confidence)
-            
-            # Convert frame for display
-            frame_rgb = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
-            frame_pil = Image.fromarray(frame_rgb)
-            frame_pil = frame_pil.resize((640, 480), Image.Resampling.LANCZOS)
-            frame_tk = ImageTk.PhotoImage(frame_pil)
-            
-            # Update display
-            self.root.after(0, self.update_video_display, frame_tk)
-    
-    def process_frame(self, frame):
-        """Process a single frame for hand detection and classification"""
-        h, w, _ = frame.shape
-        prediction = None
-        confidence = 0.0
-        
-        # Detect hands using MediaPipe
-        if self.hands:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(frame_rgb)
+            # Process frame (prediction and text updates arrive via on_recognition_event)
+            _, processed_frame = self.recognizer.update(frame)
+            if self.monitor:
+                self.monitor.tick()
+                if self.show_hud:
+                    self.monitor.draw_overlay(processed_frame)
             
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    # Draw hand landmarks
-                    self.mp_draw.draw_landmarks(
-                        frame, 
-                        hand_landmarks, 
-                        self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                        self.mp_draw.DrawingSpec(color=(255, 0, 0), thickness=2)
-                    )
-                    
-                    # Get bounding box
-                    x_coords = [lm.x for lm in hand_landmarks.landmark]
-                    y_coords = [lm.y for lm in hand_landmarks.landmark]
-                    
-                    x_min, x_max = int(min(x_coords) * w), int(max(x_coords) * w)
-                    y_min, y_max = int(min(y_coords) * h), int(max(y_coords) * h)
-                    
-                    # Add padding
-                    padding = 30
-                    x_min = max(0, x_min - padding)
-                    y_min = max(0, y_min - padding)
-                    x_max = min(w, x_max + padding)
-                    y_max = min(h, y_max + padding)
-                    
-                    # Draw bounding box
-                    cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (255, 165, 0), 2)
-                    
-                    # Extract hand region
-                    hand_img = frame[y_min:y_max, x_min:x_max]
-                    
-                    # Classify if model is available
-                    if self.model and hand_img.size > 0:
-                        prediction, confidence = self.classify_hand(hand_img)
-        
-        # Add instructions on frame
-        cv2.putText(frame, "Show hand sign to camera", (10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        
-        return frame, prediction, confidence
+            render_queue.put_latest(processed_frame)
+        
+        render_queue.put_latest(None)
     
-    def classify_hand(self, hand_img):
-        """Classify the hand sign using the model"""
+    def render_frames(self, render_queue):
+        """Render stage: show the newest processed frame, at most DISPLAY_FPS times a second"""
+        if not self.is_running or render_queue is not self.render_queue:
+            return
+        
         try:
-            # Resize image to model input size (adjust based on your model)
-            img_size = 64  # Adjust this based on your model
-            hand_img_resized = cv2.resize(hand_img, (img_size, img_size))
-            hand_img_rgb = cv2.cvtColor(hand_img_resized, cv2.COLOR_BGR2RGB)
-            
-            # Normalize
-            hand_img_normalized = hand_img_rgb / 255.0
-            
-            # Add batch dimension
-            hand_img_batch = np.expand_dims(hand_img_normalized, axis=0)
-            
-            # Predict
-            predictions = self.model.predict(hand_img_batch, verbose=0)
-            class_idx = np.argmax(predictions[0])
-            confidence = predictions[0][class_idx]
-            
-            # Get class label (adjust based on your model's classes)
-            if class_idx < len(self.class_labels):
-                prediction = self.class_labels[class_idx]
-            else:
-                prediction = chr(65 + class_idx) if class_idx < 26 else 'Unknown'
-            
-            return prediction, confidence
-        except Exception as e:
-            print(f"Classification error: {e}")
-            return None, 0.0
-    
-    def update_video_display(self, frame_tk):
-        """Update video display in GUI"""
-        self.video_label.config(image=frame_tk)
-        self.video_label.image = frame_tk
+            processed_frame = render_queue.get_nowait()
+        except queue.Empty:
+            processed_frame = None
+        
+        # Update the PhotoImage in place (runs on the Tk thread)
+        if processed_frame is not None:
+            with self.recognizer.timings.measure('display_convert'):
+                self.display.render(processed_frame, self.video_label)
+        
+        self.root.after(self.display.interval_ms, self.render_frames, render_queue)
     
     def update_prediction_display(self, prediction, confidence):
         """Update prediction display"""
         self.prediction_label.config(text=prediction)
         self.confidence_label.config(text=f"Confidence: {confidence*100:.1f}%")
     
-    def add_prediction_to_text(self, prediction):
-        """Add prediction to text display"""
-        if prediction == "Space":
-            self.text_display.insert(tk.END, " ")
-        elif prediction == "Delete" or prediction == "Del":
-            current_text = self.text_display.get("1.0", tk.END)
-            if len(current_text) > 1:
-                self.text_display.delete("end-2c", "end-1c")
-        else:
-            self.text_display.insert(tk.END, prediction)
+    def on_recognition_event(self, event):
+        """Forward a recognition event to the UI (called on the inference thread)"""
+        if event.letter:
+            self.root.after(0, self.update_prediction_display, event.letter, event.confidence)
+        if event.committed_text_delta:
+            self.root.after(0, self.add_prediction_to_text, event.committed_text_delta)
+    
+    def add_prediction_to_text(self, delta):
+        """Apply a committed text delta to the text display"""
+        for char in delta:
+            if char == DELETE:
+                current_text = self.text_display.get("1.0", tk.END)
+                if len(current_text) > 1:
+                    self.text_display.delete("end-2c", "end-1c")
+            else:
+                self.text_display.insert(tk.END, char)
         
         self.text_display.see(tk.END)
     
     def clear_text(self):
         """Clear all detected text"""
         self.text_display.delete("1.0", tk.END)
+        # The inference thread appends to the same text under this lock
+        self.recognizer.clear_text()
         self.status_label.config(text="Text cleared")
     
     def save_to_file(self):
@@ -467,25 +480,29 @@ class SignLanguageDetector:
         """Handle window closing"""
         if self.is_running:
             self.stop_camera()
-        if self.hands:
-            self.hands.close()
+        # Let the inference stage finish its current frame before closing MediaPipe
+        self.join_camera_threads(timeout=1.0)
+        self.recognizer.close()
+        if self.recognizer.inference_engine:
+            print(self.recognizer.inference_engine.latency_report())
+        if self.monitor:
+            self.monitor.stop()
         self.root.destroy()
 
 
 def main():
     """Main function to run the application"""
-    root = tk.Tk()
-    
-    # Optional: Specify path to your trained model
-    model_path = None  # Set to your model path, e.g., "model.h5" or "model.keras"
+    # MODEL_PATH from config.py (or SIGN_MODEL_PATH), else a model found in the workspace
+    model_path = os.environ.get('SIGN_MODEL_PATH', config.MODEL_PATH)
+    if not os.path.exists(model_path):
+        possible_models = ['model.h5', 'model.keras', 'asl_model.h5', 'sign_language_model.h5']
+        model_path = next((m for m in possible_models if os.path.exists(m)), None)
     
-    # Check if model file exists in workspace
-    possible_models = ['model.h5', 'model.keras', 'asl_model.h5', 'sign_language_model.h5']
-    for model_file in possible_models:
-        if os.path.exists(model_file):
-            model_path = model_file
-            break
+    # Merge config.py, model_config.json and SIGN_* overrides before TensorFlow is imported
+    if load_cli_config(model_path=model_path) is None:
+        return
     
+    root = tk.Tk()
     app = SignLanguageDetector(root, model_path=model_path)
     root.mainloop()
 
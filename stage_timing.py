@@ -0,0 +1,72 @@
+"""
+Per-Stage Timing for Sign Language Detection
+Rolling latency samples for each stage of the per-frame pipeline
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class StageTimings:
+    """Keeps the most recent latency samples (milliseconds) for each named stage"""
+
+    def __init__(self, window=1000, enabled=True):
+        """
+        Initialize the stage timings
+
+        Args:
+            window: Number of most recent samples kept per stage
+            enabled: If False, measure() is a no-op
+        """
+        self.window = window
+        self.enabled = enabled
+        self.samples = {}
+        # Cumulative count and sum per stage (for Prometheus-style counters)
+        self.totals = {}
+
+    @contextmanager
+    def measure(self, stage):
+        """Time the enclosed block and record it under `stage`"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.perf_counter() - start) * 1000.0)
+
+    def add(self, stage, latency_ms):
+        """Record one latency sample (milliseconds) for `stage`"""
+        samples = self.samples.get(stage)
+        if samples is None:
+            samples = self.samples.setdefault(stage, deque(maxlen=self.window))
+        samples.append(latency_ms)
+        count, total = self.totals.get(stage, (0, 0.0))
+        self.totals[stage] = (count + 1, total + latency_ms)
+
+    def reset(self):
+        """Drop all recorded samples"""
+        self.samples.clear()
+        self.totals.clear()
+
+    def summary(self):
+        """Return {stage: {count, mean_ms, p50_ms, p95_ms, p99_ms}} for every stage"""
+        result = {}
+        # Stages are recorded from several threads: work on copies
+        for stage, samples in list(self.samples.items()):
+            values = np.array(list(samples), dtype=np.float64)
+            if len(values) == 0:
+                continue
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            result[stage] = {
+                'count': len(values),
+                'mean_ms': float(values.mean()),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99)
+            }
+        return result
@@ -0,0 +1,41 @@
+"""
+Startup Timing for Sign Language Detection
+Records how long each startup stage takes (imports, model load, warmup, camera open)
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Collects durations of named startup stages"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = {}
+        self.marks = {}
+
+    @contextmanager
+    def measure(self, stage):
+        """Time the enclosed block and record it under `stage`"""
+        stage_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[stage] = self.stages.get(stage, 0.0) + (time.perf_counter() - stage_start)
+
+    def mark(self, name):
+        """Record the time elapsed since the timer was created (e.g. 'window shown')"""
+        self.marks[name] = time.perf_counter() - self.start
+
+    def report(self):
+        """Return a printable breakdown of the recorded stages"""
+        lines = ["\n" + "="*60, "STARTUP TIMING", "="*60]
+        for stage, seconds in self.stages.items():
+            lines.append(f"{stage:25s} {seconds*1000:9.1f} ms")
+        if self.marks:
+            lines.append("-"*60)
+            for name, seconds in self.marks.items():
+                lines.append(f"{name:25s} {seconds*1000:9.1f} ms after launch")
+        lines.append("="*60)
+        return "\n".join(lines)
@@ -0,0 +1,142 @@
+"""
+Temporal Decoders for Sign Language Detection
+Turn per-frame class probabilities into committed letters
+"""
+
+from collections import Counter, deque
+
+import numpy as np
+
+
+class StabilityDecoder:
+    """Legacy rule: commit when the same class wins `threshold` + 1 frames in a row"""
+
+    def __init__(self, threshold=5):
+        """
+        Initialize the decoder
+
+        Args:
+            threshold: Consecutive repeats needed before a class is committed
+        """
+        self.threshold = threshold
+        self.reset()
+
+    def reset(self):
+        """Forget all history"""
+        self.last_index = None
+        self.stability = 0
+
+    def update(self, probs):
+        """
+        Feed one frame
+
+        Args:
+            probs: Class probability vector, or None when no hand was classified
+
+        Returns:
+            Class index to commit, or None
+        """
+        if probs is None:
+            return None
+        index = int(np.argmax(probs))
+        if index == self.last_index:
+            self.stability += 1
+        else:
+            self.stability = 0
+            self.last_index = index
+
+        if self.stability >= self.threshold:
+            self.stability = 0
+            return index
+        return None
+
+
+class TemporalDecoder:
+    """EMA over probability vectors plus a sliding-window vote with confidence gating and hysteresis"""
+
+    def __init__(self, alpha=0.5, window=5, min_votes=3, min_confidence=0.7, release_confidence=0.4):
+        """
+        Initialize the decoder
+
+        Args:
+            alpha: Weight of the newest frame in the moving average (1 = no smoothing)
+            window: Number of recent frames taking part in the vote
+            min_votes: Votes a class needs within the window to be committed
+            min_confidence: Smoothed probability a class needs to cast a vote
+            release_confidence: A committed class can only be committed again after
+                its smoothed probability fell below this (or the hand left)
+        """
+        self.alpha = alpha
+        self.window = window
+        self.min_votes = min(min_votes, window)
+        self.min_confidence = min_confidence
+        self.release_confidence = release_confidence
+        self.votes = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        """Forget all history"""
+        self.ema = None
+        self.votes.clear()
+        self.held = None
+
+    def update(self, probs):
+        """
+        Feed one frame
+
+        Args:
+            probs: Class probability vector, or None when no hand was classified
+
+        Returns:
+            Class index to commit, or None
+        """
+        if probs is None:
+            self.ema = None
+            self.votes.append(None)
+        else:
+            probs = np.asarray(probs, dtype=np.float32)
+            if self.ema is None or self.ema.shape != probs.shape:
+                self.ema = probs.copy()
+            else:
+                self.ema += self.alpha * (probs - self.ema)
+            index = int(np.argmax(self.ema))
+            # Confidence gating: unsure frames do not vote
+            self.votes.append(index if self.ema[index] >= self.min_confidence else None)
+
+        # Hysteresis: release the committed class once it has clearly gone
+        if self.held is not None:
+            if self.ema is None or self.ema[self.held] < self.release_confidence:
+                self.held = None
+
+        counts = Counter(v for v in self.votes if v is not None)
+        if not counts:
+            return None
+        candidate, votes = counts.most_common(1)[0]
+        if votes >= self.min_votes and candidate != self.held and self.ema is not None \
+                and self.ema[candidate] >= self.min_confidence:
+            self.held = candidate
+            return candidate
+        return None
+
+    @property
+    def confidence(self):
+        """Smoothed probability of the current leading class"""
+        return float(self.ema.max()) if self.ema is not None else 0.0
+
+
+def create_decoder(method='temporal', stability_threshold=5, alpha=0.5, window=5, min_votes=3,
+                   min_confidence=0.7, release_confidence=0.4):
+    """
+    Build a decoder by name
+
+    Args:
+        method: 'temporal' (TemporalDecoder) or 'stability' (legacy StabilityDecoder)
+
+    Returns:
+        Decoder with reset() and update(probs) methods
+    """
+    if method == 'stability':
+        return StabilityDecoder(stability_threshold)
+    if method == 'temporal':
+        return TemporalDecoder(alpha, window, min_votes, min_confidence, release_confidence)
+    raise ValueError(f"Unknown smoothing method: {method}")
@@ -6,6 +6,17 @@ Checks if all dependencies are properly installed
 
 import sys
 import os
+import importlib.util
+from importlib import metadata
+
+# Distribution names to look up versions without importing the (slow) modules
+DISTRIBUTIONS = {
+    'numpy': ['numpy'],
+    'cv2': ['opencv-python', 'opencv-python-headless', 'opencv-contrib-python'],
+    'PIL': ['Pillow'],
+    'tensorflow': ['tensorflow', 'tensorflow-cpu', 'tensorflow-macos'],
+    'mediapipe': ['mediapipe', 'mediapipe-silicon'],
+}
 
 def print_header(text):
     print("\n" + "="*60)
@@ -17,13 +28,12 @@ def check_module(module_name, package_name=None):
     if package_name is None:
         package_name = module_name
     
-    try:
-        __import__(module_name)
+    # find_spec locates the module without executing it (TensorFlow takes seconds to import)
+    if importlib.util.find_spec(module_name) is not None:
         print(f"✓ {package_name:20s} - Installed")
         return True
-    except ImportError:
-        print(f"✗ {package_name:20s} - NOT INSTALLED")
-        return False
+    print(f"✗ {package_name:20s} - NOT INSTALLED")
+    return False
 
 def check_camera():
     """Check if camera is accessible"""
@@ -53,6 +63,13 @@ def check_model_file():
 
 def get_version(module_name):
     """Get version of a module"""
+    for distribution in DISTRIBUTIONS.get(module_name, [module_name]):
+        try:
+            return metadata.version(distribution)
+        except metadata.PackageNotFoundError:
+            continue
+    if importlib.util.find_spec(module_name) is None:
+        return "N/A"
     try:
         module = __import__(module_name)
         if hasattr(module, '__version__'):
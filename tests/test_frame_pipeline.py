@@ -0,0 +1,40 @@
+"""Tests for frame_pipeline.py"""
+
+import queue
+
+import pytest
+
+from frame_pipeline import LatestFrameQueue
+
+
+def test_keeps_only_the_newest_frames():
+    frames = LatestFrameQueue(maxsize=2)
+    for i in range(5):
+        frames.put_latest(i)
+    assert frames.dropped == 3
+    assert frames.get_latest() == 3
+    assert frames.get_latest() == 4
+
+
+def test_single_slot_queue_replaces_the_waiting_frame():
+    frames = LatestFrameQueue()
+    frames.put_latest('old')
+    frames.put_latest('new')
+    assert frames.get_latest() == 'new'
+    assert frames.dropped == 1
+
+
+def test_end_of_stream_marker_is_delivered():
+    frames = LatestFrameQueue()
+    frames.put_latest('frame')
+    frames.put_latest(None)
+    assert frames.get_latest() is None
+
+
+def test_get_latest_times_out_when_empty():
+    with pytest.raises(queue.Empty):
+        LatestFrameQueue().get_latest(timeout=0.01)
+
+
+def test_maxsize_is_at_least_one():
+    assert LatestFrameQueue(maxsize=0).maxsize == 1
@@ -0,0 +1,59 @@
+"""Tests for landmark_classifier.py"""
+
+import numpy as np
+
+from landmark_classifier import FEATURE_SIZE, LandmarkClassifier, normalize_landmarks
+
+
+def make_hand(seed=0):
+    """21 random landmarks in pixel-like units around (0.5, 0.5)"""
+    rng = np.random.default_rng(seed)
+    return 0.5 + rng.uniform(-0.1, 0.1, size=(21, 3)).astype(np.float32)
+
+
+def to_normalized(points, width, height):
+    """Landmarks in pixels of a width x height image, as MediaPipe reports them"""
+    normalized = points.copy()
+    normalized[:, 0] /= width
+    normalized[:, 1] /= height
+    normalized[:, 2] /= width
+    return normalized
+
+
+def test_wrist_at_origin_and_unit_scale():
+    vector = normalize_landmarks(make_hand()).reshape(21, 3)
+    assert vector.shape == (21, 3)
+    np.testing.assert_allclose(vector[0], 0.0)
+    assert np.isclose(np.linalg.norm(vector[:, :2], axis=1).max(), 1.0)
+
+
+def test_translation_and_scale_invariant():
+    hand = make_hand()
+    moved = hand * 2.0 + np.float32(0.1)
+    np.testing.assert_allclose(normalize_landmarks(hand), normalize_landmarks(moved), atol=1e-5)
+
+
+def test_same_hand_matches_across_aspect_ratios():
+    hand_pixels = make_hand() * 200.0
+    square = normalize_landmarks(to_normalized(hand_pixels, 200, 200), 1.0)
+    camera = normalize_landmarks(to_normalized(hand_pixels + 100.0, 640, 480), 640 / 480)
+    np.testing.assert_allclose(square, camera, atol=1e-5)
+
+    # Without the aspect ratio the camera frame squashes x
+    squashed = normalize_landmarks(to_normalized(hand_pixels + 100.0, 640, 480))
+    assert not np.allclose(square, squashed, atol=1e-3)
+
+
+def test_input_is_not_modified():
+    hand = make_hand()
+    original = hand.copy()
+    normalize_landmarks(hand, 4 / 3)
+    np.testing.assert_array_equal(hand, original)
+
+
+def test_classifier_predicts_nearest_class():
+    features = np.stack([normalize_landmarks(make_hand(seed)) for seed in range(4)])
+    classifier = LandmarkClassifier(features, [0, 0, 1, 1], ['A', 'B'], k=1)
+    assert features.shape[1] == FEATURE_SIZE
+    assert classifier.predict(features[2]) == ('B', 1.0)
+    assert LandmarkClassifier(features, [0, 0, 1, 1], ['A', 'B'], method='centroid').predict(features[0])[0] == 'A'
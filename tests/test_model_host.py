@@ -0,0 +1,84 @@
+"""Tests for the model host's slot leases"""
+
+import queue
+import time
+import types
+
+import numpy as np
+import pytest
+
+from inference_engine import LatencyStats
+from model_host import ModelHostClient, SlotPool
+
+
+def test_release_returns_slot():
+    pool = SlotPool(1, lease_timeout=None)
+    slot, token = pool.acquire()
+    pool.release(slot, token)
+    assert pool.acquire()[0] == slot
+
+
+def test_expired_lease_is_reclaimed():
+    pool = SlotPool(1, lease_timeout=0.01)
+    slot, token = pool.acquire()
+    time.sleep(0.02)
+    assert pool.reclaim() == 1
+    assert not pool.holds(slot, token)
+
+    new_slot, new_token = pool.acquire()
+    assert new_slot == slot and new_token != token
+    # A late release under the expired lease leaves the new holder alone
+    pool.release(slot, token)
+    assert pool.holds(new_slot, new_token)
+    assert pool.free.empty()
+
+
+def test_acquire_waits_for_dead_client():
+    pool = SlotPool(1, lease_timeout=0.05)
+    pool.acquire()
+    start = time.perf_counter()
+    slot, _ = pool.acquire()
+    assert slot == 0
+    assert time.perf_counter() - start < 5
+
+
+class FakeHost:
+    """Answers requests in-process; `delays` holds the seconds each request takes"""
+
+    def __init__(self, client, delays):
+        self.client = client
+        self.delays = list(delays)
+
+    def put(self, request):
+        slot, count, token = request
+        time.sleep(self.delays.pop(0))
+        self.client.ring.outputs[slot, :count] = self.client.ring.inputs[slot, :count, 0, 0, :3]
+        self.client._replies[slot].put((token, count))
+
+
+def make_client(lease_timeout, delays):
+    client = ModelHostClient.__new__(ModelHostClient)
+    client.info = {'num_classes': 3, 'max_batch_size': 2, 'lease_timeout': lease_timeout}
+    client.ring = types.SimpleNamespace(inputs=np.zeros((1, 2, 4, 4, 3), dtype=np.float32),
+                                        outputs=np.zeros((1, 2, 3), dtype=np.float32))
+    client._slots = SlotPool(1, lease_timeout)
+    client._replies = [queue.Queue()]
+    client._requests = FakeHost(client, delays)
+    client.compiled_latency = LatencyStats()
+    return client
+
+
+def test_each_chunk_renews_the_lease():
+    # Three chunks take longer than one lease in total, but each fits in it
+    client = make_client(0.2, [0.1, 0.1, 0.1])
+    batch = np.arange(6, dtype=np.float32)[:, None, None, None] * np.ones((6, 4, 4, 3), dtype=np.float32)
+    result = client.predict(batch)
+    assert result[:, 0].tolist() == [0, 1, 2, 3, 4, 5]
+
+
+def test_lease_expiring_during_a_chunk_fails_the_call():
+    client = make_client(0.05, [0.0, 0.1])
+    with pytest.raises(RuntimeError, match="lease expired"):
+        client.predict(np.zeros((4, 4, 4, 3), dtype=np.float32))
+    # Nobody took the slot over yet, so the late release still returns it
+    assert client._slots.free.qsize() == 1 and not client._slots.leases
@@ -0,0 +1,28 @@
+"""Tests for the model store's index and build locking"""
+
+import json
+import multiprocessing as mp
+
+from model_store import ModelStore
+
+
+def _hash_model(root, model_path):
+    return ModelStore(root).content_hash(model_path)
+
+
+def test_concurrent_hashing_keeps_index_valid(tmp_path):
+    models = []
+    for i in range(4):
+        path = tmp_path / f"model{i}.h5"
+        path.write_bytes(bytes([i]) * 1024)
+        models.append(str(path))
+
+    root = str(tmp_path / 'store')
+    with mp.get_context('spawn').Pool(4) as pool:
+        pool.starmap(_hash_model, [(root, m) for m in models * 3])
+
+    with open(tmp_path / 'store' / 'index.json') as f:
+        index = json.load(f)
+    assert len(index) == 4
+    assert not list((tmp_path / 'store').glob('*.tmp'))
+
@@ -0,0 +1,44 @@
+"""Tests for the multi-stream server's MicroBatcher"""
+
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from multi_stream_server import MicroBatcher
+
+
+class FakeEngine:
+    """Returns the mean of each crop as its single 'probability'"""
+
+    def __init__(self, input_shape=(None, 4, 4, 3)):
+        if input_shape is not None:
+            self.input_shape = input_shape
+
+    def predict(self, batch):
+        return batch.reshape(len(batch), -1).mean(axis=1, keepdims=True)
+
+
+def test_predict_returns_each_callers_slice():
+    batcher = MicroBatcher(FakeEngine(), max_batch_size=8, max_wait_ms=1)
+    result = batcher.predict(np.full((2, 4, 4, 3), 3.0))
+    assert result[:, 0].tolist() == [3.0, 3.0]
+
+
+def test_wrong_crop_shape_is_rejected_on_submit():
+    batcher = MicroBatcher(FakeEngine(), max_batch_size=8, max_wait_ms=1)
+    with pytest.raises(ValueError):
+        batcher.predict(np.zeros((1, 8, 8, 3)))
+    assert batcher.predict(np.ones((1, 4, 4, 3)))[0, 0] == 1.0
+
+
+def test_failed_batch_does_not_stop_the_batcher():
+    # Without a known input shape mismatched crops reach the batching thread
+    batcher = MicroBatcher(FakeEngine(input_shape=None), max_batch_size=8, max_wait_ms=200)
+    futures = [Future(), Future()]
+    batcher.requests.put((np.zeros((1, 4, 4, 3), dtype=np.float32), futures[0]))
+    batcher.requests.put((np.zeros((1, 8, 8, 3), dtype=np.float32), futures[1]))
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+    assert batcher.predict(np.full((1, 4, 4, 3), 2.0))[0, 0] == 2.0
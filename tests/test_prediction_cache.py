@@ -0,0 +1,80 @@
+"""Tests for prediction_cache.py"""
+
+import numpy as np
+
+import prediction_cache
+from prediction_cache import PredictionCache, crop_key, dhash, landmark_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_and_miss_counts():
+    cache = PredictionCache(max_size=4, ttl=0)
+    assert cache.get('a') is None
+    cache.put('a', [0.2, 0.8])
+    np.testing.assert_allclose(cache.get('a'), [0.2, 0.8])
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(prediction_cache.time, 'monotonic', clock)
+    cache = PredictionCache(max_size=4, ttl=1.0)
+    cache.put('a', [1.0])
+    clock.now += 0.9
+    assert cache.get('a') is not None
+    clock.now += 0.2
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_size=2, ttl=0)
+    cache.put('a', [1.0])
+    cache.put('b', [2.0])
+    cache.get('a')  # 'b' is now the least recently used
+    cache.put('c', [3.0])
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.evictions == 1
+
+
+def test_stored_vector_is_a_copy():
+    cache = PredictionCache()
+    probs = np.array([0.5, 0.5], dtype=np.float32)
+    cache.put('a', probs)
+    probs[0] = 1.0
+    assert cache.get('a')[0] == 0.5
+
+
+def test_dhash_ignores_small_brightness_changes():
+    rng = np.random.default_rng(0)
+    crop = rng.integers(0, 200, (64, 64, 3), dtype=np.uint8)
+    assert dhash(crop) == dhash(crop + 10)
+    assert len(dhash(crop)) == 8
+    assert len(dhash(crop, hash_size=16)) == 32
+
+
+def test_crop_key_separates_crop_sizes():
+    rng = np.random.default_rng(1)
+    crop = rng.integers(0, 256, (120, 90, 3), dtype=np.uint8)
+    # Same picture stretched to a different aspect ratio: same dHash, different key
+    stretched = np.repeat(crop, 2, axis=1)
+    assert dhash(crop) == dhash(stretched)
+    assert crop_key(crop) != crop_key(stretched)
+    # A few pixels difference stays in the same bucket
+    assert crop_key(crop)[:2] == crop_key(crop[:, :88])[:2] == (5, 7)
+    assert crop_key(crop, size_step=0)[:2] == (0, 0)
+
+
+def test_landmark_key_quantizes():
+    vector = np.arange(-31, 32, dtype=np.float32) * 0.05
+    assert landmark_key(vector) == landmark_key(vector + 0.01)
+    assert landmark_key(vector) != landmark_key(vector + 0.1)
@@ -0,0 +1,32 @@
+"""Tests for RecognitionEngine's text assembly"""
+
+import pytest
+
+from recognition_engine import DELETE, RecognitionEngine
+
+
+@pytest.fixture
+def engine():
+    return RecognitionEngine(class_labels=['A', 'B'])
+
+
+@pytest.mark.parametrize('label, delta', [
+    ('A', 'A'),
+    ('space', ' '), ('Space', ' '), ('SPACE', ' '),
+    ('del', DELETE), ('Del', DELETE), ('delete', DELETE), ('Delete', DELETE),
+])
+def test_special_labels_map_to_deltas(engine, label, delta):
+    assert engine.commit_prediction(label) == delta
+
+
+@pytest.mark.parametrize('label', ['nothing', 'Nothing', 'NOTHING'])
+def test_nothing_is_never_committed(engine, label):
+    engine.text = "AB"
+    assert engine.commit_prediction(label) == ''
+    assert engine.text == "AB"
+
+
+def test_text_assembly(engine):
+    for label in ('A', 'B', 'space', 'A', 'del', 'nothing'):
+        engine.commit_prediction(label)
+    assert engine.text == "AB "
@@ -0,0 +1,94 @@
+"""Tests for roi_tracker.py"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from roi_tracker import RoiTracker
+
+
+def make_landmarks(points):
+    """MediaPipe-like multi_hand_landmarks holding one hand with the given (x, y, z) points"""
+    landmarks = [SimpleNamespace(x=x, y=y, z=z) for x, y, z in points]
+    return [SimpleNamespace(landmark=landmarks)]
+
+
+def test_roi_coordinates_map_back_to_the_frame():
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    tracker = RoiTracker(margin=0.5)
+    tracker.update([(200, 100, 300, 200)], frame.shape)
+    assert tracker.tracking
+
+    image, region = tracker.region(frame)
+    x0, y0, x1, y1 = tracker.roi
+    assert region == (x0, y0, 1.0)
+    assert image.shape[:2] == (y1 - y0, x1 - x0)
+
+    # The centre and the corners of the ROI image
+    hands = make_landmarks([(0.5, 0.5, 0.1), (0.0, 0.0, 0.0), (1.0, 1.0, 0.0)])
+    RoiTracker.to_frame_coordinates(hands, image.shape, region, frame.shape)
+    centre, top_left, bottom_right = hands[0].landmark
+    assert centre.x == pytest.approx((x0 + x1) / 2 / 640)
+    assert centre.y == pytest.approx((y0 + y1) / 2 / 480)
+    assert centre.z == pytest.approx(0.1 * (x1 - x0) / 640)
+    assert (top_left.x, top_left.y) == pytest.approx((x0 / 640, y0 / 480))
+    assert (bottom_right.x, bottom_right.y) == pytest.approx((x1 / 640, y1 / 480))
+
+
+def test_downscaled_full_frame_keeps_normalized_coordinates():
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    tracker = RoiTracker(detection_scale=0.5)
+    image, region = tracker.full_frame(frame)
+    assert image.shape[:2] == (240, 320)
+
+    hands = make_landmarks([(0.25, 0.75, 0.0)])
+    RoiTracker.to_frame_coordinates(hands, image.shape, region, frame.shape)
+    assert (hands[0].landmark[0].x, hands[0].landmark[0].y) == pytest.approx((0.25, 0.75))
+
+
+def test_full_resolution_frame_is_left_untouched():
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    image, region = RoiTracker().full_frame(frame)
+    assert region is None
+    hands = make_landmarks([(0.3, 0.4, 0.0)])
+    RoiTracker.to_frame_coordinates(hands, image.shape, region, frame.shape)
+    assert (hands[0].landmark[0].x, hands[0].landmark[0].y) == (0.3, 0.4)
+
+
+def test_large_roi_falls_back_to_full_frame():
+    tracker = RoiTracker(margin=0.5, max_roi_fraction=0.6)
+    tracker.update([(0, 0, 600, 450)], (480, 640, 3))
+    assert not tracker.tracking
+
+
+def test_no_hands_resets_tracking():
+    tracker = RoiTracker()
+    tracker.update([(200, 100, 300, 200)], (480, 640, 3))
+    tracker.update([], (480, 640, 3))
+    assert not tracker.tracking
+    assert tracker.last_center is None
+
+
+def test_motion_shifts_the_search_area():
+    tracker = RoiTracker(margin=0.0)
+    tracker.update([(200, 100, 300, 200)], (480, 640, 3))
+    tracker.update([(220, 100, 320, 200)], (480, 640, 3))
+    x0, _, x1, _ = tracker.roi
+    # Moving right by 20 px: the area grows 20 px behind and 40 px ahead
+    assert (x0, x1) == (200, 360)
+
+
+def test_full_frame_search_while_hands_are_missing():
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    tracker = RoiTracker(redetect_interval=3)
+    tracker.update([(200, 100, 300, 200)], frame.shape)
+
+    # One of two hands tracked: every third frame searches the full frame
+    used_roi = []
+    for _ in range(8):
+        used_roi.append(tracker.region(frame, max_hands=2)[1] is not None)
+    assert used_roi == [True, True, True, False, True, True, True, False]
+
+    # All hands tracked: the ROI is always used
+    assert all(tracker.region(frame, max_hands=1)[1] is not None for _ in range(8))
@@ -0,0 +1,136 @@
+"""Tests for runtime_config.py: environment parsing and range checks"""
+
+import argparse
+import dataclasses
+from typing import Dict, List, Optional
+
+import pytest
+
+import config
+from runtime_config import ConfigError, RuntimeConfig, load_cli_config, parse_value
+
+
+def make_config(**overrides):
+    settings = RuntimeConfig.from_sources(model_path='missing_model.h5', environ={})
+    return dataclasses.replace(settings, **overrides)
+
+
+@pytest.mark.parametrize('raw, annotation, expected', [
+    ('42', int, 42),
+    ('0.25', float, 0.25),
+    ('2', float, 2.0),
+    ('text', str, 'text'),
+    ('yes', bool, True),
+    ('OFF', bool, False),
+    ('none', Optional[int], None),
+    ('', Optional[float], None),
+    ('8', Optional[int], 8),
+    ('A, B ,C', List[str], ['A', 'B', 'C']),
+    ('["A", "B"]', List[str], ['A', 'B']),
+    ('{"capture": [0]}', Optional[Dict[str, List[int]]], {'capture': [0]}),
+])
+def test_parse_value(raw, annotation, expected):
+    assert parse_value(raw, annotation, 'name') == expected
+
+
+@pytest.mark.parametrize('raw, annotation', [('abc', int), ('maybe', bool), ('1.5x', Optional[float])])
+def test_parse_value_rejects_bad_input(raw, annotation):
+    with pytest.raises(ConfigError) as error:
+        parse_value(raw, annotation, 'camera_width')
+    assert 'SIGN_CAMERA_WIDTH' in error.value.problems[0]
+
+
+def test_environment_overrides_config():
+    settings = RuntimeConfig.from_sources(model_path='missing_model.h5',
+                                          environ={'SIGN_VOTE_WINDOW': '7', 'SIGN_SERVICE_POLICY': 'block'})
+    assert settings.vote_window == 7
+    assert settings.service_policy == 'block'
+    assert settings.camera_width == config.CAMERA_WIDTH
+
+
+def test_defaults_are_valid():
+    make_config().validate()
+
+
+@pytest.mark.parametrize('overrides, problem', [
+    ({'vote_window': 3, 'vote_min': 4}, 'VOTE_MIN'),
+    ({'smoothing_alpha': 0.0}, 'SMOOTHING_ALPHA'),
+    ({'release_confidence': 0.9, 'min_confidence': 0.7}, 'RELEASE_CONFIDENCE'),
+    ({'roi_margin': -0.1}, 'ROI_MARGIN'),
+    ({'roi_redetect_interval': 0}, 'ROI_REDETECT_INTERVAL'),
+    ({'prediction_cache_ttl': -1.0}, 'PREDICTION_CACHE_TTL'),
+    ({'prediction_cache_size_step': 0}, 'PREDICTION_CACHE_SIZE_STEP'),
+    ({'landmark_cache_step': 0.0}, 'LANDMARK_CACHE_STEP'),
+    ({'classify_every_n_frames': 0}, 'CLASSIFY_EVERY_N_FRAMES'),
+    ({'max_batch_wait_ms': -5}, 'MAX_BATCH_WAIT_MS'),
+    ({'service_port': 70000}, 'SERVICE_PORT'),
+    ({'service_policy': 'queue'}, 'SERVICE_POLICY'),
+    ({'landmark_method': 'svm'}, 'LANDMARK_METHOD'),
+    ({'landmark_k': 0}, 'LANDMARK_K'),
+    ({'classifier_mode': 'landmark', 'landmark_index_path': 'missing_index.npz'}, 'LANDMARK_INDEX_PATH'),
+])
+def test_validate_rejects_out_of_range_values(overrides, problem):
+    with pytest.raises(ConfigError) as error:
+        make_config(**overrides).validate()
+    assert any(p.startswith(problem) for p in error.value.problems)
+
+
+def test_validate_lists_every_problem():
+    with pytest.raises(ConfigError) as error:
+        make_config(img_size=0, max_hands=0, service_workers=0).validate()
+    assert len(error.value.problems) == 3
+
+
+@pytest.fixture
+def restore_config(monkeypatch):
+    # load_cli_config writes the merged settings back to config.py's names
+    for f in dataclasses.fields(RuntimeConfig):
+        monkeypatch.setattr(config, f.name.upper(), getattr(config, f.name.upper()))
+    monkeypatch.setenv('TF_CPP_MIN_LOG_LEVEL', config.TF_LOG_LEVEL)
+    return monkeypatch
+
+
+def test_cli_defaults_follow_environment_overrides(restore_config):
+    restore_config.setenv('SIGN_CAMERA_WIDTH', '320')
+    restore_config.setenv('SIGN_CAMERA_HEIGHT', '240')
+    args = argparse.Namespace(model='missing_model.h5', width=None, height=100)
+    assert load_cli_config(args, {'width': 'CAMERA_WIDTH', 'height': 'CAMERA_HEIGHT'}) is not None
+    assert args.width == 320
+    assert args.height == 100  # given on the command line
+
+
+def test_cli_config_reports_problems(restore_config, capsys):
+    restore_config.setenv('SIGN_VOTE_MIN', '99')
+    assert load_cli_config(argparse.Namespace(model=None)) is None
+    assert 'VOTE_MIN' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('name, raw, expected', [
+    ('ADAPTIVE_CADENCE', 'false', False),
+    ('MODEL_STORE_FORMAT', 'tflite', 'tflite'),
+    ('MODEL_HOST_AUTHKEY', 'secret', 'secret'),
+    ('PERFORMANCE_HUD', '1', True),
+    ('METRICS_JSONL_PATH', 'metrics.jsonl', 'metrics.jsonl'),
+    ('METRICS_PORT', '9108', 9108),
+    ('METRICS_EXPORT_INTERVAL', '2.5', 2.5),
+    ('ENABLE_PERFORMANCE_STATS', 'yes', True),
+    ('DEBUG_MODE', 'on', True),
+    ('OUTPUT_DIR', 'transcripts', 'transcripts'),
+    ('OUTPUT_PREFIX', 'session', 'session'),
+])
+def test_environment_round_trip(name, raw, expected):
+    settings = RuntimeConfig.from_sources(model_path='missing_model.h5', environ={'SIGN_' + name: raw}).validate()
+    assert getattr(settings, name.lower()) == expected
+
+
+@pytest.mark.parametrize('overrides, problem', [
+    ({'model_store_format': 'onnx'}, 'MODEL_STORE_FORMAT'),
+    ({'model_host_authkey': ''}, 'MODEL_HOST_AUTHKEY'),
+    ({'metrics_port': 0}, 'METRICS_PORT'),
+    ({'metrics_export_interval': 0}, 'METRICS_EXPORT_INTERVAL'),
+    ({'output_dir': ''}, 'OUTPUT_DIR'),
+])
+def test_validate_rejects_bad_output_and_store_settings(overrides, problem):
+    with pytest.raises(ConfigError) as error:
+        make_config(**overrides).validate()
+    assert any(p.startswith(problem) for p in error.value.problems)
@@ -0,0 +1,91 @@
+"""Tests for temporal_decoder.py and how RecognitionEngine feeds it"""
+
+import numpy as np
+import pytest
+
+from recognition_engine import RecognitionEngine
+from temporal_decoder import StabilityDecoder, TemporalDecoder, create_decoder
+
+A = np.array([0.9, 0.1], dtype=np.float32)
+B = np.array([0.1, 0.9], dtype=np.float32)
+UNSURE = np.array([0.55, 0.45], dtype=np.float32)
+
+
+def feed(decoder, frames):
+    return [decoder.update(probs) for probs in frames]
+
+
+def test_commits_once_min_votes_are_reached():
+    decoder = TemporalDecoder(alpha=1.0, window=5, min_votes=3, min_confidence=0.7)
+    assert feed(decoder, [A, A, A]) == [None, None, 0]
+
+
+def test_holding_a_sign_does_not_repeat_it():
+    decoder = TemporalDecoder(alpha=1.0, window=5, min_votes=3, min_confidence=0.7)
+    assert feed(decoder, [A] * 10).count(0) == 1
+
+
+def test_release_allows_the_letter_again():
+    decoder = TemporalDecoder(alpha=1.0, window=3, min_votes=2, min_confidence=0.7, release_confidence=0.4)
+    assert feed(decoder, [A, A]) == [None, 0]
+    # The hand leaves: the held letter is released and the old votes age out
+    assert feed(decoder, [None, None, None]) == [None, None, None]
+    assert feed(decoder, [A, A]) == [None, 0]
+
+
+def test_unsure_frames_do_not_vote():
+    decoder = TemporalDecoder(alpha=1.0, window=5, min_votes=3, min_confidence=0.7)
+    assert feed(decoder, [UNSURE] * 5) == [None] * 5
+
+
+def test_switching_letters_commits_the_new_one():
+    decoder = TemporalDecoder(alpha=1.0, window=3, min_votes=2, min_confidence=0.7)
+    assert feed(decoder, [A, A, B, B, B]) == [None, 0, None, 1, None]
+
+
+def test_ema_smooths_a_single_outlier():
+    decoder = TemporalDecoder(alpha=0.3, window=5, min_votes=3, min_confidence=0.6)
+    commits = feed(decoder, [A, A, A, B, A, A])
+    assert 1 not in commits
+    assert commits.count(0) == 1
+
+
+def test_stability_decoder_commits_after_threshold_repeats():
+    decoder = StabilityDecoder(threshold=2)
+    # The counter restarts after a commit, so a held sign repeats (legacy behaviour)
+    assert feed(decoder, [A, A, A, A, A, A]) == [None, None, 0, None, 0, None]
+    assert feed(decoder, [B, None, B, B]) == [None, None, None, 1]
+
+
+def test_create_decoder_rejects_unknown_method():
+    assert isinstance(create_decoder('stability'), StabilityDecoder)
+    with pytest.raises(ValueError):
+        create_decoder('median')
+
+
+def make_engine(decoder, classify_on):
+    """Engine whose process_frame reports one hand, classified only on frames in `classify_on`"""
+    engine = RecognitionEngine(class_labels=['A', 'B'], decoder=decoder)
+    engine.prediction_cache = None
+
+    def process_frame(frame):
+        engine.frame_hands = [('hand', 'Right', (0, 0, 10, 10), 'A', 0.9)]
+        engine.hand_probabilities = {'hand': A}
+        engine.classified_keys = {'hand'} if engine.frame_index in classify_on else set()
+        return frame, 'A', 0.9
+
+    engine.process_frame = process_frame
+    return engine
+
+
+def test_engine_feeds_only_classified_frames():
+    decoder = TemporalDecoder(alpha=1.0, window=5, min_votes=3, min_confidence=0.7)
+    # One classification every 4 frames (CLASSIFY_EVERY_N_FRAMES = 4)
+    engine = make_engine(decoder, classify_on={0, 4, 8})
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    events = [engine.update(frame)[0] for _ in range(9)]
+
+    committed = [e.frame_index for e in events if e.committed_text_delta]
+    assert committed == [8]
+    assert events[8].hands[0].committed == 'A'
+    assert engine.text == 'A'
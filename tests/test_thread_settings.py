@@ -0,0 +1,41 @@
+"""Tests for thread_settings.py CPU pinning"""
+
+import os
+import threading
+
+import pytest
+
+from thread_settings import PROCESS_CORES, pin_current_thread
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'), reason="Linux only")
+
+
+def run_in_thread(target):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=target()))
+    thread.start()
+    thread.join()
+    return result['value']
+
+
+def test_unconfigured_role_does_not_inherit_pinned_cores():
+    affinity = {'ui': [min(PROCESS_CORES)]}
+
+    def ui_thread():
+        assert pin_current_thread('ui', affinity)
+        ui_cores = os.sched_getaffinity(0)
+
+        def capture_thread():
+            pinned = pin_current_thread('capture', affinity)
+            return pinned, os.sched_getaffinity(0)
+
+        return ui_cores, run_in_thread(capture_thread)
+
+    ui_cores, (pinned, capture_cores) = run_in_thread(ui_thread)
+    assert ui_cores == {min(PROCESS_CORES)}
+    assert not pinned
+    assert capture_cores == PROCESS_CORES
+
+
+def test_no_affinity_leaves_threads_alone():
+    assert not run_in_thread(lambda: pin_current_thread('ui', {}))
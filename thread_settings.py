@@ -0,0 +1,110 @@
+"""
+Thread Settings for Sign Language Detection
+TensorFlow / OpenCV thread pool sizes and CPU affinity of the capture,
+inference and UI threads, so they stop competing for the same cores
+"""
+
+import os
+import sys
+import threading
+
+import config
+
+ROLES = ('capture', 'inference', 'ui')
+
+_warned = set()
+
+# Cores the process may use, captured before any thread is pinned: threads inherit
+# the mask of the thread that starts them, so roles without configured cores are
+# reset to this instead of staying on another role's cores
+PROCESS_CORES = os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else None
+
+
+def _warn_once(key, message):
+    if key not in _warned:
+        _warned.add(key)
+        print(f"⚠️  {message}")
+
+
+def apply_thread_settings(intra_op=None, inter_op=None, opencv=None):
+    """
+    Size the TensorFlow and OpenCV thread pools
+
+    TensorFlow fixes its pools when its runtime starts, so call this before the
+    model loads. Environment variables cover a TensorFlow that is not imported
+    yet; tf.config.threading covers one that is imported but not yet running.
+
+    Args:
+        intra_op: Threads inside one op (default: config.TF_INTRA_OP_THREADS; None = TF default)
+        inter_op: Ops run in parallel (default: config.TF_INTER_OP_THREADS; None = TF default)
+        opencv: cv2.setNumThreads value (default: config.OPENCV_THREADS; None = leave as is)
+    """
+    intra_op = config.TF_INTRA_OP_THREADS if intra_op is None else intra_op
+    inter_op = config.TF_INTER_OP_THREADS if inter_op is None else inter_op
+    opencv = config.OPENCV_THREADS if opencv is None else opencv
+
+    if intra_op is not None:
+        os.environ['TF_NUM_INTRAOP_THREADS'] = str(intra_op)
+    if inter_op is not None:
+        os.environ['TF_NUM_INTEROP_THREADS'] = str(inter_op)
+    tf = sys.modules.get('tensorflow')
+    if tf is not None and (intra_op is not None or inter_op is not None):
+        try:
+            if intra_op is not None:
+                tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+            if inter_op is not None:
+                tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+        except RuntimeError:
+            _warn_once('tf', "TensorFlow is already running - thread pool sizes apply from the next launch")
+
+    if opencv is not None:
+        import cv2
+        cv2.setNumThreads(opencv)
+
+
+def pin_current_thread(role, affinity=None):
+    """
+    Restrict the calling thread to the cores configured for its role
+
+    Threads created afterwards by this thread (e.g. TensorFlow's pools when the
+    model loads) inherit the same cores. A role without configured cores is reset
+    to all of the process's cores, so it does not inherit the cores of the thread
+    that started it (e.g. the pinned UI thread).
+
+    Args:
+        role: 'capture', 'inference' or 'ui'
+        affinity: {role: [core, ...]} (default: config.CPU_AFFINITY; None = no pinning)
+
+    Returns:
+        True if the thread was pinned to the role's cores
+    """
+    affinity = config.CPU_AFFINITY if affinity is None else affinity
+    if not affinity:
+        return False
+    if not hasattr(os, 'sched_setaffinity'):
+        _warn_once('affinity', "CPU affinity pinning is only supported on Linux")
+        return False
+    cores = affinity.get(role)
+    try:
+        # On Linux the id of a thread addresses that thread alone
+        os.sched_setaffinity(threading.get_native_id(), cores or PROCESS_CORES)
+        return bool(cores)
+    except OSError as e:
+        _warn_once(f"affinity:{role}", f"Could not pin the {role} thread to cores {cores}: {e}")
+        return False
+
+
+def validate_affinity(affinity):
+    """Problems with a CPU_AFFINITY mapping, as a list of messages"""
+    if affinity is None:
+        return []
+    if not isinstance(affinity, dict):
+        return [f"CPU_AFFINITY must be None or a dict of role -> cores (got {affinity!r})"]
+    problems = []
+    cpu_count = os.cpu_count() or 1
+    for role, cores in affinity.items():
+        if role not in ROLES:
+            problems.append(f"CPU_AFFINITY role {role!r} is not one of {', '.join(ROLES)}")
+        elif not cores or any(not isinstance(c, int) or not 0 <= c < cpu_count for c in cores):
+            problems.append(f"CPU_AFFINITY['{role}'] must list cores between 0 and {cpu_count - 1} (got {cores!r})")
+    return problems
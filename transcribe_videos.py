@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Offline Video Transcription for Sign Language Detection
+Turns recorded videos into text as fast as the CPU allows, processing files in
+parallel and writing a transcript plus a per-frame prediction CSV for each video
+"""
+
+import argparse
+import csv
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+from pathlib import Path
+
+import config
+from runtime_config import ConfigError, load_cli_config, load_runtime_config
+from thread_settings import apply_thread_settings
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm', '.m4v')
+
+# Frames between two progress messages sent by a worker
+PROGRESS_EVERY = 50
+
+# Per-process state, set up once by init_worker
+_recognizer = None
+_progress = None
+_load_error = None
+
+
+def find_videos(inputs):
+    """Expand files and directories (searched recursively) into a sorted list of videos"""
+    videos = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            videos.extend(p for p in sorted(path.rglob('*')) if p.suffix.lower() in VIDEO_EXTENSIONS)
+        elif path.is_file():
+            videos.append(path)
+        else:
+            print(f"⚠️  Not found: {item}")
+    return videos
+
+
+def init_worker(model_path, progress, num_threads, classify_every):
+    """
+    Load the models once per worker process
+
+    Args:
+        model_path: Path to the model (.h5, .keras or .tflite)
+        progress: Queue receiving (video, frames_done) progress messages
+        num_threads: Threads each worker may use for inference
+        classify_every: Classifier cadence (1 = classify every frame with a hand)
+    """
+    global _recognizer, _progress, _load_error
+
+    # Spawned workers start from a fresh config module
+    load_runtime_config(model_path)
+
+    # Several workers share the CPU: keep each one's thread pools small
+    apply_thread_settings(intra_op=num_threads, inter_op=1, opencv=1)
+    config.TFLITE_NUM_THREADS = num_threads
+
+    from frame_scheduler import AdaptiveScheduler
+    from recognition_engine import RecognitionEngine
+
+    # Offline there is no frame budget, so the cadence must not adapt to wall time
+    scheduler = AdaptiveScheduler(classify_every=classify_every,
+                                  motion_threshold=config.MOTION_THRESHOLD, adaptive=False)
+    _recognizer = RecognitionEngine(model_path=model_path, stability_threshold=config.STABILITY_THRESHOLD,
+                                    scheduler=scheduler, annotate=False)
+    _progress = progress
+    try:
+        _recognizer.load()
+    except ConfigError as e:
+        # Raised from an initializer it would make the pool respawn workers forever;
+        # every video of this worker fails with it instead
+        _load_error = e
+
+
+def transcribe_video(video_path, output_dir, flip=False):
+    """
+    Transcribe one video in the current worker
+
+    Args:
+        video_path: Video file
+        output_dir: Directory for '<name>.txt' and '<name>.csv'
+        flip: Mirror frames horizontally (as the app does for webcams)
+
+    Returns:
+        Dictionary with video, frames, seconds, text and output paths
+    """
+    import cv2
+
+    if _load_error is not None:
+        raise _load_error
+    recognizer = _recognizer
+    recognizer.reset()
+    for hands in (recognizer.hands, recognizer.roi_hands):
+        if hands is not None and hasattr(hands, 'reset'):
+            # Forget MediaPipe's tracking state from the previous video
+            hands.reset()
+
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Could not open video: {video_path}")
+    video_fps = cap.get(cv2.CAP_PROP_FPS) or config.FPS
+
+    stem = Path(video_path).stem
+    csv_path = Path(output_dir) / f"{stem}.csv"
+    text_path = Path(output_dir) / f"{stem}.txt"
+
+    start = time.perf_counter()
+    frames = 0
+    try:
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'time_s', 'letter', 'confidence', 'committed'])
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if flip:
+                    frame = cv2.flip(frame, 1)
+                event, _ = recognizer.update(frame)
+                writer.writerow([
+                    event.frame_index,
+                    f"{event.frame_index / video_fps:.3f}",
+                    event.letter or '',
+                    f"{event.confidence:.4f}",
+                    # Labels the decoders committed (smoothed, so not always this frame's letter)
+                    ' '.join(h.committed for h in event.hands if h.committed)
+                ])
+                frames += 1
+                if frames % PROGRESS_EVERY == 0:
+                    _progress.put((str(video_path), PROGRESS_EVERY))
+    finally:
+        cap.release()
+    _progress.put((str(video_path), frames % PROGRESS_EVERY))
+
+    with open(text_path, 'w', encoding='utf-8') as f:
+        f.write(recognizer.text)
+
+    return {
+        'video': str(video_path),
+        'frames': frames,
+        'seconds': time.perf_counter() - start,
+        'text': recognizer.text,
+        'transcript': str(text_path),
+        'csv': str(csv_path)
+    }
+
+
+def run(videos, output_dir, model_path, workers=None, flip=False, classify_every=1):
+    """
+    Transcribe videos in a process pool, printing progress and throughput
+
+    Returns:
+        List of per-video result dictionaries (failed videos have an 'error' key)
+    """
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(workers or cpu_count, len(videos)))
+    num_threads = max(1, cpu_count // workers)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 'spawn' gives each worker a clean TensorFlow/MediaPipe runtime
+    ctx = mp.get_context('spawn')
+    progress = ctx.Queue()
+    print(f"Transcribing {len(videos)} video(s) with {workers} worker(s), {num_threads} thread(s) each...\n")
+
+    results = []
+    total_frames = 0
+    start = time.perf_counter()
+    with ctx.Pool(workers, initializer=init_worker,
+                  initargs=(model_path, progress, num_threads, classify_every)) as pool:
+        pending = {str(v): pool.apply_async(transcribe_video, (v, output_dir, flip)) for v in videos}
+        while pending:
+            try:
+                _, frames = progress.get(timeout=0.5)
+                total_frames += frames
+            except queue.Empty:
+                pass
+
+            for video, job in list(pending.items()):
+                if not job.ready():
+                    continue
+                del pending[video]
+                try:
+                    result = job.get()
+                    print(f"\r✓ {video}: {result['frames']} frames in {result['seconds']:.1f}s "
+                          f"-> {result['transcript']}" + " " * 10)
+                except Exception as e:
+                    result = {'video': video, 'error': str(e)}
+                    print(f"\r❌ {video}: {e}" + " " * 10)
+                results.append(result)
+
+            elapsed = time.perf_counter() - start
+            sys.stdout.write(f"\r[{len(results)}/{len(videos)} videos] {total_frames} frames, "
+                             f"{total_frames / elapsed if elapsed > 0 else 0.0:.1f} frames/sec")
+            sys.stdout.flush()
+
+    # Drain the last progress messages
+    while True:
+        try:
+            total_frames += progress.get_nowait()[1]
+        except queue.Empty:
+            break
+
+    elapsed = time.perf_counter() - start
+    print("\n\n" + "="*60)
+    print("TRANSCRIPTION SUMMARY")
+    print("="*60)
+    for result in results:
+        if 'error' in result:
+            print(f"{Path(result['video']).name:30s} FAILED")
+        else:
+            print(f"{Path(result['video']).name:30s} {result['text']!r}")
+    print("-"*60)
+    print(f"{total_frames} frames in {elapsed:.1f}s ({total_frames / elapsed if elapsed > 0 else 0.0:.1f} frames/sec)")
+    print("="*60 + "\n")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe sign language videos to text")
+    parser.add_argument('inputs', nargs='+', help="Video files or directories of videos")
+    parser.add_argument('--output-dir', help="Directory for transcripts and CSVs (default: OUTPUT_DIR)")
+    parser.add_argument('--model', help="Model path (.h5, .keras or .tflite, default: MODEL_PATH)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--classify-every', type=int, default=1,
+                        help="Classify every N frames with a hand (1 = every frame)")
+    parser.add_argument('--flip', action='store_true', help="Mirror frames, as the app does for webcams")
+    args = parser.parse_args()
+
+    # config.py, the model's metadata and SIGN_* overrides (explicit options still win)
+    if load_cli_config(args, {'output_dir': 'OUTPUT_DIR'}) is None:
+        return 1
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        print("❌ No videos found")
+        return 1
+    if config.CLASSIFIER_MODE != 'landmark' and not os.path.exists(args.model):
+        print(f"❌ Model file not found: {args.model}")
+        return 1
+
+    results = run(videos, args.output_dir, args.model, args.workers, args.flip, args.classify_every)
+    return 1 if any('error' in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())